@@ -1,21 +1,298 @@
 # api_app.py
 # -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import json
+import logging
 import os
-from typing import Dict, Optional, List, Literal
-from fastapi import FastAPI, HTTPException
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, List, Literal, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from dotenv import load_dotenv
-from fis_tsukamoto import Diagnoser, LABEL_ID, render_report_html, get_medication_recommendations
+from fis_metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, StageMetrics, gauge_lines
+from fis_reports import MEDIA_TYPES, BulkReportWriter
+from fis_ruleset import DEFAULT_RULESET_PATH, Ruleset, RulesetError, compile_ruleset, load_ruleset
+from fis_sessions import DiagnosisSession, SessionStore
+from fis_tsukamoto import (JSON_SEPARATORS, Diagnoser, LABEL_ID, PredictionCache, RuleProfiler,
+                           get_medication_recommendations, medication_recommendations_json)
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 APP_NAME = os.getenv("APP_NAME", "Fuzzy Tsukamoto Diagnoser API")
 API_VERSION = "v1"
 DEFAULT_WARNING_THRESHOLD = float(os.getenv("WARNING_THRESHOLD", "60"))
+BATCH_CHUNK_SIZE = max(1, int(os.getenv("BATCH_CHUNK_SIZE", "256")))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+PREDICT_CACHE_SIZE = int(os.getenv("PREDICT_CACHE_SIZE", "1024"))  # 0 = cache nonaktif
+PREDICT_CACHE_TTL = float(os.getenv("PREDICT_CACHE_TTL", "0")) or None  # detik; 0 = tanpa TTL
+PREDICT_WORKERS = max(1, int(os.getenv("PREDICT_WORKERS", "4")))  # thread skoring
+PREDICT_MAX_QUEUE = max(0, int(os.getenv("PREDICT_MAX_QUEUE", "64")))  # antrian di luar worker aktif
+PREDICT_TIMEOUT_S = float(os.getenv("PREDICT_TIMEOUT_S", "10")) or None  # deadline per request; 0 = tanpa
+PREDICT_RETRY_AFTER_S = max(1, int(os.getenv("PREDICT_RETRY_AFTER_S", "1")))  # header Retry-After saat 503
+# /v1/predict: encode body langsung ke bytes dengan fragmen obat pra-encode (wire format sama, byte-identik);
+# 0 = dict + validasi ulang response_model oleh pydantic (lebih lambat, untuk debugging skema)
+FAST_RESPONSE = os.getenv("FAST_RESPONSE", "1").lower() in ("1", "true", "yes")
+# Histogram latensi per tahap di /metrics (opt-in: observer masih menambah beberapa % per predict);
+# 0 = nonaktif (tanpa observer & middleware)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+# Profiler per rule di /v1/profile; rule dievaluasi satu per satu, jadi hanya untuk sampling trafik
+RULE_PROFILER = os.getenv("RULE_PROFILER", "0").lower() in ("1", "true", "yes")
+SESSION_MAX = max(1, int(os.getenv("SESSION_MAX", "10000")))  # sesi kuisioner aktif maksimum (LRU)
+SESSION_IDLE_TTL_S = float(os.getenv("SESSION_IDLE_TTL_S", "1800")) or None  # 0 = tanpa idle timeout
+RULESET_PATH = os.getenv("RULESET_PATH", DEFAULT_RULESET_PATH)  # rule base deklaratif (JSON berversi)
+RULESET_WATCH_S = float(os.getenv("RULESET_WATCH_S", "0"))  # interval cek mtime untuk hot reload; 0 = nonaktif
+RELOAD_TOKEN = os.getenv("RELOAD_TOKEN", "")  # header X-Reload-Token; kosong = /v1/engine/reload nonaktif
+# Warm-up saat startup (lexicon, self-check, data obat & template laporan) agar request pertama
+# tidak membayar inisialisasi lazy; 0 = semuanya dimuat saat pertama dipakai
+WARM_UP = os.getenv("WARM_UP", "1").lower() in ("1", "true", "yes")
+
+# Satu cache per proses; engine hasil swap memakai cache yang sama (otomatis dikosongkan).
+# Saat profiling cache dimatikan agar setiap request benar-benar dievaluasi dan tercatat.
+prediction_cache = (PredictionCache(PREDICT_CACHE_SIZE, PREDICT_CACHE_TTL)
+                    if PREDICT_CACHE_SIZE > 0 and not RULE_PROFILER else None)
+metrics = StageMetrics() if METRICS_ENABLED else None
+rule_profiler = RuleProfiler() if RULE_PROFILER else None
+session_store = SessionStore(SESSION_MAX, SESSION_IDLE_TTL_S)
+
+def build_engine(ruleset: Optional[Ruleset] = None, **kwargs: Any) -> Tuple[Diagnoser, float]:
+    """Compile ruleset (default: file RULESET_PATH) -> (engine, waktu compile dalam detik)"""
+    kwargs.setdefault("observer", metrics.observe if metrics is not None else None)
+    kwargs.setdefault("profiler", rule_profiler)
+    return compile_ruleset(ruleset or load_ruleset(RULESET_PATH), cache=prediction_cache, **kwargs)
+
+class EngineHolder:
+    """Menyimpan satu Diagnoser bersama per proses; bisa di-inspect dan di-swap secara atomik"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._engine: Optional[Diagnoser] = None
+        self._built_at: Optional[str] = None
+        self._swaps = 0
+        self._ruleset: Optional[Ruleset] = None
+        self._compile_s: Optional[float] = None
+        self._warm_up: Optional[Dict[str, float]] = None
+
+    def get(self) -> Diagnoser:
+        engine = self._engine
+        if engine is None:
+            # Fallback lazy bila lifespan tidak dijalankan (mis. runtime serverless)
+            with self._lock:
+                if self._engine is None:
+                    ruleset = load_ruleset(RULESET_PATH)
+                    self._install(*build_engine(ruleset), ruleset)
+                engine = self._engine
+        return engine
+
+    def swap(self, engine: Diagnoser, compile_s: Optional[float] = None,
+             ruleset: Optional[Ruleset] = None) -> Optional[Diagnoser]:
+        """Ganti engine aktif; request yang sedang berjalan tetap memakai engine lama"""
+        with self._lock:
+            old = self._engine
+            self._install(engine, compile_s, ruleset)
+            self._swaps += 1
+            return old
+
+    def reload(self, source: Any = None) -> Dict[str, Any]:
+        """Validasi + compile ruleset (path/dict; default RULESET_PATH) lalu swap.
+        RulesetError -> engine lama tetap aktif. Reload berurutan, tidak saling tumpang tindih."""
+        with self._reload_lock:
+            ruleset = load_ruleset(RULESET_PATH if source is None else source)
+            engine, compile_s = build_engine(ruleset)
+            warm = engine.warm_up(medications=False)  # self-check sebelum swap; RuntimeError -> tidak di-swap
+            self.swap(engine, compile_s, ruleset)
+            self._warm_up = warm
+        return self.ruleset_info()
+
+    @property
+    def ruleset(self) -> Optional[Ruleset]:
+        return self._ruleset
+
+    def ruleset_info(self) -> Optional[Dict[str, Any]]:
+        ruleset, compile_s = self._ruleset, self._compile_s
+        if ruleset is None:
+            return None
+        return {**ruleset.info(), "compile_ms": round(compile_s * 1e3, 3) if compile_s is not None else None}
+
+    def warm_up(self) -> Dict[str, float]:
+        """Warm-up engine aktif + data obat & template laporan (dipanggil saat startup)"""
+        self._warm_up = self.get().warm_up(medications=True, reports=True)
+        return self._warm_up
+
+    def info(self) -> Dict[str, Any]:
+        engine = self.get()
+        return {**engine.describe(), "built_at": self._built_at, "swaps": self._swaps,
+                "ruleset": self.ruleset_info(),
+                "warm_up_ms": {k: round(v, 3) for k, v in self._warm_up.items()} if self._warm_up else None,
+                "cache": engine.cache.stats() if engine.cache is not None else None}
+
+    def _install(self, engine: Diagnoser, compile_s: Optional[float] = None, ruleset: Optional[Ruleset] = None):
+        self._engine = engine
+        self._ruleset = ruleset
+        self._compile_s = compile_s
+        self._built_at = datetime.now().isoformat()
+
+engine_holder = EngineHolder()
+
+def get_diagnoser() -> Diagnoser:
+    return engine_holder.get()
+
+class ExecutorOverloaded(RuntimeError):
+    """Worker & antrian penuh: request ditolak (load shedding)"""
+
+class DeadlineExceeded(RuntimeError):
+    """Pekerjaan tidak selesai sebelum deadline request"""
+
+class BoundedExecutor:
+    """Thread pool skoring dengan batas antrian dan deadline per pekerjaan.
+
+    Kapasitas = workers + max_queue pekerjaan (berjalan + menunggu); di atas itu run()
+    langsung melempar ExecutorOverloaded. Pekerjaan yang melewati deadline saat masih
+    antri dibatalkan; yang sudah berjalan tetap menempati slot sampai selesai.
+    """
+    def __init__(self, workers: int, max_queue: int, timeout: Optional[float] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = self._running = self._peak_in_flight = 0
+        self.submitted = self.completed = self.failed = self.rejected = self.timeouts = self.expired = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any, shed: bool = True,
+                  timeout: Optional[float] = -1) -> Any:
+        """Jalankan fn(*args) di worker. shed=False: lewati batas antrian (chunk stream yang
+        sudah diterima). timeout=-1: pakai default executor, None: tanpa deadline."""
+        timeout = self.timeout if timeout == -1 else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            if shed:
+                self._check_capacity()
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="predict")
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            self.submitted += 1
+            pool = self._pool
+        ctx = contextvars.copy_context()
+        try:
+            future = pool.submit(ctx.run, self._call, fn, args, deadline)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            # wait_for membatalkan future: bila masih antri, tidak akan pernah dijalankan
+            with self._lock:
+                self.timeouts += 1
+            raise DeadlineExceeded(f"tidak selesai dalam {timeout:g} s") from None
+
+    def check_capacity(self):
+        """Lempar ExecutorOverloaded bila worker & antrian penuh (tanpa submit pekerjaan)"""
+        with self._lock:
+            self._check_capacity()
+
+    def _check_capacity(self):
+        if self._in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorOverloaded(f"{self._in_flight} pekerjaan sedang diproses/antri")
+
+    def _call(self, fn: Callable[..., Any], args: Tuple[Any, ...], deadline: Optional[float]) -> Any:
+        if deadline is not None and time.monotonic() > deadline:
+            with self._lock:
+                self.expired += 1
+            raise DeadlineExceeded("deadline lewat saat antri")
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None and not future.cancelled():
+                if future.exception() is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"workers": self.workers, "max_queue": self.max_queue, "timeout_s": self.timeout,
+                    "in_flight": self._in_flight, "running": self._running,
+                    "queue_depth": self._in_flight - self._running, "peak_in_flight": self._peak_in_flight,
+                    "submitted": self.submitted, "completed": self.completed, "failed": self.failed,
+                    "rejected": self.rejected, "timeouts": self.timeouts, "expired_in_queue": self.expired}
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+predict_executor = BoundedExecutor(PREDICT_WORKERS, PREDICT_MAX_QUEUE, PREDICT_TIMEOUT_S)
+
+def _overloaded(e: ExecutorOverloaded) -> HTTPException:
+    return HTTPException(503, f"Server sibuk: {e}", headers={"Retry-After": str(PREDICT_RETRY_AFTER_S)})
+
+async def run_scoring(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """predict_executor.run dengan pemetaan ke HTTP: penuh -> 503 + Retry-After, deadline -> 504"""
+    try:
+        return await predict_executor.run(fn, *args, **kwargs)
+    except ExecutorOverloaded as e:
+        raise _overloaded(e)
+    except DeadlineExceeded as e:
+        raise HTTPException(504, f"Waktu proses habis: {e}")
+
+async def _watch_ruleset(interval: float):
+    """Hot reload: compile ulang saat mtime RULESET_PATH berubah; ruleset invalid diabaikan"""
+    def mtime() -> Optional[int]:
+        try:
+            return os.stat(RULESET_PATH).st_mtime_ns
+        except OSError:
+            return None
+    last = mtime()
+    while True:
+        await asyncio.sleep(interval)
+        current = mtime()
+        if current is None or current == last:
+            continue
+        last = current
+        try:
+            info = await predict_executor.run(engine_holder.reload, shed=False, timeout=None)
+            logger.info("Ruleset dimuat ulang: versi %s (%s ms)", info["version"], info["compile_ms"])
+        except (RulesetError, OSError, RuntimeError) as e:
+            logger.warning("Ruleset %s tidak dimuat ulang: %s", RULESET_PATH, e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bangun engine sekali saat startup, dipakai bersama oleh semua request
+    engine_holder.get()
+    if WARM_UP:
+        engine_holder.warm_up()
+    watcher = asyncio.create_task(_watch_ruleset(RULESET_WATCH_S)) if RULESET_WATCH_S > 0 else None
+    yield
+    if watcher is not None:
+        watcher.cancel()
+    predict_executor.shutdown()
 
 app = FastAPI(
     title=APP_NAME,
     version="1.0.0",
+    lifespan=lifespan,
     description="""REST API Prediksi Penyakit berbasis Fuzzy Tsukamoto (Bahasa Indonesia).
 
 ## ⚠️ PENTING - MEDICAL DISCLAIMER
@@ -50,6 +327,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if metrics is not None:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 class QuestionnaireItem(BaseModel):
     key: str
@@ -107,9 +386,112 @@ class ReportRequest(BaseModel):
 class ReportResponse(BaseModel):
     html: str
 
+class BulkReportItem(BaseModel):
+    nama: str = "Pengguna"
+    jawaban_teks: Dict[str, str]
+
+class SessionRequest(BaseModel):
+    """Buka/ubah sesi: hanya field yang dikirim yang berubah; jawaban = {key LABEL_ID: teks}"""
+    nama: Optional[str] = None
+    include_detail_rules: Optional[bool] = None
+    ambang_peringatan: Optional[float] = Field(default=None, ge=0, le=100)
+    jawaban: Dict[str, str] = {}
+
+class SessionResponse(PredictResponse):
+    session_id: str
+    rules_refired: int = 0
+
 @app.get("/health")
 def health():
-    return {"status": "ok", "app": APP_NAME, "version": API_VERSION}
+    ruleset = engine_holder.ruleset
+    return {"status": "ok", "app": APP_NAME, "version": API_VERSION,
+            "ruleset_version": ruleset.version if ruleset is not None else None}
+
+@app.get(f"/{API_VERSION}/engine")
+def engine_info():
+    return engine_holder.info()
+
+@app.post(f"/{API_VERSION}/engine/reload")
+async def reload_engine(request: Request):
+    """Muat ulang rule base: tanpa body -> baca ulang RULESET_PATH; body JSON -> ruleset tersebut.
+    Validasi & compile di worker, lalu swap atomik; request yang berjalan tetap memakai engine lama.
+    Kedua bentuk butuh X-Reload-Token; tanpa RELOAD_TOKEN di server endpoint ini nonaktif
+    (reload otomatis tetap bisa lewat RULESET_WATCH_S)."""
+    if not RELOAD_TOKEN:
+        raise HTTPException(403, "Reload lewat HTTP nonaktif: set RELOAD_TOKEN di server "
+                                 "(atau RULESET_WATCH_S untuk reload otomatis)")
+    token = request.headers.get("x-reload-token", "")
+    if not secrets.compare_digest(token.encode(), RELOAD_TOKEN.encode()):
+        raise HTTPException(403, "X-Reload-Token tidak valid")
+    body = await request.body()
+    source = None
+    if body.strip():
+        try:
+            source = json.loads(body)
+        except ValueError:
+            raise HTTPException(400, "Body bukan JSON valid")
+    old = engine_holder.ruleset
+    try:
+        info = await predict_executor.run(engine_holder.reload, source, shed=False, timeout=None)
+    except RulesetError as e:
+        raise HTTPException(422, {"message": "Ruleset tidak valid; engine lama tetap aktif", "errors": e.errors})
+    except RuntimeError as e:
+        raise HTTPException(422, {"message": "Self-check ruleset gagal; engine lama tetap aktif", "errors": [str(e)]})
+    except OSError as e:
+        raise HTTPException(500, f"Gagal membaca ruleset: {e}")
+    return {"previous_version": old.version if old is not None else None, "ruleset": info}
+
+@app.get(f"/{API_VERSION}/executor")
+def executor_info():
+    """Kedalaman antrian & penolakan pool skoring (untuk tuning autoscaling)"""
+    return predict_executor.stats()
+
+def _require_profiler() -> RuleProfiler:
+    if rule_profiler is None:
+        raise HTTPException(404, "Profiler nonaktif (RULE_PROFILER=1 untuk mengaktifkan)")
+    return rule_profiler
+
+@app.get(f"/{API_VERSION}/profile")
+def profile_info(format: Literal["json", "table"] = "json",
+                 sort: Literal["index", "time", "fired", "decided", "errors"] = "index",
+                 top: Optional[int] = Query(None, ge=1)):
+    """Statistik firing per rule sejak start/reset: evaluasi, firing non-nol, distribusi alfa,
+    waktu evaluasi, error, dan rule penentu pemenang per penyakit"""
+    snapshot = _require_profiler().snapshot(sort)
+    if format == "table":
+        return PlainTextResponse(RuleProfiler.format_table(snapshot, top) + "\n")
+    if top:
+        snapshot["rules"] = snapshot["rules"][:top]
+    return snapshot
+
+@app.delete(f"/{API_VERSION}/profile")
+def profile_reset():
+    _require_profiler().reset()
+    return {"status": "reset"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Histogram per tahap + status executor & cache dalam format teks Prometheus"""
+    if metrics is None:
+        raise HTTPException(404, "Metrics nonaktif (METRICS_ENABLED=0)")
+    lines = metrics.render()
+    ex = predict_executor.stats()
+    lines += gauge_lines("fis_executor_in_flight", "Pekerjaan skoring berjalan + antri", [("", ex["in_flight"])])
+    lines += gauge_lines("fis_executor_queue_depth", "Pekerjaan skoring yang menunggu worker", [("", ex["queue_depth"])])
+    lines += gauge_lines("fis_executor_jobs_total", "Pekerjaan executor per hasil",
+                         [(f'outcome="{k}"', ex[k]) for k in ("completed", "failed", "rejected", "timeouts")],
+                         kind="counter")
+    st = session_store.stats()
+    lines += gauge_lines("fis_sessions_active", "Sesi kuisioner aktif", [("", st["size"])])
+    lines += gauge_lines("fis_sessions_removed_total", "Sesi yang dibuang per alasan",
+                         [(f'reason="{k}"', st[k]) for k in ("evictions", "expirations", "deleted")],
+                         kind="counter")
+    cache = get_diagnoser().cache
+    if cache is not None:
+        st = cache.stats()
+        lines += gauge_lines("fis_predict_cache_total", "Lookup cache prediksi per hasil",
+                             [(f'result="{k}"', st[k]) for k in ("hits", "misses") if k in st], kind="counter")
+    return Response("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get(f"/{API_VERSION}/schema", response_model=SchemaResponse)
 def get_schema():
@@ -120,11 +502,37 @@ def get_schema():
     ]
     return {"version": API_VERSION, "questions": questions}
 
-@app.post(f"/{API_VERSION}/predict", response_model=PredictResponse)
-def predict(payload: PredictRequest):
-    clf = Diagnoser()
-    result = clf.predict(payload.to_internal_dict(), return_details=payload.include_detail_rules)
-    
+class RawJSON(str):
+    """Fragmen JSON siap pakai; disisipkan apa adanya oleh encode_json_object"""
+
+_ENCODERS = {seps: json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=seps).encode
+             for seps in JSON_SEPARATORS.values()}
+
+def encode_json_object(obj: Dict[str, Any], separators: Tuple[str, str] = JSON_SEPARATORS["default"]) -> str:
+    """json.dumps (ensure_ascii=False) untuk dict top-level; nilai RawJSON tidak di-encode ulang.
+    Key berurutan tanpa RawJSON di-encode sekaligus dalam satu panggilan encoder."""
+    item_sep, key_sep = separators
+    dumps = _ENCODERS.get(separators) or json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=separators).encode
+    parts: List[str] = []
+    run: Dict[str, Any] = {}
+    for k, v in obj.items():
+        if isinstance(v, RawJSON):
+            if run:
+                parts.append(dumps(run)[1:-1])
+                run = {}
+            parts.append(dumps(k) + key_sep + v)
+        else:
+            run[k] = v
+    if run:
+        parts.append(dumps(run)[1:-1])
+    return "{" + item_sep.join(parts) + "}"
+
+def build_predict_response(payload: PredictRequest, result: Dict[str, Any],
+                           medication_json: Optional[str] = None) -> Dict[str, Any]:
+    """Susun body PredictResponse dari hasil Diagnoser.predict.
+    medication_json ("default"/"compact"): rekomendasi_obat sebagai RawJSON pra-encode untuk encode_json_object
+    (jalur default /v1/predict); None = FrozenDict dari get_medication_recommendations, yang masih
+    di-serialize ulang oleh pydantic (FAST_RESPONSE=0, /v1/report, sesi)"""
     top = result.get("diagnosa_sementara")
     if not top:
         rekom = "Pantau gejala. Konsultasikan ke tenaga kesehatan bila perlu."
@@ -150,11 +558,15 @@ def predict(payload: PredictRequest):
     # Get medication recommendations if diagnosis exists
     medication_recommendations = None
     if top and top.get("skor", 0) >= 30:  # Only show medications for significant scores
+        t0 = time.perf_counter()
         disease_name = top.get("penyakit", "")
         severity_score = top.get("skor", 0)
-        medication_recommendations = get_medication_recommendations(disease_name, severity_score)
-    
-    from datetime import datetime
+        if medication_json:
+            medication_recommendations = RawJSON(medication_recommendations_json(disease_name, severity_score, medication_json))
+        else:
+            medication_recommendations = get_medication_recommendations(disease_name, severity_score)
+        if metrics is not None:
+            metrics.observe("medication", time.perf_counter() - t0)
     
     return {
         "nama": payload.nama or "Pengguna",
@@ -171,15 +583,316 @@ def predict(payload: PredictRequest):
         "api_version": "enhanced_v1"
     }
 
-@app.post(f"/{API_VERSION}/report", response_model=ReportResponse)
-def report(req: ReportRequest):
+def score_payload(payload: PredictRequest) -> Dict[str, Any]:
+    clf = get_diagnoser()
+    result = clf.predict(payload.to_internal_dict(), return_details=payload.include_detail_rules)
+    return build_predict_response(payload, result)
+
+def score_payload_bytes(payload: PredictRequest) -> bytes:
+    """score_payload yang langsung di-encode seperti JSONResponse (compact, ensure_ascii=False),
+    urutan key = urutan field PredictResponse; rekomendasi_obat memakai fragmen pra-encode"""
+    clf = get_diagnoser()
+    result = clf.predict(payload.to_internal_dict(), return_details=payload.include_detail_rules)
+    body = build_predict_response(payload, result, medication_json="compact")
+    t0 = time.perf_counter()
+    data = encode_json_object(body, JSON_SEPARATORS["compact"]).encode("utf-8")
+    if metrics is not None:
+        metrics.observe("serialize", time.perf_counter() - t0)
+    return data
+
+@app.post(f"/{API_VERSION}/predict", response_model=PredictResponse)
+async def predict(payload: PredictRequest):
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/predict", payload.include_detail_rules)
+    if FAST_RESPONSE:
+        # Response langsung dilewatkan FastAPI; skema OpenAPI tetap dari response_model
+        return Response(await run_scoring(score_payload_bytes, payload), media_type="application/json")
+    body = await run_scoring(score_payload, payload)
+    if metrics is not None:
+        metrics.handler_done()  # validasi response_model + JSON encode = tahap serialize
+    return body
+
+def _describe_error(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'body'}: {err['msg']}" for err in e.errors())
+    return str(e)
+
+def _score_batch_chunk(chunk: List[Tuple[int, Any]]) -> bytes:
+    """Skor satu chunk item batch -> baris NDJSON; item yang gagal diisi slot error"""
+    clf = get_diagnoser()
+    lines = []
+    for index, item in chunk:
+        try:
+            if isinstance(item, Exception):
+                raise item
+            payload = PredictRequest.model_validate(item)
+            if metrics is not None:
+                metrics.set_labels(f"/{API_VERSION}/predict/batch", payload.include_detail_rules)
+            result = clf.predict(payload.to_internal_dict(), return_details=payload.include_detail_rules)
+            out = {"index": index, **build_predict_response(payload, result, medication_json="default"), "error": None}
+        except Exception as e:
+            out = {"index": index, "error": _describe_error(e)}
+        t0 = time.perf_counter()
+        lines.append(encode_json_object(out))
+        if metrics is not None:
+            metrics.observe("serialize", time.perf_counter() - t0)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[Any]:
+    """Baca body NDJSON baris per baris tanpa memuat seluruh body ke memori"""
+    def decode(line: bytes) -> Any:
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return ValueError(f"Baris NDJSON tidak valid: {e}")
+    buf = b""
+    async for data in request.stream():
+        buf += data
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield decode(line)
+    if buf.strip():
+        yield decode(buf)
+
+class _RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse yang tidak ikut membaca receive(), karena body request
+    (NDJSON) masih di-stream oleh generator; disconnect terdeteksi lewat request.stream()."""
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def _iter_list(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+async def _stream_chunks(items: AsyncIterator[Any], process_chunk: Callable[[List[Tuple[int, Any]]], bytes]) -> AsyncIterator[bytes]:
+    """Kelompokkan item per BATCH_CHUNK_SIZE dan proses tiap chunk di predict_executor"""
+    chunk: List[Tuple[int, Any]] = []
+    index = 0
+    async for item in items:
+        chunk.append((index, item))
+        index += 1
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            # Batch yang sudah diterima tidak di-shed di tengah stream
+            yield await predict_executor.run(process_chunk, chunk, shed=False, timeout=None)
+            chunk = []
+    if chunk:
+        yield await predict_executor.run(process_chunk, chunk, shed=False, timeout=None)
+
+def _stream_batch(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    return _stream_chunks(items, _score_batch_chunk)
+
+async def _read_items(request: Request, what: str) -> Tuple[AsyncIterator[Any], bool]:
+    """Item batch dari body: list JSON / {"items": [...]} / NDJSON -> (iterator, streaming body?)"""
+    try:
+        predict_executor.check_capacity()
+    except ExecutorOverloaded as e:
+        raise _overloaded(e)
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return _iter_ndjson(request), True
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(400, "Body bukan JSON valid")
+    if isinstance(body, dict):
+        body = body.get("items")
+    if not isinstance(body, list):
+        raise HTTPException(422, f"Body harus berupa list {what}, {{\"items\": [...]}}, atau NDJSON")
+    return _iter_list(body), False
+
+def _streaming_response(body: AsyncIterator[bytes], request_body_streamed: bool, **kwargs: Any) -> StreamingResponse:
+    cls = _RequestStreamingResponse if request_body_streamed else StreamingResponse
+    return cls(body, **kwargs)
+
+@app.post(
+    f"/{API_VERSION}/predict/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}},
+                     "description": "Satu baris JSON per kuisioner (field PredictResponse + index + error)"}},
+)
+async def predict_batch(request: Request):
+    """Prediksi banyak kuisioner sekaligus.
+
+    Body: list JSON `PredictRequest` (atau `{"items": [...]}`), atau NDJSON
+    (`Content-Type: application/x-ndjson`) satu kuisioner per baris. Hasil di-stream
+    sebagai NDJSON per chunk; item yang gagal validasi tidak menggagalkan batch.
+    """
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/predict/batch", "mixed")
+    items, streamed = await _read_items(request, "kuisioner")
+    return _streaming_response(_stream_batch(items), streamed, media_type=NDJSON_MEDIA_TYPE)
+
+def build_report(req: ReportRequest) -> Dict[str, str]:
+    from fis_templates import render_report_html  # template laporan dimuat lazy (cold start)
+    t0 = time.perf_counter()
     try:
-        html = render_report_html(req.nama, req.jawaban_teks, req.hasil, ambang_peringanan=req.ambang_peringatan)
-        return {"html": html}
-    except TypeError:
-        # fallback untuk typo arg name
-        html = render_report_html(req.nama, req.jawaban_teks, req.hasil, ambang_peringatan=req.ambang_peringatan)
-        return {"html": html}
+        doc = render_report_html(req.nama, req.jawaban_teks, req.hasil, ambang_peringatan=req.ambang_peringatan)
     except Exception as e:
         raise HTTPException(400, f"Gagal buat laporan: {e}")
+    if metrics is not None:
+        metrics.observe("render", time.perf_counter() - t0)
+    return {"html": doc}
+
+def _report_chunks(req: ReportRequest) -> Iterable[str]:
+    # Fragmen dinamis dihitung di sini (worker); sisa iterasi hanya menyambung string statis
+    from fis_templates import iter_report_html
+    t0 = time.perf_counter()
+    try:
+        chunks = iter_report_html(req.nama, req.jawaban_teks, req.hasil, ambang_peringatan=req.ambang_peringatan)
+    except Exception as e:
+        raise HTTPException(400, f"Gagal buat laporan: {e}")
+    if metrics is not None:
+        metrics.observe("render", time.perf_counter() - t0)
+    return chunks
+
+async def _encode_chunks(chunks: Iterable[str]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+def _session_payload(session: DiagnosisSession, req: SessionRequest) -> PredictRequest:
+    # Pengaturan respons (nama, detail, ambang) disimpan di sesi sebagai PredictRequest
+    payload = session.meta.get("payload") or PredictRequest()
+    changes = {k: v for k, v in (("nama", req.nama), ("include_detail_rules", req.include_detail_rules),
+                                 ("ambang_peringatan", req.ambang_peringatan)) if v is not None}
+    if changes:
+        payload = payload.model_copy(update=changes)
+    session.meta["payload"] = payload
+    return payload
+
+def _session_body(session: DiagnosisSession, payload: PredictRequest) -> Dict[str, Any]:
+    result = session.result(payload.include_detail_rules)
+    return {"session_id": session.id, **build_predict_response(payload, result),
+            "rules_refired": session.last_refired}
+
+def _get_session(session_id: str) -> DiagnosisSession:
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(404, "Sesi tidak ditemukan atau sudah kedaluwarsa")
+    return session
+
+def open_session(req: SessionRequest) -> Dict[str, Any]:
+    try:
+        session = DiagnosisSession(get_diagnoser(), req.jawaban)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    payload = _session_payload(session, req)
+    session_store.create(session)
+    return _session_body(session, payload)
+
+def update_session(session_id: str, req: SessionRequest) -> Dict[str, Any]:
+    session = _get_session(session_id)
+    with session.lock:
+        try:
+            session.update(req.jawaban, engine=get_diagnoser())
+        except ValueError as e:
+            raise HTTPException(422, str(e))
+        return _session_body(session, _session_payload(session, req))
+
+@app.post(f"/{API_VERSION}/session", response_model=SessionResponse)
+async def session_open(req: SessionRequest):
+    """Buka sesi kuisioner interaktif; kirim ulang hanya jawaban yang berubah lewat PATCH"""
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/session", bool(req.include_detail_rules))
+    body = await run_scoring(open_session, req)
+    if metrics is not None:
+        metrics.handler_done()
+    return body
+
+@app.patch(f"/{API_VERSION}/session/{{session_id}}", response_model=SessionResponse)
+async def session_update(session_id: str, req: SessionRequest):
+    """Ubah sebagian jawaban: hanya rule yang membaca gejala yang berubah ditembakkan ulang"""
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/session", bool(req.include_detail_rules))
+    body = await run_scoring(update_session, session_id, req)
+    if metrics is not None:
+        metrics.handler_done()
+    return body
+
+def read_session(session_id: str) -> Dict[str, Any]:
+    session = _get_session(session_id)
+    with session.lock:
+        return _session_body(session, session.meta["payload"])
+
+@app.get(f"/{API_VERSION}/session/{{session_id}}", response_model=SessionResponse)
+async def session_get(session_id: str):
+    """Hasil sesi terakhir; lewat executor seperti open/update (session.result() bisa menghitung ulang)"""
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/session")
+    body = await run_scoring(read_session, session_id)
+    if metrics is not None:
+        metrics.handler_done()
+    return body
+
+@app.delete(f"/{API_VERSION}/session/{{session_id}}")
+def session_close(session_id: str):
+    if not session_store.delete(session_id):
+        raise HTTPException(404, "Sesi tidak ditemukan atau sudah kedaluwarsa")
+    return {"status": "closed"}
+
+@app.post(f"/{API_VERSION}/report", response_model=ReportResponse)
+async def report(req: ReportRequest):
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/report")
+    body = await run_scoring(build_report, req)
+    if metrics is not None:
+        metrics.handler_done()
+    return body
+
+@app.post(
+    f"/{API_VERSION}/report/html",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/html": {}}, "description": "Dokumen HTML laporan, dikirim per bagian"}},
+)
+async def report_html(req: ReportRequest):
+    """Laporan sebagai text/html langsung (tanpa bungkus JSON), dikirim chunked per kartu"""
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/report/html")
+    chunks = await run_scoring(_report_chunks, req)
+    return StreamingResponse(_encode_chunks(chunks), media_type="text/html; charset=utf-8")
+
+def _write_report_chunk(writer: BulkReportWriter, chunk: List[Tuple[int, Any]]) -> bytes:
+    parts = []
+    for index, item in chunk:
+        try:
+            if isinstance(item, Exception):
+                raise item
+            entry = BulkReportItem.model_validate(item)
+            parts.append(writer.add(index, entry.nama, entry.jawaban_teks))
+        except Exception as e:
+            parts.append(writer.add_error(index, _describe_error(e)))
+    return b"".join(parts)
+
+async def _stream_bulk_reports(items: AsyncIterator[Any], writer: BulkReportWriter) -> AsyncIterator[bytes]:
+    head = writer.start()
+    if head:
+        yield head
+    async for data in _stream_chunks(items, partial(_write_report_chunk, writer)):
+        if data:
+            yield data
+    yield await predict_executor.run(writer.finish, shed=False, timeout=None)
+
+@app.post(
+    f"/{API_VERSION}/report/bulk",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/zip": {}, "text/html": {}},
+                     "description": "ZIP satu file HTML per pasien, atau satu dokumen HTML multi-halaman"}},
+)
+async def report_bulk(request: Request, format: Literal["zip", "html"] = "zip",
+                      ambang_peringatan: float = Query(DEFAULT_WARNING_THRESHOLD, ge=0, le=100)):
+    """Laporan banyak pasien sekaligus.
+
+    Body: list `{"nama": ..., "jawaban_teks": {...}}` (atau `{"items": [...]}`), atau NDJSON satu
+    pasien per baris. Prediksi & render dijalankan per chunk dan hasilnya di-stream begitu selesai;
+    entri yang gagal dicatat di `errors.ndjson` (ZIP) atau bagian "Entri gagal" (HTML).
+    """
+    if metrics is not None:
+        metrics.track(f"/{API_VERSION}/report/bulk")
+    items, streamed = await _read_items(request, "pasien")
+    writer = BulkReportWriter(format, ambang_peringatan, get_diagnoser())
+    headers = {"Content-Disposition": f'attachment; filename="laporan.{format}"'} if format == "zip" else None
+    return _streaming_response(_stream_bulk_reports(items, writer), streamed,
+                               media_type=MEDIA_TYPES[format], headers=headers)
 # Example to run the app:
\ No newline at end of file
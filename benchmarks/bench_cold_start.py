@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: cold start serverless (api/index.py seperti di Vercel).
+1. Profil waktu import per modul (python -X importtime), dikelompokkan per paket top-level.
+2. Time-to-first-response: proses baru -> import app -> lifespan startup -> POST /v1/predict
+   pertama & kedua (panggilan ASGI langsung, tanpa server/HTTP client), dengan WARM_UP=1 vs 0.
+Jalankan: python benchmarks/bench_cold_start.py [--runs 5] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+import asyncio, json, os, runpy, sys
+sys.path.insert(0, ROOT)
+app = runpy.run_path(os.path.join(ROOT, "api", "index.py"))["app"]
+t_import = time.perf_counter()
+
+async def lifespan_startup(app):
+    inbox, outbox = asyncio.Queue(), asyncio.Queue()
+    await inbox.put({"type": "lifespan.startup"})
+    task = asyncio.ensure_future(app({"type": "lifespan", "asgi": {"version": "3.0"}}, inbox.get, outbox.put))
+    message = await outbox.get()
+    assert message["type"] == "lifespan.startup.complete", message
+    return task
+
+async def request(app, path, payload):
+    body = json.dumps(payload).encode()
+    sent = []
+    async def receive():
+        if not sent:
+            sent.append(1)
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+    out = {"status": None, "body": b""}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            out["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            out["body"] += message.get("body", b"")
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"host", b"localhost")],
+             "client": ("127.0.0.1", 1), "server": ("localhost", 80)}
+    await app(scope, receive, send)
+    assert out["status"] == 200, out
+    return out["body"]
+
+async def main():
+    await lifespan_startup(app)
+    t_startup = time.perf_counter()
+    payload = {"nama": "cold", "fever": "berat", "cough": "sering", "sore_throat": "berat"}
+    await request(app, "/v1/predict", payload)
+    t_first = time.perf_counter()
+    await request(app, "/v1/predict", dict(payload, cough="kadang"))
+    t_second = time.perf_counter()
+    print(json.dumps({"import": t_import - t0, "startup": t_startup - t_import,
+                      "first": t_first - t_startup, "second": t_second - t_first}))
+    os._exit(0)
+
+asyncio.run(main())
+""".replace("ROOT", repr(ROOT))
+
+def import_profile(top: int):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import runpy; runpy.run_path('api/index.py')"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    own = {}
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        packages[name.split(".")[0]] = packages.get(name.split(".")[0], 0) + int(self_us)
+        if name.startswith("fis_") or name == "api_app":
+            own[name] = (int(self_us), int(cum_us))
+    total = sum(packages.values())
+    print(f"Import api/index.py: {total / 1e3:.1f} ms (jumlah waktu self semua modul)")
+    print(f"{'paket':<28} {'ms':>8} {'%':>6}")
+    for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{name:<28} {us / 1e3:>8.1f} {us / total:>6.1%}")
+    print(f"\n{'modul proyek':<28} {'self ms':>8} {'kumulatif ms':>13}")
+    for name, (self_us, cum_us) in sorted(own.items(), key=lambda kv: -kv[1][1]):
+        print(f"{name:<28} {self_us / 1e3:>8.1f} {cum_us / 1e3:>13.1f}")
+
+def first_response(runs: int, warm_up: str):
+    env = dict(os.environ, WARM_UP=warm_up, METRICS_ENABLED="1")
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                              capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - t0
+        samples.append(dict(json.loads(proc.stdout.strip().splitlines()[-1]), wall=wall))
+    return {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5, help="jumlah proses baru per konfigurasi (median)")
+    ap.add_argument("--top", type=int, default=15, help="paket termahal yang ditampilkan")
+    args = ap.parse_args()
+
+    import_profile(args.top)
+    print(f"\nTime-to-first-response (median {args.runs} proses, ms)")
+    print(f"{'WARM_UP':<8} {'import':>8} {'startup':>8} {'req #1':>8} {'req #2':>8} {'total':>8} {'proses':>8}")
+    for warm_up in ("0", "1"):
+        r = first_response(args.runs, warm_up)
+        total = r["import"] + r["startup"] + r["first"]
+        print(f"{warm_up:<8} {r['import'] * 1e3:>8.1f} {r['startup'] * 1e3:>8.1f} {r['first'] * 1e3:>8.1f} "
+              f"{r['second'] * 1e3:>8.1f} {total * 1e3:>8.1f} {r['wall'] * 1e3:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: output batch untuk analitik hilir - JSONL (dict predict per baris) vs CSV vs format
+kolomnar fis_columnar (npz, direktori npy, fcol memory-mapped). Per format: waktu tulis dari
+BatchPrediction, ukuran file, waktu load sampai satu kolom skor siap dipakai, dan waktu
+agregasi (rata-rata semua kolom skor) setelah load.
+Jalankan: python benchmarks/bench_columnar.py [--n 200000]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_columnar import open_columns, write_columns
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+WORDS = ["tidak", "tidak", "tidak", "ringan", "sedang", "berat", "sangat berat", "kadang", "sering", "ya"]
+
+def size_of(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+def write_jsonl(path, batch):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(len(batch)):
+            f.write(json.dumps(batch.to_dict(i), ensure_ascii=False) + "\n")
+
+def load_jsonl(path, diseases):
+    cols = {d: [] for d in diseases}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            skor = json.loads(line)["skor"]
+            for d in diseases:
+                cols[d].append(skor.get(d, np.nan))
+    return {d: np.array(v) for d, v in cols.items()}
+
+def write_csv(path, batch):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow([f"skor_{d}" for d in batch.diseases] + [f"confidence_{d}" for d in batch.diseases])
+        w.writerows(np.hstack([batch.scores, batch.confidence]).tolist())
+
+def load_csv(path, diseases):
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))[1:]
+    return {d: np.array([float(r[j]) for r in rows]) for j, d in enumerate(diseases)}
+
+def load_columnar(path, diseases):
+    cols = open_columns(path)["columns"]
+    return {d: cols[f"skor_{d}"] for d in diseases}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=200000, help="jumlah hasil")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    inputs = [{k: rnd.choice(WORDS) for k in LABEL_ID} for _ in range(args.n)]
+    batch = Diagnoser().predict_batch(inputs)
+    diseases = batch.diseases
+    tmp = tempfile.mkdtemp()
+    formats = [
+        ("jsonl", "hasil.jsonl", lambda p: write_jsonl(p, batch), load_jsonl),
+        ("csv (skor+conf)", "hasil.csv", lambda p: write_csv(p, batch), load_csv),
+        ("npz", "hasil.npz", lambda p: write_columns(p, batch, "npz"), load_columnar),
+        ("npy (direktori)", "hasil_npy", lambda p: write_columns(p, batch, "npy"), load_columnar),
+        ("fcol (memmap)", "hasil.fcol", lambda p: write_columns(p, batch, "fcol"), load_columnar),
+    ]
+    print(f"{args.n:,} hasil, {len(diseases)} penyakit")
+    print(f"{'format':<18} {'tulis s':>8} {'MB':>8} {'load ms':>9} {'agregasi ms':>12} {'load vs jsonl':>14}")
+    base = None
+    try:
+        for name, file, write, load in formats:
+            path = os.path.join(tmp, file)
+            t0 = time.perf_counter()
+            write(path)
+            t_write = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            cols = load(path, diseases)
+            t_load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            means = [float(np.nanmean(cols[d])) for d in diseases]
+            t_agg = time.perf_counter() - t0
+            assert len(means) == len(diseases)
+            base = base or t_load
+            print(f"{name:<18} {t_write:>8.2f} {size_of(path) / 1e6:>8.1f} {t_load * 1e3:>9.1f} "
+                  f"{t_agg * 1e3:>12.1f} {base / t_load:>13.0f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: loop Rule.fire (lambda per rule) vs RulePlan hasil compile_rules.
+Jalankan: python benchmarks/bench_compiled_rules.py [--n 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import Diagnoser
+
+SAMPLE = {
+    "fever": "berat", "cough": "sering", "sore_throat": "parah", "headache": "sedang",
+    "body_ache": "tinggi", "nausea_vomit": "tidak", "diarrhea": "tidak",
+    "abdominal_pain": "tidak", "rash": "tidak", "fatigue": "sering",
+}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000, help="jumlah iterasi per skenario")
+    args = ap.parse_args()
+
+    loop = Diagnoser(compiled=False)
+    compiled = Diagnoser()
+    I = compiled._ensure_inputs(SAMPLE)
+    n_terms = sum(len(r.antecedent.terms) for r in compiled.rules)
+    print(f"evaluasi membership per predict: {n_terms} (loop) -> {len(compiled.plan.terms)} (compiled)")
+
+    us = lambda t: t / args.n * 1e6
+    t_loop = timeit.timeit(lambda: loop._fire_rules(I), number=args.n)
+    t_comp = timeit.timeit(lambda: compiled._fire_rules(I), number=args.n)
+    print(f"fire rules (loop)      : {us(t_loop):8.2f} us")
+    print(f"fire rules (compiled)  : {us(t_comp):8.2f} us  ({t_loop / t_comp:.2f}x)")
+    t_loop = timeit.timeit(lambda: loop.predict(SAMPLE), number=args.n)
+    t_comp = timeit.timeit(lambda: compiled.predict(SAMPLE), number=args.n)
+    print(f"predict (loop)         : {us(t_loop):8.2f} us")
+    print(f"predict (compiled)     : {us(t_comp):8.2f} us  ({t_loop / t_comp:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Diagnoser() baru per request vs satu engine bersama (prebuilt).
+Jalankan: python benchmarks/bench_engine_reuse.py [--n 5000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import Diagnoser
+
+SAMPLE = {
+    "fever": "berat", "cough": "sering", "sore_throat": "parah", "headache": "sedang",
+    "body_ache": "tinggi", "nausea_vomit": "tidak", "diarrhea": "tidak",
+    "abdominal_pain": "tidak", "rash": "tidak", "fatigue": "sering",
+}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=5000, help="jumlah predict per skenario")
+    args = ap.parse_args()
+
+    shared = Diagnoser()
+    per_request = timeit.timeit(lambda: Diagnoser().predict(SAMPLE), number=args.n)
+    prebuilt = timeit.timeit(lambda: shared.predict(SAMPLE), number=args.n)
+    build_only = timeit.timeit(Diagnoser, number=args.n)
+
+    us = lambda t: t / args.n * 1e6
+    print(f"Diagnoser() + predict per request : {us(per_request):8.1f} us/req")
+    print(f"shared Diagnoser.predict          : {us(prebuilt):8.1f} us/req")
+    print(f"Diagnoser() saja (overhead build) : {us(build_only):8.1f} us/req")
+    print(f"hemat per request                 : {us(per_request - prebuilt):8.1f} us "
+          f"({(1 - prebuilt / per_request) * 100:.1f}%)")
+
+if __name__ == "__main__":
+    main()
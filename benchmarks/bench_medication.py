@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: rekomendasi obat - dict dibangun ulang per panggilan (cara lama) vs payload beku
+yang dibangun sekali, dan json.dumps payload vs fragmen JSON pra-encode. Dua distribusi skor:
+"predict" = (penyakit, skor) diagnosa dari kuisioner acak (berulang, seperti trafik nyata) dan
+"acak" = skor uniform 30..100 (hampir tidak pernah berulang; kasus terburuk cache hasil).
+Jalankan: python benchmarks/bench_medication.py [--n 200000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import (LABEL_ID, MEDICATION_DATABASE, Diagnoser, get_medication_recommendations,
+                           medication_recommendations_json)
+
+WORDS = ["tidak", "tidak", "tidak", "ringan", "sedang", "berat", "sangat berat", "kadang", "sering", "ya"]
+
+def legacy_get_medication_recommendations(disease_name, severity_score):
+    # Salinan implementasi lama: dict baru + list bersama dari MEDICATION_DATABASE per panggilan
+    if disease_name not in MEDICATION_DATABASE:
+        return {"error": "Penyakit tidak ditemukan dalam database obat",
+                "disclaimer": "⚠️ Selalu konsultasikan dengan tenaga kesehatan profesional untuk rekomendasi pengobatan yang tepat."}
+    disease_data = MEDICATION_DATABASE[disease_name]
+    if severity_score >= 80:
+        severity_level = "severe"
+    elif severity_score >= 60:
+        severity_level = "moderate"
+    else:
+        severity_level = "mild"
+    recommendations = disease_data["severity_levels"][severity_level]
+    return {
+        "disease": disease_name,
+        "category": disease_data["category"],
+        "severity_level": severity_level,
+        "severity_score": severity_score,
+        "medications": recommendations["medications"],
+        "general_advice": recommendations["general_advice"],
+        "emergency_signs": disease_data["emergency_signs"],
+        "disclaimer": "⚠️ PENTING: Rekomendasi obat ini HANYA UNTUK EDUKASI. BUKAN pengganti diagnosis dan pengobatan dokter. Selalu periksa ke dokter sebelum minum obat apapun. Setiap orang kondisi kesehatannya berbeda-beda.",
+        "warning": "🚨 Jika mengalami gejala darurat seperti yang tertera di atas, segera ke rumah sakit atau hubungi ambulance. JANGAN tunda!",
+        "note": "💊 Obat-obatan harus sesuai resep dokter dan kondisi kesehatan masing-masing orang. Dosis bisa berbeda tergantung usia, berat badan, dan kondisi kesehatan."
+    }
+
+def timed(fn, cases):
+    t0 = time.perf_counter()
+    for d, s in cases:
+        fn(d, s)
+    return (time.perf_counter() - t0) / len(cases)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=200000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    diseases = list(MEDICATION_DATABASE)
+    clf = Diagnoser()
+    predicted = []
+    while len(predicted) < args.n:
+        top = clf.predict({k: rnd.choice(WORDS) for k in LABEL_ID})["diagnosa_sementara"]
+        if top and top["skor"] >= 30:
+            predicted.append((top["penyakit"], top["skor"]))
+    uniform = [(rnd.choice(diseases), round(rnd.uniform(30, 100), 2)) for _ in range(args.n)]
+
+    dump = lambda o: json.dumps(o, ensure_ascii=False)
+    rows = [
+        ("dict lama", legacy_get_medication_recommendations),
+        ("FrozenDict pra-bangun", get_medication_recommendations),
+        ("dict lama + json.dumps", lambda d, s: dump(legacy_get_medication_recommendations(d, s))),
+        ("FrozenDict + json.dumps", lambda d, s: dump(get_medication_recommendations(d, s))),
+        ("fragmen JSON pra-encode", medication_recommendations_json),
+    ]
+    same = all(dump(legacy_get_medication_recommendations(d, s)) == medication_recommendations_json(d, s)
+               and dump(get_medication_recommendations(d, s)) == dump(legacy_get_medication_recommendations(d, s))
+               for d, s in predicted[:1000] + uniform[:1000])
+    print(f"{len(set(predicted)):,} pasangan (penyakit, skor) unik di {args.n:,} diagnosa 'predict'")
+    print(f"{'':24}  {'predict':>9} {'acak':>9}  (us/panggilan)")
+    for name, fn in rows:
+        print(f"{name:24}: {timed(fn, predicted) * 1e6:9.2f} {timed(fn, uniform) * 1e6:9.2f}")
+    print(f"Hasil identik dengan cara lama: {same}")
+
+if __name__ == "__main__":
+    main()
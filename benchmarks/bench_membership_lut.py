@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark + laporan error: membership analitik (tri/trap) vs MembershipTable terkuantisasi.
+Jalankan: python benchmarks/bench_membership_lut.py [--resolution 0.01] [--n 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import Diagnoser, make_symptom_vars, membership_error_report
+
+LEVELS = ["0", "1.5", "3", "4.5", "5.5", "7", "7.5", "8", "9.5", "10"]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--resolution", type=float, default=0.01)
+    ap.add_argument("--n", type=int, default=20000, help="jumlah predict per mode")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    print(f"Error absolut maksimum vs fungsi analitik (resolusi {args.resolution}):")
+    print(f"  {'himpunan':18s} {'fungsi':28s} {'exact':>10s} {'interp':>10s}")
+    for row in membership_error_report(make_symptom_vars(), args.resolution):
+        name = f"{row['variable']}/{row['set']}"
+        print(f"  {name:18s} {row['function']:28s} {row['max_abs_error_exact']:10.2e} "
+              f"{row['max_abs_error_interp']:10.2e}")
+
+    rnd = random.Random(args.seed)
+    engines = {
+        "analitik": Diagnoser(),
+        "tabel (exact)": Diagnoser(membership_resolution=args.resolution),
+        "tabel (interp)": Diagnoser(membership_resolution=args.resolution, membership_exact=False),
+    }
+    order = engines["analitik"].input_order
+    rows = [engines["analitik"]._ensure_inputs({k: rnd.choice(LEVELS) for k in order}) for _ in range(1000)]
+
+    for label, run in (("membership + antecedent (RulePlan)", lambda clf, I: clf.plan.evaluate(I)),
+                       ("fire semua rule", lambda clf, I: clf._fire_rules(I))):
+        print(f"\n{label} per kuisioner (n={args.n}, input level lexicon):")
+        base = None
+        for name, clf in engines.items():
+            t0 = time.perf_counter()
+            for i in range(args.n):
+                run(clf, rows[i % len(rows)])
+            t = (time.perf_counter() - t0) / args.n
+            base = base or t
+            print(f"  {name:16s}: {t * 1e6:7.2f} us  ({base / t:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: memori hasil prediksi yang disimpan (mis. post-processing batch) - dict predict()
+vs CompactResult (array('d') per hasil, sumbu gejala/penyakit bersama) vs BatchPrediction (NumPy).
+Dilaporkan dalam byte per 100k hasil (tracemalloc), plus biaya predict_compact / to_dict.
+Jalankan: python benchmarks/bench_memory.py [--n 100000]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+WORDS = ["tidak", "tidak", "tidak", "ringan", "sedang", "berat", "sangat berat", "kadang", "sering", "ya"]
+
+def retained(build):
+    """Byte yang masih teralokasi setelah build() (objek hasilnya tetap dipegang)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return kept, size
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=100000, help="jumlah hasil yang disimpan")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    inputs = [{k: rnd.choice(WORDS) for k in LABEL_ID} for _ in range(args.n)]
+    clf = Diagnoser()
+    scale = 100000 / args.n
+
+    builds = [
+        ("dict predict()", lambda: [clf.predict(x) for x in inputs]),
+        ("CompactResult", lambda: [clf.predict_compact(x) for x in inputs]),
+        ("BatchPrediction (NumPy)", lambda: clf.predict_batch(inputs)),
+    ]
+    rows = []
+    kept = {}
+    for name, build in builds:
+        t0 = time.perf_counter()
+        build()  # waktu diukur tanpa tracemalloc (tracing memperlambat alokasi)
+        elapsed = time.perf_counter() - t0
+        kept[name], size = retained(build)
+        rows.append((name, size, elapsed))
+    dicts, compact = kept["dict predict()"], kept["CompactResult"]
+
+    assert all(c.to_dict() == d for c, d in zip(compact[:2000], dicts[:2000]))
+    t0 = time.perf_counter()
+    for c in compact:
+        c.to_dict()
+    to_dict_us = (time.perf_counter() - t0) / args.n * 1e6
+
+    base = rows[0][1]
+    print(f"{args.n:,} hasil disimpan (return_details=False)")
+    print(f"{'representasi':<26} {'MB / 100k':>10} {'B / hasil':>10} {'vs dict':>8} {'us / hasil':>11}")
+    for name, size, elapsed in rows:
+        print(f"{name:<26} {size * scale / 1e6:>10.1f} {size / args.n:>10.0f} {base / size:>7.1f}x "
+              f"{elapsed / args.n * 1e6:>11.2f}")
+    print(f"CompactResult.to_dict(): {to_dict_us:.2f} us/hasil")
+    rule, var = clf.rules[0], next(iter(clf.vars.values()))
+    print(f"objek engine: Rule {sys.getsizeof(rule)} B (__dict__: {hasattr(rule, '__dict__')}), "
+          f"FuzzyVar {sys.getsizeof(var)} B (__dict__: {hasattr(var, '__dict__')})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: overhead instrumentasi per tahap (observer StageMetrics) pada Diagnoser.predict,
+dibandingkan engine tanpa observer (setara METRICS_ENABLED=0).
+Jalankan: python benchmarks/bench_metrics.py [--n 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_metrics import StageMetrics
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    words = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang"]
+    inputs = [{k: rnd.choice(words) for k in LABEL_ID} for _ in range(args.n)]
+    metrics = StageMetrics()
+    StageMetrics.set_labels("/v1/predict", False)
+    engines = {"tanpa metrics": Diagnoser(), "dengan metrics": Diagnoser(observer=metrics.observe)}
+
+    best = {}
+    for _ in range(args.repeat):
+        for name, clf in engines.items():
+            t0 = time.perf_counter()
+            for x in inputs:
+                clf.predict(x)
+            dt = time.perf_counter() - t0
+            best[name] = min(best.get(name, dt), dt)
+    base = best["tanpa metrics"]
+    for name, dt in best.items():
+        print(f"{name:15s} {dt / args.n * 1e6:8.2f} us/predict  ({dt / base - 1:+.1%})")
+    count = sum(1 for line in metrics.render() if line.startswith("fis_stage_duration_seconds_count"))
+    print(f"{count} seri histogram tahap terisi")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: throughput score_parallel (shared memory, multi-proses) per jumlah worker
+dibanding predict_batch satu proses, untuk matriks N x 10.
+Jalankan: python benchmarks/bench_parallel.py [--n 2000000] [--workers 1,2,4,8] [--chunk-size 65536]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fis_batch import DEFAULT_CHUNK_SIZE, score_parallel
+from fis_tsukamoto import Diagnoser
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000000, help="jumlah baris kuisioner")
+    ap.add_argument("--workers", default=None, help="daftar jumlah worker, default 1,2,4,.. s/d cpu_count")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",")]
+    else:
+        counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpus] + [cpus]
+
+    rng = np.random.default_rng(args.seed)
+    X = rng.choice(np.arange(0, 10.5, 0.5), size=(args.n, 10))
+
+    t0 = time.perf_counter()
+    ref = Diagnoser().predict_batch(X)
+    base = time.perf_counter() - t0
+    print(f"cpu_count={cpus}  N={args.n}  chunk_size={args.chunk_size}")
+    print(f"predict_batch (1 proses) : {base:7.2f} s  ({args.n / base:10.0f} baris/s)")
+
+    for w in counts:
+        t0 = time.perf_counter()
+        res = score_parallel(X, workers=w, chunk_size=args.chunk_size)
+        t = time.perf_counter() - t0
+        same = np.array_equal(res.scores, ref.scores) and np.array_equal(res.winner, ref.winner)
+        print(f"score_parallel workers={w:<3}: {t:7.2f} s  ({args.n / t:10.0f} baris/s)  "
+              f"speedup {base / t:5.2f}x  efisiensi {base / t / w:5.0%}  identik={same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: parse_symptom_text lama (regex LEXICON berurutan, tanpa cache) vs matcher terkompilasi + LRU.
+Jalankan: python benchmarks/bench_parser.py [--n 200000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fis_tsukamoto
+from fis_tsukamoto import LEXICON, parse_symptom_text, parse_cache_info
+
+SCHEMA_OPTIONS = ["tidak", "ya", "kadang", "sering", "ringan", "sedang", "berat", "sangat berat"]
+FREE_TEXT = ["parah banget", "agak pusing", "cukup sering kambuh", "demam tinggi sekali", "lumayan",
+             "tidak ada", "hampir selalu", "sedikit", "severe", "lima", "7,5", "3.5"]
+
+def legacy_parse(txt):
+    """Salinan alur parse_symptom_text sebelum matcher terkompilasi (untuk pembanding)"""
+    if txt is None:
+        return 0.0
+    s = str(txt).strip().lower()
+    try:
+        if s.replace(".", "", 1).replace(",", "", 1).isdigit():
+            return max(0.0, min(10.0, float(s.replace(",", "."))))
+    except Exception:
+        pass
+    s = re.sub(r'\s+', ' ', s)
+    s = re.sub(r'[^\w\s-]', '', s)
+    numeric_words = {'nol': 0, 'satu': 1, 'dua': 2, 'tiga': 3, 'empat': 4, 'lima': 5,
+                     'enam': 6, 'tujuh': 7, 'delapan': 8, 'sembilan': 9, 'sepuluh': 10}
+    for word, num in numeric_words.items():
+        if word in s:
+            return min(10.0, float(num))
+    for pattern, val in LEXICON.items():
+        if re.fullmatch(pattern, s):
+            return val
+    return fis_tsukamoto._parse_normalized(s)  # fallback substring identik
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=200000, help="jumlah jawaban")
+    ap.add_argument("--free-text", type=float, default=0.1, help="proporsi jawaban teks bebas")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    answers = [rnd.choice(FREE_TEXT) if rnd.random() < args.free_text else rnd.choice(SCHEMA_OPTIONS)
+               for _ in range(args.n)]
+    assert all(legacy_parse(a) == parse_symptom_text(a) for a in set(answers))
+
+    t0 = time.perf_counter()
+    for a in answers:
+        legacy_parse(a)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a in answers:
+        fis_tsukamoto._parse_normalized(a.strip().lower())
+    t_nocache = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a in answers:
+        parse_symptom_text(a)
+    t_new = time.perf_counter() - t0
+
+    us = lambda t: t / args.n * 1e6
+    print(f"legacy (regex berurutan)     : {us(t_old):6.2f} us/jawaban")
+    print(f"matcher terkompilasi         : {us(t_nocache):6.2f} us/jawaban  ({t_old / t_nocache:.1f}x)")
+    print(f"matcher + LRU cache          : {us(t_new):6.2f} us/jawaban  ({t_old / t_new:.1f}x)")
+    print(f"cache: {parse_cache_info()}")
+
+if __name__ == "__main__":
+    main()
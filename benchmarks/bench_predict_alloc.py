@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: alokasi memori per Diagnoser.predict dengan dan tanpa detail aturan
+(tracemalloc: byte & jumlah blok yang dialokasikan per panggilan, plus waktu).
+Jalankan: python benchmarks/bench_predict_alloc.py [--n 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+def alloc_per_call(fn, cases):
+    """Byte & blok yang tertahan per panggilan (hasil predict), plus peak tracemalloc"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    results = [fn(c) for c in cases]  # hasil ditahan agar alokasinya ikut terhitung
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    del results
+    return size / len(cases), blocks / len(cases), peak
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    cases = [{k: rnd.choice([0, 2, 5, 7, 10]) for k in LABEL_ID} for _ in range(args.n)]
+
+    for compiled in (True, False):
+        clf = Diagnoser(compiled=compiled)
+        print(f"compiled={compiled}")
+        for details in (True, False):
+            fn = lambda c: clf.predict(c, return_details=details)
+            for c in cases[:50]:
+                fn(c)  # warm-up
+            size, blocks, peak = alloc_per_call(fn, cases)
+            t0 = time.perf_counter()
+            for c in cases:
+                fn(c)
+            t = (time.perf_counter() - t0) / args.n
+            print(f"  return_details={details!s:5}: {size:8.0f} B/predict  {blocks:6.1f} blok/predict  "
+                  f"peak {peak / 1024:8.1f} KiB  {t * 1e6:7.1f} us/predict")
+
+if __name__ == "__main__":
+    main()
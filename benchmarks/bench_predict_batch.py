@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Diagnoser.predict per baris vs Diagnoser.predict_batch (NumPy) untuk matriks N x 10.
+Jalankan: python benchmarks/bench_predict_batch.py [--n 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fis_tsukamoto import Diagnoser
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=100000, help="jumlah baris kuisioner")
+    ap.add_argument("--scalar-n", type=int, default=5000, help="baris untuk jalur skalar (diekstrapolasi)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    X = rng.choice(np.arange(0, 10.5, 0.5), size=(args.n, 10))
+    clf = Diagnoser()
+    order = clf.input_order
+
+    rows = [{k: str(v) for k, v in zip(order, x)} for x in X[:args.scalar_n].tolist()]
+    t0 = time.perf_counter()
+    for row in rows:
+        clf.predict(row)
+    scalar = (time.perf_counter() - t0) / len(rows)
+
+    t0 = time.perf_counter()
+    res = clf.predict_batch(X)
+    batch = (time.perf_counter() - t0) / args.n
+
+    print(f"predict per baris : {scalar * 1e6:8.2f} us/baris  ({1 / scalar:10.0f} baris/s)")
+    print(f"predict_batch     : {batch * 1e6:8.2f} us/baris  ({1 / batch:10.0f} baris/s)")
+    print(f"speedup           : {scalar / batch:8.1f}x  (N={args.n}, menang={int((res.winner >= 0).sum())})")
+
+if __name__ == "__main__":
+    main()
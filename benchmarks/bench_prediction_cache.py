@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Diagnoser.predict tanpa cache vs dengan PredictionCache pada trafik berulang
+(beberapa profil gejala dominan, jawaban teks berbeda yang bermakna sama).
+Jalankan: python benchmarks/bench_prediction_cache.py [--n 50000] [--profiles 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser, PredictionCache
+
+SYNONYMS = [["tidak", "nggak", "no"], ["ringan", "mild"], ["sedang", "moderate"],
+            ["sering", "often", "frequent"], ["berat", "parah", "severe"], ["sangat berat", "ekstrem"]]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=50000)
+    ap.add_argument("--profiles", type=int, default=50, help="jumlah profil gejala unik")
+    ap.add_argument("--cache-size", type=int, default=1024)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    profiles = [[rnd.randrange(len(SYNONYMS)) for _ in LABEL_ID] for _ in range(args.profiles)]
+    weights = [1.0 / (i + 1) for i in range(args.profiles)]  # distribusi Zipf
+    requests = []
+    for p in rnd.choices(profiles, weights, k=args.n):
+        requests.append({k: rnd.choice(SYNONYMS[level]) for k, level in zip(LABEL_ID, p)})
+
+    cache = PredictionCache(args.cache_size)
+    for name, clf in (("tanpa cache", Diagnoser()), ("PredictionCache", Diagnoser(cache=cache))):
+        t0 = time.perf_counter()
+        for req in requests:
+            clf.predict(req)
+        t = (time.perf_counter() - t0) / args.n
+        print(f"{name:16s}: {t * 1e6:7.2f} us/request")
+    print(f"statistik cache : {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
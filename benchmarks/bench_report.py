@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: render_report_html lama (f-string penuh per render) vs kerangka terkompilasi
+(latensi, alokasi tracemalloc per render, dan kesamaan output untuk input tanpa karakter HTML).
+Jalankan: python benchmarks/bench_report.py [--n 20000]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser, iter_report_html, render_report_html
+
+# Salinan implementasi sebelum kerangka terkompilasi, sebagai pembanding
+def legacy_render_report_html(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
+                       ambang_peringatan: float=60.0) -> str:
+    dt = datetime.datetime.now().strftime("%d %B %Y, %H:%M")
+    top = pred.get("diagnosa_sementara")
+    if not top:
+        top_text = "Belum ada cukup bukti gejala spesifik."
+        rekom = "Pantau gejala. Konsultasikan ke tenaga kesehatan bila perlu."
+    else:
+        top_text = f"{top['penyakit']} (skor {top['skor']:.2f})"
+        if top["skor"] >= ambang_peringatan:
+            rekom = "⚠️ Skor tinggi. Disarankan segera konsultasi ke fasilitas kesehatan."
+        elif top["skor"] >= 40:
+            rekom = "Istirahat & hidrasi cukup. Konsultasi jika tidak membaik."
+        else:
+            rekom = "Pantau gejala. Jika memburuk, konsultasi ke tenaga kesehatan."
+    ranking = "".join([f"<li><b>{d}</b>: {s:.2f}</li>" for d,s in sorted(pred.get("skor",{}).items(), key=lambda kv:-kv[1])])
+    ans_html = "".join([f"<tr><td>{LABEL_ID.get(k,k)}</td><td>{(jawaban_teks.get(k,'') or 'tidak')}</td></tr>" for k in LABEL_ID.keys()])
+    return f"""<!DOCTYPE html><html lang="id"><meta charset="utf-8">
+<title>Laporan FIS Tsukamoto</title>
+<style>body{{font-family:Arial,sans-serif;margin:24px;color:#1f2937}}
+.card{{border:1px solid #e5e7eb;border-radius:12px;padding:16px;margin-bottom:16px}}
+.h1{{font-size:22px;font-weight:700}}.h2{{font-size:18px;font-weight:600}}
+.badge{{display:inline-block;padding:6px 10px;border-radius:9999px;background:#eef2ff;color:#3730a3;font-weight:600}}
+table{{width:100%;border-collapse:collapse}}td,th{{border:1px solid #e5e7eb;padding:8px}}
+.small{{color:#6b7280;font-size:12px}}</style>
+<div class="card"><div class="h1">Laporan Prediksi Penyakit (Fuzzy Tsukamoto)</div>
+<div>Nama: <b>{nama_pengguna}</b> &nbsp; | &nbsp; Tanggal: {dt}</div></div>
+<div class="card"><div class="h2">Diagnosa Sementara</div><div class="badge">{top_text}</div>
+<p><b>Rekomendasi:</b> {rekom}</p></div>
+<div class="card"><div class="h2">Peringkat Penyakit (Skor 0–100)</div><ol>{ranking or "<li>Tidak ada rule aktif</li>"}</ol></div>
+<div class="card"><div class="h2">Jawaban Kuisioner</div><table><thead><tr><th>Gejala</th><th>Jawaban</th></tr></thead><tbody>{ans_html}</tbody></table></div>
+<div class="small">Catatan: Edukasi/akademik; bukan diagnosis klinis.</div></html>"""
+
+def measure(fn, cases, repeat=5):
+    for c in cases[:100]:
+        fn(*c)  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for c in cases:
+            fn(*c)
+        best = min(best, time.perf_counter() - t0)
+    t = best / len(cases)
+    tracemalloc.start()
+    n0 = tracemalloc.get_traced_memory()[0]
+    for c in cases[:1000]:
+        fn(*c)
+    peak = tracemalloc.get_traced_memory()[1] - n0
+    tracemalloc.stop()
+    return t, peak
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    words = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang"]
+    clf = Diagnoser()
+    cases = []
+    for i in range(args.n):
+        jawaban = {k: rnd.choice(words) for k in LABEL_ID}
+        cases.append((f"Pasien {i}", jawaban, clf.predict(jawaban), 60.0))
+
+    same = all(legacy_render_report_html(*c) == render_report_html(*c) for c in cases[:1000])
+    def legacy_endpoint(nama, jawaban, pred, ambang):
+        # Jalur /v1/report lama: kwarg salah ketik -> TypeError -> panggil ulang
+        try:
+            return legacy_render_report_html(nama, jawaban, pred, ambang_peringanan=ambang)
+        except TypeError:
+            return legacy_render_report_html(nama, jawaban, pred, ambang_peringatan=ambang)
+
+    rows = [("legacy /v1/report (typo)", legacy_endpoint),
+            ("legacy f-string", legacy_render_report_html),
+            ("kerangka terkompilasi", render_report_html),
+            ("iter_report_html (stream)", lambda *c: [chunk for chunk in iter_report_html(*c)])]
+    base = None
+    for name, fn in rows:
+        t, peak = measure(fn, cases)
+        base = base or t
+        print(f"{name:26}: {t * 1e6:7.2f} us/render  peak {peak / 1024:6.1f} KiB  ({base / t:4.2f}x)")
+    print(f"output identik dengan legacy: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: serialisasi response /v1/predict - jalur response_model (validasi PredictResponse +
+dump pydantic + JSONResponse) vs FAST_RESPONSE (encode langsung ke bytes), dengan/tanpa detail_aturan.
+Jalankan: python benchmarks/bench_serialization.py [--n 5000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from api_app import (JSON_SEPARATORS, PredictRequest, PredictResponse, build_predict_response,
+                     encode_json_object)
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+_TS = re.compile(rb'"timestamp":"[^"]*"')
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    words = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang"]
+    clf = Diagnoser()
+    adapter = TypeAdapter(PredictResponse)
+
+    def model_path(payload, result):
+        # Yang dilakukan FastAPI untuk response_model: validasi, dump mode json, JSONResponse
+        body = build_predict_response(payload, result)
+        return JSONResponse(adapter.dump_python(adapter.validate_python(body), mode="json")).body
+
+    def fast_path(payload, result):
+        body = build_predict_response(payload, result, medication_json="compact")
+        return encode_json_object(body, JSON_SEPARATORS["compact"]).encode("utf-8")
+
+    for details in (False, True):
+        cases = []
+        for _ in range(args.n):
+            payload = PredictRequest(include_detail_rules=details, **{k: rnd.choice(words) for k in LABEL_ID})
+            cases.append((payload, clf.predict(payload.to_internal_dict(), return_details=details)))
+        same = all(_TS.sub(b"", model_path(*c)) == _TS.sub(b"", fast_path(*c)) for c in cases[:500])
+        size = sum(len(fast_path(*c)) for c in cases) / len(cases)
+        print(f"include_detail_rules={details} (rata-rata {size:,.0f} byte/response, identik={same})")
+        base = None
+        for name, fn in (("response_model", model_path), ("FAST_RESPONSE", fast_path)):
+            t0 = time.perf_counter()
+            for c in cases:
+                fn(*c)
+            t = (time.perf_counter() - t0) / len(cases)
+            base = base or t
+            print(f"  {name:15}: {t * 1e6:8.2f} us/request  ({base / t:4.2f}x)")
+
+if __name__ == "__main__":
+    main()
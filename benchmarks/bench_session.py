@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: kuisioner interaktif - predict() penuh setiap jawaban berubah vs DiagnosisSession
+(hanya rule yang membaca gejala yang berubah ditembakkan ulang).
+Jalankan: python benchmarks/bench_session.py [--n 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_sessions import DiagnosisSession
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000, help="jumlah perubahan satu jawaban")
+    ap.add_argument("--details", action="store_true", help="hasil dengan detail_aturan")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    words = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang"]
+    edits = [(rnd.choice(list(LABEL_ID)), rnd.choice(words)) for _ in range(args.n)]
+    clf = Diagnoser()
+
+    answers = {}
+    t0 = time.perf_counter()
+    for key, text in edits:
+        answers[key] = text
+        clf.predict(answers, return_details=args.details)
+    full = time.perf_counter() - t0
+
+    session = DiagnosisSession(clf)
+    refired = 0
+    t0 = time.perf_counter()
+    for key, text in edits:
+        refired += session.update({key: text})
+        session.result(args.details)
+    incremental = time.perf_counter() - t0
+
+    print(f"predict penuh : {full / args.n * 1e6:8.2f} us/perubahan  ({len(clf.rules)} rule)")
+    print(f"sesi          : {incremental / args.n * 1e6:8.2f} us/perubahan  "
+          f"({refired / args.n:.2f} rule ditembakkan ulang rata-rata, {full / incremental:.2f}x)")
+
+if __name__ == "__main__":
+    main()
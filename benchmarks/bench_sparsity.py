@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pruning membership nol (support Tri/Trap + indeks terbalik term -> rule AND)
+vs evaluasi penuh, pada distribusi kuisioner yang realistis (kebanyakan gejala "tidak").
+Jumlah gejala positif per kuisioner ~ Binomial(10, p); dijalankan untuk beberapa p.
+Jalankan: python benchmarks/bench_sparsity.py [--n 20000] [--p 0.1,0.2,0.3,0.5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+POSITIVE = ["ringan", "sedang", "kadang", "sering", "ya", "berat", "sangat berat"]
+
+def make_inputs(n: int, p: float, rnd: random.Random):
+    return [{k: (rnd.choice(POSITIVE) if rnd.random() < p else "tidak") for k in LABEL_ID} for _ in range(n)]
+
+def bench(clf: Diagnoser, inputs, details: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for x in inputs:
+            clf.predict(x, return_details=details)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(inputs) * 1e6
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--p", default="0.05,0.1,0.2,0.3,0.5,1.0", help="peluang tiap gejala positif")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    engines = {
+        "kompilasi": (Diagnoser(prune_zero=False), Diagnoser()),
+        "per-rule": (Diagnoser(compiled=False, prune_zero=False), Diagnoser(compiled=False)),
+    }
+    print(f"{'p':>5} {'jalur':<10} {'detail':<6} {'penuh us':>9} {'prune us':>9} {'speedup':>8}")
+    for p in (float(v) for v in args.p.split(",")):
+        inputs = make_inputs(args.n, p, rnd)
+        for name, (full, pruned) in engines.items():
+            for details in (False, True):
+                assert all(full.predict(x, details) == pruned.predict(x, details) for x in inputs[:500])
+                a = bench(full, inputs, details, args.repeat)
+                b = bench(pruned, inputs, details, args.repeat)
+                print(f"{p:>5.2f} {name:<10} {str(details).lower():<6} {a:>9.2f} {b:>9.2f} {a / b:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: sweep grid level gejala - loop Diagnoser.predict per titik vs sweep_grid
+(enumerasi lazy + predict_batch per chunk ke file .npy memory-mapped).
+Jalankan: python benchmarks/bench_sweep.py [--default 0,5,10] [--workers 1]
+"""
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_batch import DEFAULT_CHUNK_SIZE, grid_inputs, grid_levels, sweep_grid
+from fis_tsukamoto import Diagnoser
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--default", default="0,5,10", help="level per gejala (default 0,5,10 -> 3^10 titik)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--loop-sample", type=int, default=5000, help="titik untuk estimasi loop predict")
+    args = ap.parse_args()
+
+    clf = Diagnoser()
+    order = clf.input_order
+    grid = grid_levels(order, None, args.default)
+    n = math.prod(len(v) for v in grid)
+
+    sample = min(n, args.loop_sample)
+    X = grid_inputs(grid, 0, sample)
+    t0 = time.perf_counter()
+    for row in X.tolist():
+        clf._predict_inputs(dict(zip(order, row)))
+    loop_rate = sample / (time.perf_counter() - t0)
+
+    path = tempfile.mkdtemp(prefix="fis_sweep_")
+    try:
+        t0 = time.perf_counter()
+        sweep_grid(path, None, args.default, chunk_size=args.chunk_size, workers=args.workers)
+        dt = time.perf_counter() - t0
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    finally:
+        shutil.rmtree(path)
+    print(f"grid {n:,} titik ({args.default} per gejala)")
+    print(f"loop predict : {loop_rate:12,.0f} titik/detik  (estimasi {n / loop_rate:8.1f} s)")
+    print(f"sweep_grid   : {n / dt:12,.0f} titik/detik  ({dt:8.1f} s, {size / 1e6:.1f} MB di disk)")
+
+if __name__ == "__main__":
+    main()
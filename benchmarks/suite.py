@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite: micro-benchmark engine (parser, membership, Rule.fire, predict, rekomendasi obat,
+laporan HTML) dan benchmark HTTP in-process (panggilan ASGI langsung ke api_app.app), dengan
+kuisioner sintetis ber-seed tetap. Hasil disimpan sebagai JSON; `compare` menandai regresi.
+Jalankan: python benchmarks/suite.py run -o hasil.json [--quick] [--filter predict]
+          python benchmarks/suite.py compare baseline.json hasil.json [--threshold 0.10]
+"""
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Benchmark HTTP mengukur jalur engine, bukan PredictionCache (kuisioner diulang antar repeat)
+os.environ.setdefault("PREDICT_CACHE_SIZE", "0")
+
+import fis_tsukamoto as fis
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+SEED = 20240601
+ANSWERS = ["tidak", "ringan", "sedang", "berat", "sangat berat", "kadang", "sering", "ya",
+           "jarang", "cukup parah", "lumayan", "0", "3", "5", "7.5", "10", "agak berat sekali"]
+
+def questionnaires(rnd: random.Random, n: int) -> List[Dict[str, str]]:
+    """Kuisioner sintetis: sebagian besar gejala 'tidak', sisanya acak dari ANSWERS"""
+    out = []
+    for _ in range(n):
+        out.append({k: (rnd.choice(ANSWERS) if rnd.random() < 0.6 else "tidak") for k in LABEL_ID})
+    return out
+
+# name -> setup(rnd, size) -> (fungsi satu iterasi, jumlah operasi per iterasi)
+BENCHMARKS: Dict[str, Callable[[random.Random, int], Tuple[Callable[[], Any], int]]] = {}
+
+def benchmark(name: str):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+def _cycle(items: List[Any]) -> Callable[[], Any]:
+    """Iterator tak hingga atas items tanpa alokasi per panggilan"""
+    state = {"i": 0}
+    n = len(items)
+    def nxt():
+        i = state["i"]
+        state["i"] = i + 1 if i + 1 < n else 0
+        return items[i]
+    return nxt
+
+@benchmark("parse_symptom_text")
+def _(rnd, size):
+    texts = [rnd.choice(ANSWERS) for _ in range(1000)]
+    def run():
+        for t in texts:
+            fis.parse_symptom_text(t)
+    return run, len(texts)
+
+@benchmark("parse_symptom_text_uncached")
+def _(rnd, size):
+    texts = [rnd.choice(ANSWERS) for _ in range(1000)]
+    def run():
+        for t in texts:
+            fis._parse_normalized(t)
+    return run, len(texts)
+
+@benchmark("tri")
+def _(rnd, size):
+    xs = [rnd.uniform(0, 10) for _ in range(1000)]
+    tri = fis.tri
+    def run():
+        for x in xs:
+            tri(x, 2.0, 5.0, 8.0)
+    return run, len(xs)
+
+@benchmark("trap")
+def _(rnd, size):
+    xs = [rnd.uniform(0, 10) for _ in range(1000)]
+    trap = fis.trap
+    def run():
+        for x in xs:
+            trap(x, 6.0, 8.0, 10.0, 10.0)
+    return run, len(xs)
+
+@benchmark("rule_fire")
+def _(rnd, size):
+    clf = Diagnoser(compiled=False)
+    inputs = [clf._ensure_inputs(q) for q in questionnaires(rnd, 200)]
+    rules = clf.rules
+    def run():
+        for I in inputs:
+            for r in rules:
+                r.fire(I)
+    return run, len(inputs) * len(rules)
+
+def _predict_bench(return_details: bool):
+    def setup(rnd, size):
+        clf = Diagnoser()
+        qs = questionnaires(rnd, size)
+        def run():
+            for q in qs:
+                clf.predict(q, return_details=return_details)
+        return run, len(qs)
+    return setup
+
+benchmark("predict")(_predict_bench(False))
+benchmark("predict_details")(_predict_bench(True))
+
+@benchmark("predict_batch_row")
+def _(rnd, size):
+    clf = Diagnoser()
+    qs = questionnaires(rnd, size * 10)
+    def run():
+        clf.predict_batch(qs)
+    return run, len(qs)
+
+@benchmark("get_medication_recommendations")
+def _(rnd, size):
+    diseases = list(fis.MEDICATION_DATABASE)
+    cases = [(rnd.choice(diseases), round(rnd.uniform(30, 100), 2)) for _ in range(1000)]
+    get = fis.get_medication_recommendations
+    def run():
+        for d, s in cases:
+            get(d, s)
+    return run, len(cases)
+
+@benchmark("render_report_html")
+def _(rnd, size):
+    clf = Diagnoser()
+    cases = [(f"Pasien {i}", q, clf.predict(q)) for i, q in enumerate(questionnaires(rnd, size))]
+    render = fis.render_report_html
+    def run():
+        for nama, q, pred in cases:
+            render(nama, q, pred, 60.0)
+    return run, len(cases)
+
+# --- HTTP in-process: ASGI mentah tanpa server / klien HTTP ---
+
+def _asgi_post(app, path: str, bodies: List[bytes]) -> Callable[[], Any]:
+    loop = asyncio.new_event_loop()
+
+    async def call(body: bytes):
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+                 "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+                 "root_path": "", "headers": [(b"content-type", b"application/json"),
+                                              (b"content-length", str(len(body)).encode())],
+                 "client": ("127.0.0.1", 1234), "server": ("bench", 80)}
+        sent = False
+        async def receive():
+            nonlocal sent
+            if sent:
+                await asyncio.sleep(3600)  # tidak ada disconnect selama benchmark
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        status = []
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+        await app(scope, receive, send)
+        if status[0] != 200:
+            raise RuntimeError(f"{path}: HTTP {status[0]}")
+
+    async def run_all():
+        for body in bodies:
+            await call(body)
+
+    return lambda: loop.run_until_complete(run_all())
+
+def _predict_bodies(rnd, size, details: bool) -> List[bytes]:
+    return [json.dumps({**q, "nama": "Bench", "include_detail_rules": details}).encode()
+            for q in questionnaires(rnd, size)]
+
+def _asgi_predict_bench(details: bool, fast: bool):
+    def setup(rnd, size):
+        import api_app
+        api_app.FAST_RESPONSE = fast
+        return _asgi_post(api_app.app, "/v1/predict", _predict_bodies(rnd, size, details)), size
+    return setup
+
+benchmark("http_predict")(_asgi_predict_bench(False, False))
+benchmark("http_predict_details")(_asgi_predict_bench(True, False))
+benchmark("http_predict_fast")(_asgi_predict_bench(False, True))
+benchmark("http_predict_details_fast")(_asgi_predict_bench(True, True))
+
+@benchmark("http_report")
+def _(rnd, size):
+    import api_app
+    clf = Diagnoser()
+    bodies = [json.dumps({"nama": "Bench", "jawaban_teks": q, "hasil": clf.predict(q)}).encode()
+              for q in questionnaires(rnd, size)]
+    return _asgi_post(api_app.app, "/v1/report", bodies), size
+
+# --- Runner ---
+
+def run_benchmark(name: str, size: int, repeat: int, min_time: float) -> Dict[str, Any]:
+    rnd = random.Random(SEED ^ zlib.crc32(name.encode()))
+    fn, ops = BENCHMARKS[name](rnd, size)
+    fn()  # warm-up (cache, import, JIT-less tapi tetap memanaskan lexicon/engine)
+    # Kalibrasi: ulangi fn dalam satu sampel sampai >= min_time
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_time or loops >= 1 << 16:
+            break
+        loops *= 2
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter_ns() - t0) / (loops * ops))
+    return {"ns_per_op_min": min(samples), "ns_per_op_median": statistics.median(samples),
+            "ops_per_s": 1e9 / min(samples), "ops": ops * loops, "repeat": repeat}
+
+def _git_commit() -> Optional[str]:
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+def cmd_run(args) -> int:
+    names = [n for n in BENCHMARKS if not args.filter or any(fnmatch.fnmatch(n, f"*{p}*") for p in args.filter)]
+    size = 50 if args.quick else args.size
+    results = {}
+    for name in names:
+        res = run_benchmark(name, size, args.repeat, 0.05 if args.quick else args.min_time)
+        results[name] = res
+        print(f"{name:32} {res['ns_per_op_min'] / 1000:10.2f} us/op  (median {res['ns_per_op_median'] / 1000:.2f})"
+              f"  {res['ops_per_s']:12,.0f} op/s", file=sys.stderr)
+    out = {
+        "meta": {"created_at": datetime.now().isoformat(), "commit": _git_commit(), "seed": SEED,
+                 "size": size, "python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_count": os.cpu_count()},
+        "results": results,
+    }
+    text = json.dumps(out, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+def cmd_compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)["results"]
+    with open(args.current, encoding="utf-8") as f:
+        cur = json.load(f)["results"]
+    key = f"ns_per_op_{args.stat}"
+    regressions = 0
+    print(f"{'benchmark':32} {'baseline':>12} {'sekarang':>12} {'rasio':>8}")
+    for name in sorted(set(base) | set(cur)):
+        if name not in base or name not in cur:
+            print(f"{name:32} {'-' if name not in base else 'ada':>12} {'-' if name not in cur else 'ada':>12}   (tidak dibandingkan)")
+            continue
+        ratio = cur[name][key] / base[name][key]
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESI"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  lebih cepat"
+        print(f"{name:32} {base[name][key] / 1000:10.2f}us {cur[name][key] / 1000:10.2f}us {ratio:7.2f}x{flag}")
+    print(f"\n{regressions} regresi (ambang {args.threshold:.0%}, statistik {args.stat})")
+    return 1 if regressions else 0
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="jalankan benchmark dan simpan hasil JSON")
+    p.add_argument("-o", "--output", help="file JSON hasil (default: stdout)")
+    p.add_argument("--filter", action="append", help="hanya benchmark yang namanya memuat pola ini")
+    p.add_argument("--size", type=int, default=500, help="jumlah kuisioner per iterasi")
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--min-time", type=float, default=0.2, help="detik minimum per sampel")
+    p.add_argument("--quick", action="store_true", help="ukuran kecil untuk smoke test")
+    p.add_argument("--list", action="store_true", help="tampilkan nama benchmark saja")
+    p.set_defaults(func=cmd_run)
+    p = sub.add_parser("compare", help="bandingkan dua hasil JSON; exit 1 bila ada regresi")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=0.10, help="rasio perlambatan yang ditolerir (0.10 = 10%%)")
+    p.add_argument("--stat", choices=["min", "median"], default="min")
+    p.set_defaults(func=cmd_compare)
+    args = ap.parse_args(argv)
+    if getattr(args, "list", False):
+        print("\n".join(BENCHMARKS))
+        return 0
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
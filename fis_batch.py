@@ -0,0 +1,281 @@
+# fis_batch.py
+# -*- coding: utf-8 -*-
+"""
+Skoring paralel multi-proses untuk matriks input besar (N x 10, nilai 0..10 urut LABEL_ID).
+Input & output diletakkan di shared memory: worker membaca slice input dan menulis hasil
+langsung ke array output bersama (tanpa pickle per baris), urutan hasil = urutan input.
+
+sweep_grid: permukaan keputusan atas grid level per gejala (produk kartesius), dienumerasi
+lazy per chunk dan ditulis ke file .npy memory-mapped dengan progress yang bisa dilanjutkan.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import json
+import math
+import os
+
+import numpy as np
+
+from fis_tsukamoto import LEXICON, BatchPrediction, Diagnoser
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Kolom output BatchPrediction: nama -> (dtype, per penyakit?)
+_OUTPUTS = {
+    "scores": (np.float64, True),
+    "confidence": (np.float64, True),
+    "active": (np.bool_, True),
+    "active_rules": (np.int64, False),
+    "overall_confidence": (np.float64, False),
+    "winner": (np.int64, False),
+}
+
+# Spesifikasi array bersama: nama -> (nama shared memory, shape, dtype)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+def _create_shared(specs: Dict[str, Tuple[Tuple[int, ...], Any]]) -> Tuple[List[SharedMemory], ArraySpec, Dict[str, np.ndarray]]:
+    blocks, spec, arrays = [], {}, {}
+    for name, (shape, dtype) in specs.items():
+        dtype = np.dtype(dtype)
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        blocks.append(shm)
+        spec[name] = (shm.name, shape, dtype.str)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return blocks, spec, arrays
+
+def _attach(spec: ArraySpec) -> Tuple[List[SharedMemory], Dict[str, np.ndarray]]:
+    blocks, arrays = [], {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = SharedMemory(name=shm_name)
+        blocks.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return blocks, arrays
+
+# State per proses worker (diisi sekali oleh initializer)
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(spec: ArraySpec, engine_kwargs: Dict[str, Any]):
+    blocks, arrays = _attach(spec)
+    _WORKER.update(blocks=blocks, arrays=arrays, clf=Diagnoser(**engine_kwargs))
+
+def _score_slice(bounds: Tuple[int, int]) -> Tuple[int, int]:
+    start, stop = bounds
+    arrays = _WORKER["arrays"]
+    res = _WORKER["clf"].predict_batch(arrays["inputs"][start:stop])
+    for name in _OUTPUTS:
+        arrays[name][start:stop] = getattr(res, name)
+    return bounds
+
+def score_parallel(X: Any, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   engine_kwargs: Optional[Dict[str, Any]] = None) -> BatchPrediction:
+    """predict_batch yang dibagi ke beberapa proses.
+
+    X: array (N, 10) nilai 0..10 berurutan LABEL_ID. workers: jumlah proses (default: os.cpu_count()).
+    chunk_size: baris per tugas worker. engine_kwargs: argumen Diagnoser di tiap worker
+    (mis. {"membership_resolution": 0.01}). Hasil identik dengan Diagnoser(**engine_kwargs).predict_batch(X).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size harus > 0")
+    engine_kwargs = dict(engine_kwargs or {})
+    clf = Diagnoser(**engine_kwargs)
+    order = clf.input_order
+    X = clf.input_matrix(X)
+    n = len(X)
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-n // chunk_size)))
+    if workers == 1:
+        return clf.predict_batch(X)
+
+    diseases = tuple(clf.describe()["diseases"])
+    specs = {"inputs": ((n, len(order)), np.float64)}
+    for name, (dtype, per_disease) in _OUTPUTS.items():
+        specs[name] = ((n, len(diseases)) if per_disease else (n,), dtype)
+    blocks, spec, arrays = _create_shared(specs)
+    try:
+        np.clip(X, 0.0, 10.0, out=arrays["inputs"])
+        bounds = [(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+        with ProcessPoolExecutor(workers, mp_context=get_context(), initializer=_init_worker,
+                                 initargs=(spec, engine_kwargs)) as pool:
+            for _ in pool.map(_score_slice, bounds):
+                pass
+        out = {name: arr.copy() for name, arr in arrays.items()}
+    finally:
+        arrays.clear()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    return BatchPrediction(symptoms=order, diseases=diseases, **out)
+
+# --- Sweep grid ---
+
+LEXICON_LEVELS = tuple(sorted(set(LEXICON.values())))  # semua nilai level lexicon (0..10)
+SWEEP_OUTPUTS = {"scores": (np.float64, True), "confidence": (np.float64, True), "winner": (np.int16, False)}
+SWEEP_META = "meta.json"
+SWEEP_DEFAULT_LEVELS = "0,5,10"
+SWEEP_MAX_ROWS = 100_000_000  # ~8 GB output untuk 5 penyakit; grid lebih besar harus diminta eksplisit
+SWEEP_PROGRESS = "progress.json"
+
+LevelSpec = Union[str, Sequence[float]]
+
+def parse_levels(spec: LevelSpec) -> Tuple[float, ...]:
+    """Level satu gejala: "lexicon", "a:b:langkah" (inklusif), "0,5,10", atau list angka"""
+    if isinstance(spec, str):
+        spec = spec.strip()
+        if spec == "lexicon":
+            return LEXICON_LEVELS
+        if ":" in spec:
+            a, b, step = (float(v) for v in spec.split(":"))
+            if step <= 0:
+                raise ValueError(f"langkah level harus > 0: {spec!r}")
+            n = int(math.floor((b - a) / step + 1e-9)) + 1
+            values = [round(a + i * step, 10) for i in range(max(0, n))]
+        else:
+            values = [float(v) for v in spec.split(",") if v.strip()]
+    else:
+        values = [float(v) for v in spec]
+    if not values:
+        raise ValueError(f"level kosong: {spec!r}")
+    if any(not 0.0 <= v <= 10.0 for v in values):
+        raise ValueError(f"level harus di 0..10: {spec!r}")
+    return tuple(values)
+
+def grid_levels(order: Sequence[str], levels: Optional[Mapping[str, LevelSpec]] = None,
+                default: LevelSpec = SWEEP_DEFAULT_LEVELS) -> Tuple[Tuple[float, ...], ...]:
+    """Level per gejala sesuai urutan input; gejala yang tidak disebut memakai default"""
+    levels = dict(levels or {})
+    unknown = set(levels) - set(order)
+    if unknown:
+        raise ValueError(f"gejala tidak dikenal: {', '.join(sorted(unknown))}")
+    return tuple(parse_levels(levels.get(k, default)) for k in order)
+
+def grid_inputs(levels: Sequence[Sequence[float]], start: int, stop: int) -> np.ndarray:
+    """Baris grid [start, stop) sebagai array (n, len(levels)); gejala terakhir berubah paling cepat"""
+    idx = np.arange(start, stop, dtype=np.int64)
+    X = np.empty((len(idx), len(levels)))
+    for j in range(len(levels) - 1, -1, -1):
+        values = np.asarray(levels[j], dtype=float)
+        idx, digit = np.divmod(idx, len(values))
+        X[:, j] = values[digit]
+    return X
+
+def _open_outputs(path: str, n: int, n_diseases: int, mode: str) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name, (dtype, per_disease) in SWEEP_OUTPUTS.items():
+        file = os.path.join(path, f"{name}.npy")
+        if mode == "w+":
+            shape = (n, n_diseases) if per_disease else (n,)
+            arrays[name] = np.lib.format.open_memmap(file, mode="w+", dtype=dtype, shape=shape)
+        else:
+            arrays[name] = np.load(file, mmap_mode=mode)
+    return arrays
+
+def _write_json(file: str, obj: Dict[str, Any]):
+    tmp = file + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, file)  # atomik: progress tidak pernah setengah tertulis
+
+def _read_json(file: str) -> Dict[str, Any]:
+    with open(file, encoding="utf-8") as f:
+        return json.load(f)
+
+_SWEEP_WORKER: Dict[str, Any] = {}
+
+def _init_sweep_worker(path: str, engine_kwargs: Dict[str, Any]):
+    meta = _read_json(os.path.join(path, SWEEP_META))
+    _SWEEP_WORKER.update(meta=meta, clf=Diagnoser(**engine_kwargs),
+                         arrays=_open_outputs(path, 0, 0, "r+"))
+
+def _sweep_chunk(bounds: Tuple[int, int]) -> Tuple[int, int]:
+    start, stop = bounds
+    w = _SWEEP_WORKER
+    res = w["clf"].predict_batch(grid_inputs(w["meta"]["levels"], start, stop))
+    for name in SWEEP_OUTPUTS:
+        w["arrays"][name][start:stop] = getattr(res, name)
+        w["arrays"][name].flush()
+    return bounds
+
+def sweep_grid(path: str, levels: Optional[Mapping[str, LevelSpec]] = None,
+               default: LevelSpec = SWEEP_DEFAULT_LEVELS, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+               engine_kwargs: Optional[Dict[str, Any]] = None, overwrite: bool = False,
+               progress: Optional[Callable[[int, int], None]] = None,
+               max_rows: Optional[int] = SWEEP_MAX_ROWS) -> Dict[str, Any]:
+    """Skor seluruh grid level (produk kartesius per gejala) ke direktori path.
+
+    File: meta.json (gejala, level, penyakit, ukuran), scores.npy & confidence.npy (N, D),
+    winner.npy (N,) indeks penyakit / -1, progress.json (jumlah baris selesai, berurutan).
+    Baris ke-i = grid_inputs(levels, i, i + 1). Memori per proses ~ chunk_size baris.
+    Bila path berisi sweep yang sama (level & engine) yang belum selesai, dilanjutkan dari
+    progress terakhir (chunk_size boleh berbeda); sweep berbeda ditolak kecuali overwrite=True.
+    progress(selesai, total) dipanggil setelah setiap chunk tersimpan.
+    Grid lebih dari max_rows baris ditolak (ValueError) sebelum file apa pun dibuat; None = tanpa batas.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size harus > 0")
+    engine_kwargs = dict(engine_kwargs or {})
+    clf = Diagnoser(**engine_kwargs)
+    order = clf.input_order
+    grid = grid_levels(order, levels, default)
+    n = math.prod(len(v) for v in grid)
+    if max_rows is not None and n > max_rows:
+        n_diseases = len(clf.describe()["diseases"])
+        size = n * sum(np.dtype(dtype).itemsize * (n_diseases if per_disease else 1)
+                       for dtype, per_disease in SWEEP_OUTPUTS.values())
+        raise ValueError(f"grid sweep {n:,} baris (~{size / 1e9:,.1f} GB output) melebihi max_rows={max_rows:,}; "
+                         f"kurangi level per gejala ({' x '.join(str(len(v)) for v in grid)}) atau naikkan max_rows")
+    meta = {"symptoms": list(order), "levels": [list(v) for v in grid], "diseases": clf.describe()["diseases"],
+            "n": n, "chunk_size": chunk_size, "engine_kwargs": engine_kwargs,
+            "outputs": {name: np.dtype(dtype).str for name, (dtype, _) in SWEEP_OUTPUTS.items()}}
+    os.makedirs(path, exist_ok=True)
+    meta_file, progress_file = os.path.join(path, SWEEP_META), os.path.join(path, SWEEP_PROGRESS)
+
+    done = 0
+    if os.path.exists(meta_file) and not overwrite:
+        old = _read_json(meta_file)
+        old.pop("chunk_size", None)
+        if old != json.loads(json.dumps({k: v for k, v in meta.items() if k != "chunk_size"})):
+            raise ValueError(f"{path} berisi sweep lain; pakai overwrite=True untuk menimpa")
+        if os.path.exists(progress_file):
+            done = int(_read_json(progress_file)["done"])
+        arrays = _open_outputs(path, n, len(meta["diseases"]), "r+")
+    else:
+        if os.path.exists(progress_file):
+            os.remove(progress_file)
+        _write_json(meta_file, meta)
+        arrays = _open_outputs(path, n, len(meta["diseases"]), "w+")
+    if progress:
+        progress(done, n)
+
+    def commit(stop: int):
+        for arr in arrays.values():
+            arr.flush()
+        _write_json(progress_file, {"done": stop, "n": n})
+        if progress:
+            progress(stop, n)
+
+    bounds = ((i, min(i + chunk_size, n)) for i in range(done, n, chunk_size))
+    if workers <= 1:
+        for start, stop in bounds:
+            res = clf.predict_batch(grid_inputs(grid, start, stop))
+            for name in SWEEP_OUTPUTS:
+                arrays[name][start:stop] = getattr(res, name)
+            commit(stop)
+    else:
+        # Worker menulis langsung ke file memmap; map() berurutan sehingga progress tetap kontigu
+        with ProcessPoolExecutor(workers, mp_context=get_context(), initializer=_init_sweep_worker,
+                                 initargs=(path, engine_kwargs)) as pool:
+            for start, stop in pool.map(_sweep_chunk, bounds, chunksize=1):
+                commit(stop)
+    arrays.clear()
+    return open_sweep(path)
+
+def open_sweep(path: str) -> Dict[str, Any]:
+    """Baca hasil sweep (read-only, memory-mapped): meta + array + done (baris yang valid)"""
+    meta = _read_json(os.path.join(path, SWEEP_META))
+    progress_file = os.path.join(path, SWEEP_PROGRESS)
+    done = int(_read_json(progress_file)["done"]) if os.path.exists(progress_file) else 0
+    return {**meta, "done": done, **_open_outputs(path, 0, 0, "r")}
@@ -0,0 +1,405 @@
+# fis_cli.py
+# -*- coding: utf-8 -*-
+"""
+Command line FIS Tsukamoto.
+Jalankan: python -m fis_tsukamoto score data.csv > hasil.csv
+          cat data.jsonl | python -m fis_tsukamoto score --output-format csv
+          python -m fis_tsukamoto report pasien.csv --format zip -o laporan.zip
+          python -m fis_tsukamoto profile sampel.jsonl --sort time
+          python -m fis_tsukamoto sweep hasil_sweep/ --level fever=0:10:0.5 --default 0,5,10
+          python -m fis_tsukamoto score data.csv --output-format fcol -o hasil.fcol
+          python -m fis_tsukamoto ruleset validate rulesets/default.json
+Input dibaca per chunk (memori konstan), hasil ditulis ke stdout, ringkasan ke stderr.
+Format kolomnar (npy/npz/fcol, lihat fis_columnar) ditulis ke -o dan bisa di-load zero-copy.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from fis_reports import BULK_FORMATS, BulkReportWriter, iter_bulk_reports
+from fis_ruleset import RulesetError, compile_ruleset, export_ruleset, load_ruleset
+from fis_tsukamoto import LABEL_ID, Diagnoser, RuleProfiler, get_medication_recommendations
+
+FORMATS = ("csv", "jsonl")
+COLUMNAR_FORMATS = ("npy", "npz", "fcol")  # = fis_columnar.COLUMNAR_FORMATS (NumPy diimpor saat dipakai)
+MEDICATION_MIN_SCORE = 30  # sama dengan ambang rekomendasi obat di API
+
+_LABEL_KEYS = {v.lower(): k for k, v in LABEL_ID.items()}
+
+def resolve_column(name: str, overrides: Dict[str, str]) -> Optional[str]:
+    """Nama kolom -> key LABEL_ID (key atau label Indonesia, tidak case-sensitive); None = diabaikan"""
+    if name in overrides:
+        return overrides[name]
+    s = name.strip().lower()
+    if s in LABEL_ID:
+        return s
+    if s.replace(" ", "_").replace("-", "_") in LABEL_ID:
+        return s.replace(" ", "_").replace("-", "_")
+    return _LABEL_KEYS.get(s)
+
+def parse_mapping(items: Sequence[str]) -> Dict[str, str]:
+    """--map kolom=key|label -> {kolom: key}"""
+    mapping = {}
+    for item in items:
+        col, sep, target = item.partition("=")
+        key = resolve_column(target, {}) if sep else None
+        if not col or key is None:
+            raise ValueError(f"--map tidak valid: {item!r} (format: kolom=key, key salah satu {', '.join(LABEL_ID)})")
+        mapping[col] = key
+    return mapping
+
+def _detect_format(path: Optional[str], first_line: str) -> str:
+    ext = os.path.splitext(path or "")[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".csv":
+        return "csv"
+    return "jsonl" if first_line.lstrip().startswith("{") else "csv"
+
+def iter_rows(f: TextIO, fmt: str, overrides: Dict[str, str], id_column: Optional[str] = None,
+              errors: Optional[List[str]] = None) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """Baca baris CSV/JSONL satu per satu -> (id, {key LABEL_ID: jawaban})"""
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        cols = [(j, resolve_column(h, overrides)) for j, h in enumerate(header)]
+        cols = [(j, k) for j, k in cols if k is not None]
+        id_idx = header.index(id_column) if id_column in header else None
+        for row in reader:
+            if not row:
+                continue
+            yield (row[id_idx] if id_idx is not None and id_idx < len(row) else None,
+                   {k: row[j] for j, k in cols if j < len(row)})
+        return
+    resolved: Dict[str, Optional[str]] = {}
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+            if not isinstance(obj, dict):
+                raise ValueError("baris bukan object JSON")
+        except ValueError as e:
+            if errors is not None:
+                errors.append(f"baris {lineno}: {e}")
+            continue
+        row = {}
+        for name, value in obj.items():
+            if name not in resolved:
+                resolved[name] = resolve_column(name, overrides)
+            if resolved[name] is not None:
+                row[resolved[name]] = value
+        yield obj.get(id_column) if id_column else None, row
+
+def _chunks(it: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(it)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def medication_level(winner: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Level rekomendasi obat (mild/moderate/severe) untuk diagnosa, None bila tidak ada"""
+    if not winner or winner["skor"] < MEDICATION_MIN_SCORE:
+        return None
+    return get_medication_recommendations(winner["penyakit"], winner["skor"]).get("severity_level")
+
+class ResultWriter:
+    """Tulis hasil predict_batch per chunk sebagai CSV (kolom lebar) atau JSONL.
+    symptoms: bila diisi, CSV ikut memuat kolom input_<gejala> (nilai 0..10 hasil parsing)."""
+    def __init__(self, out: TextIO, fmt: str, diseases: Sequence[str], id_column: Optional[str] = None,
+                 medication: bool = False, symptoms: Sequence[str] = ()):
+        self.out = out
+        self.fmt = fmt
+        self.diseases = tuple(diseases)
+        self.symptoms = tuple(symptoms)
+        self.id_column = id_column
+        self.medication = medication
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.writer(out, lineterminator="\n")
+            header = [id_column] if id_column else []
+            header += [f"input_{s}" for s in self.symptoms]
+            header += [f"skor_{d}" for d in self.diseases] + [f"confidence_{d}" for d in self.diseases]
+            header += ["diagnosa", "skor_diagnosa", "confidence_diagnosa", "certainty",
+                       "overall_confidence", "active_rules"]
+            if medication:
+                header.append("medication_level")
+            self._csv.writerow(header)
+
+    def write(self, ids: Sequence[Any], batch):
+        col = [batch.diseases.index(d) for d in self.diseases]
+        sym = [batch.symptoms.index(s) for s in self.symptoms]
+        for i in range(len(batch)):
+            row = batch.to_dict(i)
+            winner = row["diagnosa_sementara"]
+            if self._csv is None:
+                if self.id_column:
+                    row = {self.id_column: ids[i], **row}
+                if self.medication:
+                    row["medication_level"] = medication_level(winner)
+                self.out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                continue
+            line = [ids[i]] if self.id_column else []
+            line += [float(batch.inputs[i, j]) for j in sym]
+            line += [float(batch.scores[i, j]) for j in col] + [float(batch.confidence[i, j]) for j in col]
+            if winner:
+                line += [winner["penyakit"], winner["skor"], winner["confidence"], winner["certainty"]]
+            else:
+                line += ["", "", "", ""]
+            line += [row["overall_confidence"], row["active_rules"]]
+            if self.medication:
+                line.append(medication_level(winner) or "")
+            self._csv.writerow(line)
+
+@contextmanager
+def _open_input(path: Optional[str], input_format: Optional[str]) -> Iterator[Tuple[Iterable[str], str]]:
+    """Buka file/stdin -> (iterator baris, format); format dideteksi dari ekstensi / baris pertama"""
+    f = sys.stdin if path in (None, "-") else open(path, encoding="utf-8", newline="")
+    try:
+        first = f.readline()
+        yield itertools.chain([first], f), input_format or _detect_format(path, first)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def _summary(n: int, elapsed: float, errors: List[str], what: str) -> int:
+    for e in errors:
+        print(f"peringatan: {e}", file=sys.stderr)
+    rate = n / elapsed if elapsed > 0 else 0.0
+    print(f"{n} baris {what} dalam {elapsed:.3f} s ({rate:,.0f} baris/detik)"
+          + (f", {len(errors)} baris dilewati" if errors else ""), file=sys.stderr)
+    return 1 if errors else 0
+
+def _engine(args, **kwargs: Any) -> Diagnoser:
+    """Diagnoser dari --ruleset (bila diberikan) atau rule base bawaan"""
+    if getattr(args, "ruleset", None):
+        return compile_ruleset(load_ruleset(args.ruleset), **kwargs)[0]
+    return Diagnoser(**kwargs)
+
+def score(args) -> int:
+    overrides = parse_mapping(args.map or [])
+    if args.chunk_size <= 0:
+        raise ValueError("--chunk-size harus > 0")
+    if args.output_format in COLUMNAR_FORMATS:
+        return _score_columnar(args, overrides)
+    clf = _engine(args)
+    errors: List[str] = []
+    out = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        with _open_input(args.input, args.input_format) as (lines, fmt):
+            writer = ResultWriter(out, args.output_format or fmt, clf.describe()["diseases"],
+                                  id_column=args.id_column, medication=args.medication,
+                                  symptoms=clf.input_order if args.inputs else ())
+            n = 0
+            t0 = time.perf_counter()
+            for chunk in _chunks(iter_rows(lines, fmt, overrides, args.id_column, errors), args.chunk_size):
+                ids = [i for i, _ in chunk]
+                writer.write(ids, clf.predict_batch([row for _, row in chunk]))
+                n += len(chunk)
+            out.flush()
+            elapsed = time.perf_counter() - t0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return _summary(n, elapsed, errors, "diskor")
+
+def _score_columnar(args, overrides: Dict[str, str]) -> int:
+    """score ke format kolomnar: kolom per chunk di-stream ke file, dirakit saat selesai"""
+    from fis_columnar import ColumnarWriter
+    if args.output in (None, "-"):
+        raise ValueError(f"--output-format {args.output_format} membutuhkan -o/--output (file/direktori)")
+    if args.id_column or args.medication:
+        raise ValueError("--id-column/--medication hanya untuk output csv/jsonl "
+                         "(baris kolomnar mengikuti urutan input yang valid)")
+    ruleset = load_ruleset(args.ruleset) if args.ruleset else None
+    clf = compile_ruleset(ruleset)[0] if ruleset else Diagnoser()
+    meta = {"ruleset": ruleset.version if ruleset else None}
+    errors: List[str] = []
+    with _open_input(args.input, args.input_format) as (lines, fmt):
+        with ColumnarWriter(args.output, args.output_format, clf.input_order, clf.describe()["diseases"],
+                            meta=meta, compress=args.compress) as writer:
+            t0 = time.perf_counter()
+            for chunk in _chunks(iter_rows(lines, fmt, overrides, None, errors), args.chunk_size):
+                writer.write(clf.predict_batch([row for _, row in chunk]))
+        elapsed = time.perf_counter() - t0
+    return _summary(writer.n, elapsed, errors, "diskor")
+
+def report(args) -> int:
+    overrides = parse_mapping(args.map or [])
+    errors: List[str] = []
+    out = sys.stdout.buffer if args.output in (None, "-") else open(args.output, "wb")
+    try:
+        with _open_input(args.input, args.input_format) as (lines, fmt):
+            entries = ((nama or "Pengguna", row)
+                       for nama, row in iter_rows(lines, fmt, overrides, args.name_column, errors))
+            writer = BulkReportWriter(args.format, args.ambang_peringatan)
+            t0 = time.perf_counter()
+            for data in iter_bulk_reports(entries, writer=writer):
+                out.write(data)
+            out.flush()
+            elapsed = time.perf_counter() - t0
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    errors += [f"entri {e['index']}: {e['error']}" for e in writer.errors]
+    return _summary(writer.count + len(writer.errors), elapsed, errors, "dilaporkan")
+
+def profile(args) -> int:
+    overrides = parse_mapping(args.map or [])
+    profiler = RuleProfiler()
+    clf = _engine(args, profiler=profiler)
+    errors: List[str] = []
+    with _open_input(args.input, args.input_format) as (lines, fmt):
+        n = 0
+        t0 = time.perf_counter()
+        for _, row in iter_rows(lines, fmt, overrides, None, errors):
+            clf.predict(row, return_details=args.details)
+            n += 1
+        elapsed = time.perf_counter() - t0
+    snapshot = profiler.snapshot(args.sort)
+    if args.output_format == "json":
+        if args.top:
+            snapshot["rules"] = snapshot["rules"][:args.top]
+        json.dump(snapshot, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(RuleProfiler.format_table(snapshot, args.top))
+    sys.stdout.flush()
+    return _summary(n, elapsed, errors, "diprofilkan")
+
+def sweep(args) -> int:
+    from fis_batch import DEFAULT_CHUNK_SIZE, SWEEP_DEFAULT_LEVELS, SWEEP_MAX_ROWS, sweep_grid  # NumPy & multiprocessing hanya untuk sweep
+    levels = {}
+    for item in args.level or []:
+        name, sep, spec = item.partition("=")
+        key = resolve_column(name, {})
+        if not sep or key is None:
+            raise ValueError(f"--level tidak valid: {item!r} (format: gejala=lexicon|a:b:langkah|v1,v2,...)")
+        levels[key] = spec
+    t0 = time.perf_counter()
+    last, resumed = [0.0], []
+    def report_progress(done: int, total: int):
+        if not resumed:
+            resumed.append(done)  # panggilan pertama = baris yang sudah selesai sebelumnya
+        now = time.perf_counter()
+        if done == total or now - last[0] >= args.progress_interval:
+            last[0] = now
+            print(f"\r{done:,}/{total:,} baris ({done / total:.1%})", end="\n" if done == total else "",
+                  file=sys.stderr, flush=True)
+    result = sweep_grid(args.output, levels, default=args.default or SWEEP_DEFAULT_LEVELS,
+                        chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE, workers=args.workers,
+                        overwrite=args.overwrite, progress=report_progress,
+                        max_rows=SWEEP_MAX_ROWS if args.max_rows is None else args.max_rows or None,
+                        engine_kwargs={"membership_resolution": args.resolution} if args.resolution else None)
+    return _summary(result["n"] - resumed[0], time.perf_counter() - t0, [], f"di-sweep ke {args.output}")
+
+def ruleset(args) -> int:
+    if args.action == "export":
+        data = json.dumps(export_ruleset(version=args.version, description=args.description),
+                          ensure_ascii=False, indent=2) + "\n"
+        if args.path in (None, "-"):
+            sys.stdout.write(data)
+        else:
+            with open(args.path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return 0
+    if not args.path:
+        raise ValueError("ruleset validate butuh path file")
+    try:
+        rs = load_ruleset(args.path)
+    except RulesetError as e:
+        for err in e.errors:
+            print(f"error: {err}", file=sys.stderr)
+        return 1
+    _, elapsed = compile_ruleset(rs)
+    info = rs.info()
+    print(f"OK versi {info['version']}: {info['variables']} variabel, {info['rules']} rule, "
+          f"compile {elapsed * 1e3:.2f} ms (sha256 {info['sha256']})")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m fis_tsukamoto", description="FIS Tsukamoto - prediksi penyakit")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    inp = argparse.ArgumentParser(add_help=False)
+    inp.add_argument("input", nargs="?", help="file CSV/JSONL (default/'-': stdin)")
+    inp.add_argument("--input-format", choices=FORMATS, help="default: dari ekstensi / baris pertama")
+    inp.add_argument("--map", action="append", metavar="KOLOM=KEY",
+                     help="petakan kolom ke key LABEL_ID atau labelnya (bisa berulang)")
+
+    p = sub.add_parser("score", parents=[inp], help="skor file CSV/JSONL kuisioner (streaming)")
+    p.add_argument("--output-format", choices=FORMATS + COLUMNAR_FORMATS,
+                   help="default: sama dengan input; npy (direktori), npz, fcol = kolomnar, wajib -o")
+    p.add_argument("-o", "--output", help="file/direktori output (default/'-': stdout, hanya csv/jsonl)")
+    p.add_argument("--inputs", action="store_true", help="csv: tambahkan kolom input_<gejala> (0..10)")
+    p.add_argument("--compress", action="store_true", help="npz: kompresi deflate")
+    p.add_argument("--id-column", help="kolom identitas yang disalin ke output")
+    p.add_argument("--medication", action="store_true", help="tambahkan level rekomendasi obat")
+    p.add_argument("--chunk-size", type=int, default=1024, help="baris per predict_batch (default 1024)")
+    p.add_argument("--ruleset", help="file ruleset JSON (default: rule base bawaan)")
+    p.set_defaults(func=score)
+
+    p = sub.add_parser("report", parents=[inp], help="laporan HTML massal (ZIP / HTML multi-halaman)")
+    p.add_argument("--format", choices=BULK_FORMATS, default="zip")
+    p.add_argument("-o", "--output", help="file output (default/'-': stdout)")
+    p.add_argument("--name-column", default="nama", help="kolom nama pasien (default: nama)")
+    p.add_argument("--ambang-peringatan", type=float, default=60.0)
+    p.set_defaults(func=report)
+
+    p = sub.add_parser("profile", parents=[inp], help="statistik firing per rule atas sampel kuisioner")
+    p.add_argument("--output-format", choices=("table", "json"), default="table")
+    p.add_argument("--sort", choices=RuleProfiler.SORT_KEYS, default="index")
+    p.add_argument("--top", type=int, help="tampilkan N rule teratas saja")
+    p.add_argument("--details", action="store_true", help="predict dengan return_details (ikut metadata)")
+    p.add_argument("--ruleset", help="file ruleset JSON (default: rule base bawaan)")
+    p.set_defaults(func=profile)
+
+    p = sub.add_parser("sweep", help="permukaan keputusan atas grid level gejala -> file .npy (bisa dilanjutkan)")
+    p.add_argument("output", help="direktori hasil (meta.json, scores.npy, confidence.npy, winner.npy)")
+    p.add_argument("--level", action="append", metavar="GEJALA=SPEC",
+                   help="level satu gejala: lexicon | a:b:langkah | v1,v2,... (bisa berulang)")
+    p.add_argument("--default", help="level gejala lain (default: 0,5,10)")
+    p.add_argument("--max-rows", type=int,
+                   help="tolak grid lebih besar dari ini sebelum file dibuat "
+                        "(default fis_batch.SWEEP_MAX_ROWS = 100000000, 0 = tanpa batas)")
+    p.add_argument("--chunk-size", type=int,
+                   help="baris per chunk / checkpoint (default fis_batch.DEFAULT_CHUNK_SIZE = 65536)")
+    p.add_argument("--workers", type=int, default=1, help="jumlah proses (default 1)")
+    p.add_argument("--resolution", type=float, help="membership_resolution engine (mis. 0.01)")
+    p.add_argument("--overwrite", action="store_true", help="timpa sweep lain di direktori output")
+    p.add_argument("--progress-interval", type=float, default=1.0, help="detik antar update progress")
+    p.set_defaults(func=sweep)
+
+    p = sub.add_parser("ruleset", help="validasi / ekspor rule base deklaratif (JSON berversi)")
+    p.add_argument("action", choices=("validate", "export"))
+    p.add_argument("path", nargs="?", help="validate: file ruleset; export: file output (default/'-': stdout)")
+    p.add_argument("--version", default="1.0.0", help="export: versi ruleset")
+    p.add_argument("--description", default="", help="export: deskripsi ruleset")
+    p.set_defaults(func=ruleset)
+    return ap
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        ap.error(str(e))
+    except BrokenPipeError:
+        # Output dipotong (mis. `| head`): hentikan tanpa traceback
+        sys.stdout = open(os.devnull, "w")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# fis_columnar.py
+# -*- coding: utf-8 -*-
+"""
+Output kolomnar hasil predict_batch: satu kolom per masukan gejala (0..10), skor & confidence
+per penyakit, winner, overall_confidence, active_rules - tanpa dict bersarang per baris.
+
+Format (ditulis streaming per chunk, memori konstan):
+  npy  - direktori: meta.json + satu <kolom>.npy per kolom (np.load(..., mmap_mode="r"))
+  npz  - satu arsip np.savez (entri <kolom>.npy + meta.json), opsional terkompresi
+  fcol - satu file memory-mappable: header JSON + kolom berurutan, tiap kolom rata 64 byte;
+         open_columns() mengembalikan view np.memmap (zero-copy) per kolom
+Skor/confidence penyakit tanpa rule aktif = NaN (sama dengan CompactResult).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from fis_tsukamoto import BatchPrediction
+
+COLUMNAR_FORMATS = ("npy", "npz", "fcol")
+COLUMNAR_VERSION = 1
+COLUMNAR_META = "meta.json"
+FCOL_MAGIC = b"FISCOL\x00\x01"
+FCOL_ALIGN = 64
+_NPY_HEADER = 128  # header .npy dicadangkan tetap, ditulis ulang dengan shape final saat close()
+
+def _check_name(kind: str, name: str):
+    # Nama kolom menjadi nama file <kolom>.npy (format npy/npz): tolak separator path & karakter kontrol
+    if not name or name in (".", "..") or any(c in name for c in "/\\") or not name.isprintable():
+        raise ValueError(f"nama {kind} {name!r} tidak bisa dipakai sebagai nama kolom/file "
+                         "(tanpa '/', '\\', '..' atau karakter kontrol)")
+
+def column_specs(symptoms: Sequence[str], diseases: Sequence[str]) -> List[Tuple[str, Any]]:
+    """Daftar (nama kolom, dtype) dengan urutan tetap; nama skor/confidence sama dengan header CSV.
+    Nama gejala/penyakit yang bisa keluar dari direktori output -> ValueError."""
+    for s in symptoms:
+        _check_name("gejala", s)
+    for d in diseases:
+        _check_name("penyakit", d)
+    return ([(f"input_{s}", np.float64) for s in symptoms]
+            + [(f"skor_{d}", np.float64) for d in diseases]
+            + [(f"confidence_{d}", np.float64) for d in diseases]
+            + [("winner", np.int16), ("overall_confidence", np.float64), ("active_rules", np.int32)])
+
+def batch_columns(batch: BatchPrediction) -> Dict[str, np.ndarray]:
+    """BatchPrediction -> {nama kolom: array 1-D (N,)} sesuai column_specs"""
+    scores = np.where(batch.active, batch.scores, np.nan)
+    confidence = np.where(batch.active, batch.confidence, np.nan)
+    cols = {f"input_{s}": batch.inputs[:, j] for j, s in enumerate(batch.symptoms)}
+    cols.update((f"skor_{d}", scores[:, j]) for j, d in enumerate(batch.diseases))
+    cols.update((f"confidence_{d}", confidence[:, j]) for j, d in enumerate(batch.diseases))
+    cols.update(winner=batch.winner, overall_confidence=batch.overall_confidence,
+                active_rules=batch.active_rules)
+    return {name: np.ascontiguousarray(cols[name], dtype=dtype)
+            for name, dtype in column_specs(batch.symptoms, batch.diseases)}
+
+def _npy_header(dtype: Any, n: int) -> bytes:
+    """Header .npy v1.0 untuk array 1-D, dipad spasi ke _NPY_HEADER byte"""
+    d = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (n,)}
+    prefix = np.lib.format.magic(1, 0)
+    body = repr(d).encode("latin1")
+    pad = _NPY_HEADER - len(prefix) - 2 - len(body) - 1
+    return prefix + struct.pack("<H", len(body) + pad + 1) + body + b" " * pad + b"\n"
+
+class ColumnarWriter:
+    """Tulis BatchPrediction per chunk ke path dalam format npy/npz/fcol.
+
+    Tiap kolom di-stream ke file .npy sendiri (header dicadangkan, shape diisi saat close),
+    jadi jumlah baris tidak perlu diketahui di awal. npz/fcol dirakit dari file tersebut
+    di direktori sementara lalu di-rename atomik; npy langsung memakainya.
+    """
+    def __init__(self, path: str, fmt: str, symptoms: Sequence[str], diseases: Sequence[str],
+                 meta: Optional[Dict[str, Any]] = None, compress: bool = False):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"format kolomnar harus salah satu {', '.join(COLUMNAR_FORMATS)}")
+        self.path = path
+        self.fmt = fmt
+        self.compress = compress
+        self.specs = column_specs(symptoms, diseases)
+        self.meta = {"format": COLUMNAR_VERSION, "symptoms": list(symptoms), "diseases": list(diseases),
+                     **(meta or {})}
+        self.n = 0
+        if fmt == "npy":
+            os.makedirs(path, exist_ok=True)
+            self._dir = path
+        else:
+            self._dir = tempfile.mkdtemp(prefix=".fiscol-", dir=os.path.dirname(os.path.abspath(path)))
+        self._files = {}
+        for name, dtype in self.specs:
+            f = open(self._file(name, ".tmp"), "wb")
+            f.write(_npy_header(dtype, 0))
+            self._files[name] = f
+
+    def _file(self, name: str, suffix: str = "") -> str:
+        return os.path.join(self._dir, f"{name}.npy{suffix}")
+
+    def write(self, batch: BatchPrediction):
+        cols = batch_columns(batch)
+        if list(cols) != [name for name, _ in self.specs]:
+            raise ValueError("gejala/penyakit batch tidak sesuai writer")
+        for name, col in cols.items():
+            self._files[name].write(col.tobytes())
+        self.n += len(batch)
+
+    def close(self) -> Dict[str, Any]:
+        """Lengkapi header & rakit format akhir -> meta (termasuk n dan daftar kolom)"""
+        for name, dtype in self.specs:
+            f = self._files[name]
+            f.seek(0)
+            f.write(_npy_header(dtype, self.n))
+            f.close()
+            os.replace(self._file(name, ".tmp"), self._file(name))
+        meta = dict(self.meta, n=self.n,
+                    columns=[{"name": name, "dtype": np.dtype(dtype).str} for name, dtype in self.specs])
+        try:
+            if self.fmt == "npy":
+                with open(os.path.join(self._dir, COLUMNAR_META), "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False, indent=1)
+            elif self.fmt == "npz":
+                self._write_npz(meta)
+            else:
+                self._write_fcol(meta)
+        finally:
+            if self.fmt != "npy":
+                shutil.rmtree(self._dir, ignore_errors=True)
+        return meta
+
+    def abort(self):
+        """Batalkan tulisan (mis. error di tengah stream): file sementara dibuang"""
+        for f in self._files.values():
+            f.close()
+        if self.fmt == "npy":
+            for name, _ in self.specs:
+                if os.path.exists(self._file(name, ".tmp")):
+                    os.remove(self._file(name, ".tmp"))
+        else:
+            shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write_npz(self, meta: Dict[str, Any]):
+        tmp = self.path + ".tmp"
+        mode = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(tmp, "w", mode, allowZip64=True) as zf:
+            for name, _ in self.specs:
+                zf.write(self._file(name), f"{name}.npy")
+            zf.writestr(COLUMNAR_META, json.dumps(meta, ensure_ascii=False, indent=1))
+        os.replace(tmp, self.path)
+
+    def _write_fcol(self, meta: Dict[str, Any]):
+        # offset kolom relatif awal data; header dipad sehingga awal data juga rata FCOL_ALIGN
+        offset = 0
+        columns = []
+        for c, (name, dtype) in zip(meta["columns"], self.specs):
+            offset = -(-offset // FCOL_ALIGN) * FCOL_ALIGN
+            columns.append(dict(c, offset=offset))
+            offset += self.n * np.dtype(dtype).itemsize
+        header = dict(meta, columns=columns)
+        body = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        start = -(-(len(FCOL_MAGIC) + 8 + len(body)) // FCOL_ALIGN) * FCOL_ALIGN
+        body += b" " * (start - len(FCOL_MAGIC) - 8 - len(body))
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(FCOL_MAGIC + struct.pack("<Q", len(body)) + body)
+            for c in columns:
+                out.write(b"\0" * (start + c["offset"] - out.tell()))
+                with open(self._file(c["name"]), "rb") as f:
+                    f.seek(_NPY_HEADER)
+                    shutil.copyfileobj(f, out, 1 << 20)
+        os.replace(tmp, self.path)
+
+def write_columns(path: str, batches: Union[BatchPrediction, Iterable[BatchPrediction]], fmt: str = "fcol",
+                  meta: Optional[Dict[str, Any]] = None, compress: bool = False) -> Dict[str, Any]:
+    """Tulis satu BatchPrediction (atau iterable chunk) ke path -> meta"""
+    it = iter([batches] if isinstance(batches, BatchPrediction) else batches)
+    first = next(it, None)
+    if first is None:
+        raise ValueError("tidak ada batch untuk ditulis")
+    writer = ColumnarWriter(path, fmt, first.symptoms, first.diseases, meta, compress)
+    try:
+        writer.write(first)
+        for batch in it:
+            writer.write(batch)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+def _read_fcol(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        prefix = f.read(len(FCOL_MAGIC) + 8)
+        if prefix[:len(FCOL_MAGIC)] != FCOL_MAGIC:
+            raise ValueError(f"{path} bukan file fcol")
+        size = struct.unpack("<Q", prefix[len(FCOL_MAGIC):])[0]
+        header = json.loads(f.read(size))
+    start = len(FCOL_MAGIC) + 8 + size
+    n = header["n"]
+    if not n:  # np.memmap tidak bisa memetakan file tanpa data
+        return dict(header, columns={c["name"]: np.empty(0, dtype=c["dtype"]) for c in header["columns"]})
+    buf = np.memmap(path, dtype=np.uint8, mode="r")
+    columns = {c["name"]: np.frombuffer(buf, dtype=c["dtype"], count=n, offset=start + c["offset"])
+               for c in header["columns"]}
+    return dict(header, columns=columns)
+
+def open_columns(path: str) -> Dict[str, Any]:
+    """Baca output kolomnar (format dideteksi dari path) -> meta + {"columns": {nama: array}}.
+    npy & fcol: array read-only memory-mapped (zero-copy); npz: array dimuat ke memori."""
+    if os.path.isdir(path):
+        with open(os.path.join(path, COLUMNAR_META), encoding="utf-8") as f:
+            meta = json.load(f)
+        columns = {c["name"]: np.load(os.path.join(path, f"{c['name']}.npy"), mmap_mode="r")
+                   for c in meta["columns"]}
+        return dict(meta, columns=columns)
+    with open(path, "rb") as f:
+        magic = f.read(len(FCOL_MAGIC))
+    if magic == FCOL_MAGIC:
+        return _read_fcol(path)
+    with np.load(path) as npz:
+        meta = json.loads(npz[COLUMNAR_META])
+        columns = {c["name"]: npz[c["name"]] for c in meta["columns"]}
+    return dict(meta, columns=columns)
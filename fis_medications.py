@@ -0,0 +1,351 @@
+# fis_medications.py
+# -*- coding: utf-8 -*-
+"""
+Data rekomendasi obat per penyakit & tingkat keparahan (mild/moderate/severe).
+Dimuat lazy oleh fis_tsukamoto saat rekomendasi obat pertama kali diminta, sehingga import
+engine (mis. cold start serverless) tidak membayar literal besar ini.
+"""
+
+# === MEDICATION DATABASE ===
+# ⚠️  STRONG MEDICAL DISCLAIMER ⚠️
+# This medication database is for EDUCATIONAL PURPOSES ONLY
+# NOT a substitute for professional medical advice, diagnosis, or treatment
+# Always consult with qualified healthcare providers before taking any medication
+# Self-medication can be dangerous and may cause serious health complications
+# Individual medical conditions vary - what works for one person may harm another
+
+MEDICATION_DATABASE = {
+    "Influenza": {
+        "category": "Infeksi Virus Saluran Napas",
+        "severity_levels": {
+            "mild": {
+                "medications": [
+                    {
+                        "name": "Paracetamol (Panadol, Biogesic)",
+                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam atau sakit",
+                        "purpose": "Menurunkan demam dan mengurangi rasa sakit",
+                        "duration": "3-5 hari sampai demam hilang",
+                        "side_effects": "Kadang perut mules atau ruam kulit",
+                        "warnings": "Jangan minum lebih dari 8 tablet sehari. Hati-hati jika punya penyakit hati"
+                    },
+                    {
+                        "name": "Ibuprofen (Advil, Nurofen)",
+                        "dosage": "1 tablet (200mg) setiap 6-8 jam jika dibutuhkan",
+                        "purpose": "Mengurangi demam, sakit, dan bengkak",
+                        "duration": "3-5 hari",
+                        "side_effects": "Kadang perut sakit atau pusing",
+                        "warnings": "Jangan minum saat perut kosong. Hati-hati jika punya masalah lambung"
+                    }
+                ],
+                "general_advice": "Istirahat di rumah, minum air putih banyak-banyak (minimal 2 liter sehari), makan makanan bergizi seperti sayur, buah, dan sup ayam hangat"
+            },
+            "moderate": {
+                "medications": [
+                    {
+                        "name": "Paracetamol + Ibuprofen (sama seperti di atas)",
+                        "dosage": "Gunakan sesuai dosis masing-masing obat",
+                        "purpose": "Mengatasi gejala yang lebih berat",
+                        "duration": "3-5 hari",
+                        "side_effects": "Gabungan efek samping kedua obat",
+                        "warnings": "Tanya dokter dulu sebelum minum dua jenis obat sekaligus"
+                    },
+                    {
+                        "name": "Obat Alergi (CTM, Loratadine)",
+                        "dosage": "1 tablet sehari sesuai kemasan",
+                        "purpose": "Mengurangi hidung meler dan bersin-bersin",
+                        "duration": "3-7 hari",
+                        "side_effects": "Kadang ngantuk atau mulut kering",
+                        "warnings": "Hati-hati saat mengemudi atau bekerja"
+                    }
+                ],
+                "general_advice": "Istirahat total, minum banyak cairan, jaga jarak dengan orang lain agar tidak menular, gunakan masker jika keluar rumah"
+            },
+            "severe": {
+                "medications": [
+                    {
+                        "name": "Tamiflu (Oseltamivir)",
+                        "dosage": "1 kapsul (75mg) 2 kali sehari",
+                        "purpose": "Obat antivirus khusus untuk flu (hanya jika sudah dikonfirmasi dokter)",
+                        "duration": "5 hari penuh",
+                        "side_effects": "Kadang mual atau pusing",
+                        "warnings": "Obat mahal dan hanya bisa didapat dengan resep dokter"
+                    }
+                ],
+                "general_advice": "Segera periksa ke dokter spesialis, mungkin perlu dirawat di rumah sakit jika gejala makin berat"
+            }
+        },
+        "emergency_signs": ["Susah bernapas", "Sakit dada", "Demam tinggi tidak turun dengan obat", "Kejang-kejang", "Pingsan atau tidak sadar"]
+    },
+
+    "Demam Berdarah Dengue": {
+        "category": "Penyakit Virus Demam Berdarah",
+        "severity_levels": {
+            "mild": {
+                "medications": [
+                    {
+                        "name": "Paracetamol (Panadol)",
+                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam",
+                        "purpose": "Menurunkan demam (JANGAN pakai aspirin atau ibuprofen)",
+                        "duration": "Sampai demam turun ke normal",
+                        "side_effects": "Jarang sekali, kadang ruam kulit",
+                        "warnings": "Dilarang keras pakai aspirin atau ibuprofen - bisa bikin perdarahan lebih parah"
+                    },
+                    {
+                        "name": "Oralit atau Larutan Rehidrasi",
+                        "dosage": "1 paket larutkan dalam 1 gelas air, minum sedikit-sedikit",
+                        "purpose": "Mencegah tubuh kekurangan cairan",
+                        "duration": "Selama masih demam dan merasa haus",
+                        "side_effects": "Tidak ada efek samping",
+                        "warnings": "Minum pelan-pelan biar tidak mual. Lebih baik dari air putih saja"
+                    }
+                ],
+                "general_advice": "Istirahat total di tempat sejuk, minum banyak cairan, makan makanan lunak, periksa darah untuk menghitung trombosit, pantau terus gejala bahaya DBD"
+            },
+            "moderate": {
+                "medications": [
+                    {
+                        "name": "Paracetamol",
+                        "dosage": "1 tablet (500mg) setiap 4 jam jika perlu",
+                        "purpose": "Mengontrol demam agar tidak terlalu tinggi",
+                        "duration": "Sampai demam benar-benar turun",
+                        "side_effects": "Jarang sekali",
+                        "warnings": "Pantau trombosit darah, jangan pakai aspirin sama sekali"
+                    }
+                ],
+                "general_advice": "Kemungkinan besar perlu dirawat di rumah sakit, mungkin perlu transfusi darah jika trombosit terlalu rendah"
+            },
+            "severe": {
+                "medications": [
+                    {
+                        "name": "Cairan Infus",
+                        "dosage": "Sesuai kondisi tubuh pasien",
+                        "purpose": "Mengisi cairan tubuh dan menstabilkan kondisi",
+                        "duration": "Sesuai kebutuhan dokter",
+                        "side_effects": "Bisa kelebihan cairan jika tidak hati-hati",
+                        "warnings": "Hanya bisa dilakukan di rumah sakit oleh dokter"
+                    },
+                    {
+                        "name": "Transfusi Darah atau Trombosit",
+                        "dosage": "Sesuai hasil pemeriksaan darah",
+                        "purpose": "Mengatasi perdarahan dan kekurangan trombosit",
+                        "duration": "Sesuai kondisi",
+                        "side_effects": "Kadang ada reaksi alergi ringan",
+                        "warnings": "Hanya dilakukan di rumah sakit dengan darah yang sudah diperiksa"
+                    }
+                ],
+                "general_advice": "Perlu perawatan intensif di rumah sakit, dipantau ketat oleh dokter, bisa berbahaya jika tidak segera ditangani"
+            }
+        },
+        "emergency_signs": ["Keluar darah dari hidung/mulut/bab", "Muntah darah", "BAB hitam seperti kopi", "Pingsan atau syok", "Trombosit darah kurang dari 50.000", "Hematokrit darah naik drastis"]
+    },
+
+    "Demam Tifoid": {
+        "category": "Infeksi Bakteri Usus",
+        "severity_levels": {
+            "mild": {
+                "medications": [
+                    {
+                        "name": "Ciprofloxacin (Cipro)",
+                        "dosage": "1 tablet (500mg) 2 kali sehari",
+                        "purpose": "Antibiotik untuk membunuh bakteri penyebab tifus",
+                        "duration": "7-14 hari penuh",
+                        "side_effects": "Kadang mual, diare, atau pusing",
+                        "warnings": "Harus minum sampai habis meski sudah sembuh. Hanya dengan resep dokter"
+                    },
+                    {
+                        "name": "Paracetamol",
+                        "dosage": "1 tablet (500mg) setiap 6 jam jika demam",
+                        "purpose": "Menurunkan demam",
+                        "duration": "Sampai demam hilang",
+                        "side_effects": "Jarang sekali",
+                        "warnings": "Jangan minum berlebihan"
+                    }
+                ],
+                "general_advice": "Istirahat cukup, makan makanan lunak seperti bubur atau nasi tim, hindari makanan mentah, sayur, atau buah yang tidak dikupas"
+            },
+            "moderate": {
+                "medications": [
+                    {
+                        "name": "Ceftriaxone (Rocephin) - Suntik",
+                        "dosage": "Diberikan oleh dokter sesuai kondisi",
+                        "purpose": "Antibiotik kuat untuk tifus yang agak berat",
+                        "duration": "7-14 hari",
+                        "side_effects": "Kadang diare atau alergi",
+                        "warnings": "Hanya di rumah sakit"
+                    },
+                    {
+                        "name": "Azithromycin (Zithromax)",
+                        "dosage": "1 tablet (500mg) 1 kali sehari",
+                        "purpose": "Antibiotik alternatif jika bakteri resisten",
+                        "duration": "7 hari",
+                        "side_effects": "Kadang mual atau diare",
+                        "warnings": "Alternatif jika antibiotik lain tidak cocok"
+                    }
+                ],
+                "general_advice": "Perlu dirawat di rumah sakit, dipantau terus kemungkinan komplikasi seperti perdarahan atau perforasi usus"
+            },
+            "severe": {
+                "medications": [
+                    {
+                        "name": "Meropenem atau Imipenem - Antibiotik Kuat",
+                        "dosage": "Diberikan oleh dokter sesuai kondisi",
+                        "purpose": "Antibiotik khusus untuk komplikasi tifus berat",
+                        "duration": "Sesuai kondisi pasien",
+                        "side_effects": "Diare berat, bisa resisten",
+                        "warnings": "Antibiotik cadangan, sangat kuat"
+                    }
+                ],
+                "general_advice": "Perlu perawatan ICU, pemantauan ketat, bisa ada komplikasi serius yang mengancam nyawa"
+            }
+        },
+        "emergency_signs": ["BAB berdarah", "Lubang di usus", "Radang otak", "Syok karena infeksi", "Beberapa organ tubuh rusak"]
+    },
+
+    "Gastroenteritis": {
+        "category": "Infeksi Pencernaan",
+        "severity_levels": {
+            "mild": {
+                "medications": [
+                    {
+                        "name": "Oralit atau Larutan Rehidrasi",
+                        "dosage": "1 paket dalam 1 gelas air, minum sedikit-sedikit tapi sering",
+                        "purpose": "Mengganti cairan tubuh yang hilang karena diare",
+                        "duration": "Selama masih sering BAB",
+                        "side_effects": "Tidak ada",
+                        "warnings": "Lebih baik dari air putih biasa. Minum pelan-pelan biar tidak muntah"
+                    },
+                    {
+                        "name": "Loperamide (Imodium, Diapet)",
+                        "dosage": "1-2 tablet setelah BAB cair, maksimal 4 tablet sehari",
+                        "purpose": "Menghentikan diare agar tidak dehidrasi",
+                        "duration": "1-2 hari saja",
+                        "side_effects": "Kadang sembelit atau perut kembung",
+                        "warnings": "Jangan pakai jika BAB berdarah seperti disentri"
+                    }
+                ],
+                "general_advice": "Makan pisang, nasi putih, apel parut, roti tawar (diet BRAT). Hindari susu, gorengan, dan makanan pedas. Istirahat dan minum banyak cairan"
+            },
+            "moderate": {
+                "medications": [
+                    {
+                        "name": "Metronidazole (Flagyl) - untuk parasit",
+                        "dosage": "1 tablet (500mg) 3 kali sehari",
+                        "purpose": "Membunuh parasit penyebab diare",
+                        "duration": "5-7 hari",
+                        "side_effects": "Mual, rasa logam di mulut",
+                        "warnings": "Hanya jika sudah dikonfirmasi ada parasit"
+                    },
+                    {
+                        "name": "Ciprofloxacin - untuk bakteri",
+                        "dosage": "1 tablet (500mg) 2 kali sehari",
+                        "purpose": "Antibiotik untuk membunuh bakteri penyebab",
+                        "duration": "3-5 hari",
+                        "side_effects": "Mual atau diare",
+                        "warnings": "Hanya dengan resep dokter"
+                    }
+                ],
+                "general_advice": "Mungkin perlu infus cairan di rumah sakit, pantau tanda dehidrasi seperti bibir kering, mata cekung, atau berkurangnya air seni"
+            },
+            "severe": {
+                "medications": [
+                    {
+                        "name": "Cairan Infus",
+                        "dosage": "Sesuai kebutuhan tubuh",
+                        "purpose": "Mengisi cairan dan elektrolit yang hilang",
+                        "duration": "Sesuai kondisi",
+                        "side_effects": "Bisa kelebihan cairan",
+                        "warnings": "Hanya di rumah sakit"
+                    },
+                    {
+                        "name": "Antibiotik Suntik",
+                        "dosage": "Sesuai jenis kuman penyebab",
+                        "purpose": "Mengatasi infeksi berat",
+                        "duration": "Sesuai kondisi",
+                        "side_effects": "Sesuai jenis antibiotik",
+                        "warnings": "Perlu pemeriksaan laboratorium dulu"
+                    }
+                ],
+                "general_advice": "Dirawat di rumah sakit, dipantau elektrolit darah, mungkin perlu makan lewat infus jika tidak bisa makan normal"
+            }
+        },
+        "emergency_signs": ["Dehidrasi berat (bibir kering, mata cekung)", "BAB berdarah", "Demam tinggi", "Pingsan atau syok", "Elektrolit tubuh tidak seimbang"]
+    },
+
+    "Infeksi Saluran Pernapasan Atas": {
+        "category": "Infeksi Tenggorokan dan Hidung",
+        "severity_levels": {
+            "mild": {
+                "medications": [
+                    {
+                        "name": "Paracetamol",
+                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam atau sakit",
+                        "purpose": "Menurunkan demam dan mengurangi sakit tenggorokan",
+                        "duration": "3-5 hari",
+                        "side_effects": "Jarang sekali",
+                        "warnings": "Jangan minum berlebihan"
+                    },
+                    {
+                        "name": "Dekongestan Hidung (Actifed, Sudafed)",
+                        "dosage": "1 tablet (30-60mg) setiap 4-6 jam",
+                        "purpose": "Mengurangi hidung tersumbat agar bisa bernapas lega",
+                        "duration": "3-5 hari",
+                        "side_effects": "Tekanan darah bisa naik, gelisah",
+                        "warnings": "Hati-hati jika punya darah tinggi"
+                    },
+                    {
+                        "name": "Antihistamin (Claritin, Cetirizine)",
+                        "dosage": "1 tablet (10mg) 1 kali sehari",
+                        "purpose": "Mengurangi bersin dan hidung meler",
+                        "duration": "7 hari",
+                        "side_effects": "Kadang ngantuk",
+                        "warnings": "Hati-hati saat mengemudi"
+                    }
+                ],
+                "general_advice": "Istirahat cukup, minum air hangat, gunakan humidifier atau uap air panas untuk melegakan hidung, kumur dengan air garam hangat"
+            },
+            "moderate": {
+                "medications": [
+                    {
+                        "name": "Amoxicillin - untuk infeksi bakteri",
+                        "dosage": "1 tablet (500mg) 3 kali sehari",
+                        "purpose": "Antibiotik jika ada infeksi bakteri",
+                        "duration": "7-10 hari",
+                        "side_effects": "Kadang diare atau ruam kulit",
+                        "warnings": "Hanya jika sudah dikonfirmasi ada bakteri"
+                    },
+                    {
+                        "name": "Semprotan Hidung Steroid (Avamys, Flixonase)",
+                        "dosage": "2 semprot di setiap lubang hidung, 1 kali sehari",
+                        "purpose": "Mengurangi peradangan di hidung",
+                        "duration": "1-2 minggu",
+                        "side_effects": "Hidung kering atau mimisan",
+                        "warnings": "Tidak langsung bekerja, perlu beberapa hari"
+                    }
+                ],
+                "general_advice": "Jika tidak membaik dalam seminggu, periksa ke dokter. Bisa jadi perlu antibiotik atau pemeriksaan lebih lanjut"
+            },
+            "severe": {
+                "medications": [
+                    {
+                        "name": "Steroid Sistemik",
+                        "dosage": "Sesuai resep dokter",
+                        "purpose": "Mengurangi peradangan yang sangat berat",
+                        "duration": "5-7 hari",
+                        "side_effects": "Bisa mengganggu daya tahan tubuh, kadar gula darah naik",
+                        "warnings": "Hanya dengan resep dokter spesialis"
+                    },
+                    {
+                        "name": "Antibiotik Spektrum Luas",
+                        "dosage": "Sesuai kondisi",
+                        "purpose": "Untuk infeksi yang sudah parah",
+                        "duration": "1-2 minggu",
+                        "side_effects": "Sesuai jenis antibiotik",
+                        "warnings": "Perlu pemeriksaan dahulu untuk jenis baktinya"
+                    }
+                ],
+                "general_advice": "Mungkin perlu dirawat di rumah sakit, periksa ke dokter spesialis THT, bisa ada komplikasi ke telinga atau sinus"
+            }
+        },
+        "emergency_signs": ["Susah bernapas", "Sakit dada", "Demam tinggi yang tidak turun", "Dehidrasi", "Komplikasi ke telinga atau sinus paranasal"]
+    }
+}
@@ -0,0 +1,213 @@
+# fis_metrics.py
+# -*- coding: utf-8 -*-
+"""
+Metrik latensi per tahap (parse, fire, aggregate, medication, serialize, render) dan counter
+request, dalam format teks Prometheus. Label endpoint & details diambil dari context request
+(contextvars), sehingga ikut terbawa ke thread worker lewat contextvars.copy_context().
+Histogram tahap untuk label aktif di-bind sekali per request (per context); observe() sesudahnya
+tanpa lock maupun lookup key (tahap, endpoint, details).
+"""
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+import threading
+import time
+
+# Batas bucket histogram (detik): 5 us .. 1 s
+DEFAULT_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2,
+                   5e-2, 0.1, 0.25, 0.5, 1.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Histogram:
+    """Histogram kumulatif ala Prometheus (tidak thread-safe; request dikunci oleh StageMetrics,
+    tahap di-update tanpa lock - di bawah GIL paling buruk satu sampel hilang saat balapan)"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class RequestTimer:
+    """State satu request HTTP; diisi handler, dibaca middleware saat response dikirim"""
+    __slots__ = ("endpoint", "details", "start", "handler_done")
+    def __init__(self):
+        self.endpoint: Optional[str] = None
+        self.details = "false"
+        self.start = time.perf_counter()
+        self.handler_done: Optional[float] = None
+
+_labels: ContextVar[Tuple[str, str]] = ContextVar("fis_metrics_labels", default=("", "false"))
+_request: ContextVar[Optional[RequestTimer]] = ContextVar("fis_metrics_request", default=None)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class StageMetrics:
+    """Registry histogram per (tahap, endpoint, details) dan counter request per status"""
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str], Histogram] = {}
+        self._status: Dict[Tuple[str, str, str], int] = {}
+        # (label, {tahap: Histogram}) untuk context ini; dibuat ulang hanya saat label berganti
+        self._bound: ContextVar[Optional[Tuple[Tuple[str, str], Dict[str, Histogram]]]] = \
+            ContextVar("fis_metrics_bound", default=None)
+        self._by_labels: Dict[Tuple[str, str], Dict[str, Histogram]] = {}
+
+    # --- dipakai engine / handler ---
+    def observe(self, stage: str, seconds: float):
+        """Observer Diagnoser: catat durasi tahap dengan label request aktif"""
+        labels = _labels.get()
+        bound = self._bound.get()
+        if bound is None or bound[0] is not labels:
+            bound = self._bind(labels)
+        h = bound[1].get(stage)
+        if h is None:
+            h = self._stage_histogram(labels, stage)
+        # Histogram.observe di-inline: observer dipanggil beberapa kali per predict
+        h.counts[bisect_left(self.buckets, seconds)] += 1
+        h.sum += seconds
+        h.count += 1
+
+    def _bind(self, labels: Tuple[str, str]) -> Tuple[Tuple[str, str], Dict[str, Histogram]]:
+        """Ikat histogram tahap milik label ini ke context (sekali per request)"""
+        with self._lock:
+            stages = self._by_labels.get(labels)
+            if stages is None:
+                stages = self._by_labels[labels] = {}
+        bound = (labels, stages)
+        self._bound.set(bound)
+        return bound
+
+    def _stage_histogram(self, labels: Tuple[str, str], stage: str) -> Histogram:
+        with self._lock:
+            key = (stage,) + labels
+            h = self._stages.get(key)
+            if h is None:
+                h = self._stages[key] = Histogram(self.buckets)
+            self._by_labels[labels][stage] = h
+        return h
+
+    @staticmethod
+    def set_labels(endpoint: str, details: bool):
+        """Label untuk observasi berikutnya di context ini (mis. per item batch)"""
+        _labels.set((endpoint, "true" if details else "false"))
+
+    @staticmethod
+    def track(endpoint: str, details: Any = False):
+        """Tandai request aktif untuk dihitung middleware; details: bool atau label ("mixed")"""
+        details = details if isinstance(details, str) else ("true" if details else "false")
+        _labels.set((endpoint, details))
+        timer = _request.get()
+        if timer is not None:
+            timer.endpoint = endpoint
+            timer.details = details
+
+    @staticmethod
+    def handler_done():
+        """Handler selesai; sisa waktu sampai response start dicatat sebagai tahap serialize"""
+        timer = _request.get()
+        if timer is not None:
+            timer.handler_done = time.perf_counter()
+
+    # --- middleware ---
+    def _finish(self, timer: RequestTimer, status: int, response_started: Optional[float]):
+        now = time.perf_counter()
+        with self._lock:
+            if timer.handler_done is not None and response_started is not None:
+                labels = (timer.endpoint, timer.details)
+                h = self._by_labels.setdefault(labels, {}).get("serialize")
+                if h is None:
+                    h = self._stages[("serialize",) + labels] = Histogram(self.buckets)
+                    self._by_labels[labels]["serialize"] = h
+                h.observe(response_started - timer.handler_done)
+            key2 = (timer.endpoint, timer.details)
+            h = self._requests.get(key2)
+            if h is None:
+                h = self._requests[key2] = Histogram(self.buckets)
+            h.observe(now - timer.start)
+            key3 = (timer.endpoint, timer.details, str(status))
+            self._status[key3] = self._status.get(key3, 0) + 1
+
+    # --- eksposisi ---
+    def render(self, prefix: str = "fis") -> List[str]:
+        with self._lock:
+            stages = [(k, list(h.counts), h.sum, h.count) for k, h in sorted(self._stages.items())]
+            requests = [(k, list(h.counts), h.sum, h.count) for k, h in sorted(self._requests.items())]
+            status = sorted(self._status.items())
+        lines = [f"# HELP {prefix}_stage_duration_seconds Durasi per tahap pemrosesan",
+                 f"# TYPE {prefix}_stage_duration_seconds histogram"]
+        for (stage, endpoint, details), counts, total, count in stages:
+            labels = f'stage="{_escape(stage)}",endpoint="{_escape(endpoint)}",details="{details}"'
+            lines += self._histogram_lines(f"{prefix}_stage_duration_seconds", labels, counts, total, count)
+        lines += [f"# HELP {prefix}_request_duration_seconds Durasi request HTTP sampai body terkirim",
+                  f"# TYPE {prefix}_request_duration_seconds histogram"]
+        for (endpoint, details), counts, total, count in requests:
+            labels = f'endpoint="{_escape(endpoint)}",details="{details}"'
+            lines += self._histogram_lines(f"{prefix}_request_duration_seconds", labels, counts, total, count)
+        lines += [f"# HELP {prefix}_requests_total Jumlah request per endpoint, details, dan status",
+                  f"# TYPE {prefix}_requests_total counter"]
+        for (endpoint, details, code), n in status:
+            lines.append(f'{prefix}_requests_total{{endpoint="{_escape(endpoint)}",details="{details}",status="{code}"}} {n}')
+        return lines
+
+    def _histogram_lines(self, name: str, labels: str, counts: List[int], total: float, count: int) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{_fmt(bound)}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {_fmt(total)}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+        return lines
+
+def gauge_lines(name: str, help_text: str, samples: Iterable[Tuple[str, float]], kind: str = "gauge") -> List[str]:
+    """Baris metrik sederhana: samples = [(label string tanpa kurung, nilai)]"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {_fmt(value)}" if labels else f"{name} {_fmt(value)}")
+    return lines
+
+class MetricsMiddleware:
+    """Middleware ASGI: buat RequestTimer per request HTTP; request yang di-track() handler
+    dicatat durasi total, status, dan tahap serialize (handler selesai -> response start)"""
+    def __init__(self, app, metrics: StageMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timer = RequestTimer()
+        token = _request.set(timer)
+        state = {"status": 500, "started": None, "done": False}
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["started"] = time.perf_counter()
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                state["done"] = True
+                if timer.endpoint is not None:
+                    self.metrics._finish(timer, state["status"], state["started"])
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            if timer.endpoint is not None and not state["done"]:
+                self.metrics._finish(timer, 500, None)
+            raise
+        finally:
+            _request.reset(token)
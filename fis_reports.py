@@ -0,0 +1,113 @@
+# fis_reports.py
+# -*- coding: utf-8 -*-
+"""
+Laporan massal: prediksi + render_report_html untuk banyak pasien, ditulis bertahap sebagai
+ZIP (satu file HTML per pasien) atau satu dokumen HTML multi-halaman. Tiap entri langsung
+diubah ke bytes keluaran, jadi memori tidak bertambah dengan jumlah pasien.
+Template laporan (fis_templates) dan zipfile baru diimpor saat writer pertama dibuat.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import re
+
+from fis_tsukamoto import Diagnoser
+
+BULK_FORMATS = ("zip", "html")
+MEDIA_TYPES = {"zip": "application/zip", "html": "text/html; charset=utf-8"}
+
+_PAGES_STYLE = "<style>.page{break-after:page;page-break-after:always}</style>\n"
+_SLUG_RE = re.compile(r"[^0-9A-Za-z]+")
+
+def report_filename(index: int, nama: str) -> str:
+    """Nama file entri ZIP: urutan + nama pasien yang aman untuk path"""
+    slug = _SLUG_RE.sub("-", str(nama)).strip("-")[:40] or "pasien"
+    return f"{index + 1:05d}_{slug}.html"
+
+class _ChunkBuffer:
+    """File tulis-saja tanpa seek untuk ZipFile; bytes yang sudah ditulis diambil dengan take()"""
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._offset = 0
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+    def tell(self) -> int:
+        return self._offset
+    def flush(self):
+        pass
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+class BulkReportWriter:
+    """Penulis laporan massal bertahap: start(), add()/add_error() per entri, finish().
+    Tiap method mengembalikan bytes yang siap dikirim ke klien."""
+    def __init__(self, fmt: str = "zip", ambang_peringatan: float = 60.0, clf: Optional[Diagnoser] = None):
+        if fmt not in BULK_FORMATS:
+            raise ValueError(f"format harus salah satu {BULK_FORMATS}")
+        self.fmt = fmt
+        self.ambang_peringatan = ambang_peringatan
+        self.clf = clf or Diagnoser()
+        self.count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._buf: Optional[_ChunkBuffer] = None
+        self._zip: Optional["zipfile.ZipFile"] = None
+        import fis_templates
+        self._tpl = fis_templates
+
+    def start(self) -> bytes:
+        if self.fmt == "zip":
+            import zipfile
+            self._buf = _ChunkBuffer()
+            self._zip = zipfile.ZipFile(self._buf, "w", zipfile.ZIP_DEFLATED)
+            return b""
+        return (self._tpl.REPORT_HTML_HEAD + _PAGES_STYLE).encode("utf-8")
+
+    def add(self, index: int, nama: str, jawaban_teks: Dict[str, str]) -> bytes:
+        pred = self.clf.predict(jawaban_teks)
+        self.count += 1
+        if self._zip is not None:
+            html_doc = self._tpl.render_report_html(nama, jawaban_teks, pred, self.ambang_peringatan)
+            self._zip.writestr(report_filename(index, nama), html_doc)
+            return self._buf.take()
+        page = self._tpl.render_report_page(nama, jawaban_teks, pred, self.ambang_peringatan)
+        return f'<section class="page">{page}</section>\n'.encode("utf-8")
+
+    def add_error(self, index: int, error: str) -> bytes:
+        """Entri gagal tidak menggagalkan batch; dicatat dan dilaporkan di akhir"""
+        self.errors.append({"index": index, "error": error})
+        return b""
+
+    def finish(self) -> bytes:
+        if self._zip is not None:
+            if self.errors:
+                self._zip.writestr("errors.ndjson", "".join(
+                    json.dumps(e, ensure_ascii=False) + "\n" for e in self.errors))
+            self._zip.close()
+            return self._buf.take()
+        tail = ""
+        if self.errors:
+            escape = self._tpl.escape_html
+            items = "".join(f"<li>#{e['index']}: {escape(e['error'])}</li>" for e in self.errors)
+            tail = f'<div class="card"><div class="h2">Entri gagal</div><ul>{items}</ul></div>\n'
+        return (tail + self._tpl.REPORT_HTML_END).encode("utf-8")
+
+def iter_bulk_reports(entries: Iterable[Tuple[str, Dict[str, str]]], fmt: str = "zip",
+                      ambang_peringatan: float = 60.0, clf: Optional[Diagnoser] = None,
+                      writer: Optional[BulkReportWriter] = None) -> Iterator[bytes]:
+    """Stream bytes ZIP/HTML untuk entri (nama, jawaban_teks), satu chunk per pasien"""
+    writer = writer or BulkReportWriter(fmt, ambang_peringatan, clf)
+    head = writer.start()
+    if head:
+        yield head
+    for index, (nama, jawaban_teks) in enumerate(entries):
+        try:
+            data = writer.add(index, nama, jawaban_teks)
+        except Exception as e:
+            data = writer.add_error(index, str(e))
+        if data:
+            yield data
+    yield writer.finish()
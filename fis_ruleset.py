@@ -0,0 +1,187 @@
+# fis_ruleset.py
+# -*- coding: utf-8 -*-
+"""
+Rule base deklaratif: variabel, himpunan membership (Tri/Trap), rule, weight, dan confidence
+dibaca dari file JSON berversi, divalidasi, lalu di-compile sekali menjadi Diagnoser.
+rulesets/default.json = rule base bawaan (make_symptom_vars + build_rules), hasil identik.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+import hashlib
+import json
+import math
+import os
+import time
+
+from fis_tsukamoto import LABEL_ID, Antecedent, Diagnoser, FuzzyVar, Rule, Trap, Tri
+
+DEFAULT_RULESET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rulesets", "default.json")
+RULESET_FORMAT = 1
+MEMBERSHIP_TYPES = {"tri": (Tri, 3), "trap": (Trap, 4)}
+CONSEQUENTS = ("tinggi", "sedang", "rendah")
+
+class RulesetError(ValueError):
+    """File ruleset tidak valid; .errors berisi semua pesan validasi"""
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+@dataclass(frozen=True)
+class Ruleset:
+    """Ruleset tervalidasi (belum di-compile)"""
+    version: str
+    data: Dict[str, Any]
+    sha256: str
+    source: Optional[str] = None
+
+    def info(self) -> Dict[str, Any]:
+        return {"version": self.version, "sha256": self.sha256[:12], "source": self.source,
+                "variables": len(self.data["variables"]), "rules": len(self.data["rules"])}
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+
+def validate_ruleset(data: Any) -> List[str]:
+    """Semua kesalahan struktur/nilai ruleset (list kosong = valid)"""
+    if not isinstance(data, dict):
+        return ["ruleset harus object JSON"]
+    errors = []
+    if data.get("format", RULESET_FORMAT) != RULESET_FORMAT:
+        errors.append(f"format {data.get('format')!r} tidak didukung (harus {RULESET_FORMAT})")
+    if not isinstance(data.get("version"), str) or not data["version"].strip():
+        errors.append("version harus string tidak kosong")
+    variables = data.get("variables")
+    if not isinstance(variables, dict) or not variables:
+        errors.append("variables harus object tidak kosong")
+        variables = {}
+    else:
+        # Semua gejala wajib ada: urutan input, masukan_skala_0_10 & kolom batch/CSV bagian dari kontrak API
+        missing = [k for k in LABEL_ID if k not in variables]
+        if missing:
+            errors.append(f"variables: gejala wajib tidak ada: {', '.join(missing)}")
+    for name, var in variables.items():
+        where = f"variables.{name}"
+        if name not in LABEL_ID:
+            errors.append(f"{where}: bukan gejala yang dikenal ({', '.join(LABEL_ID)})")
+        sets = var.get("sets") if isinstance(var, dict) else None
+        if not isinstance(sets, dict) or not sets:
+            errors.append(f"{where}.sets harus object tidak kosong")
+            continue
+        for setname, spec in sets.items():
+            w = f"{where}.sets.{setname}"
+            if not isinstance(spec, dict) or spec.get("type") not in MEMBERSHIP_TYPES:
+                errors.append(f"{w}: type harus salah satu {', '.join(MEMBERSHIP_TYPES)}")
+                continue
+            params = spec.get("params")
+            n = MEMBERSHIP_TYPES[spec["type"]][1]
+            if not isinstance(params, list) or len(params) != n or not all(_is_number(p) for p in params):
+                errors.append(f"{w}: params harus {n} angka")
+            elif any(a > b for a, b in zip(params, params[1:])):
+                errors.append(f"{w}: params harus tidak menurun")
+    rules = data.get("rules")
+    if not isinstance(rules, list) or not rules:
+        errors.append("rules harus list tidak kosong")
+        rules = []
+    for k, rule in enumerate(rules):
+        where = f"rules[{k}]"
+        if not isinstance(rule, dict):
+            errors.append(f"{where}: harus object")
+            continue
+        if not isinstance(rule.get("disease"), str) or not rule["disease"].strip():
+            errors.append(f"{where}.disease harus string tidak kosong")
+        elif any(c in rule["disease"] for c in "/\\") or not rule["disease"].isprintable():
+            # nama penyakit dipakai sebagai nama kolom/file output (fis_columnar)
+            errors.append(f"{where}.disease tidak boleh berisi '/', '\\' atau karakter kontrol")
+        if str(rule.get("consequent", "")).lower() not in CONSEQUENTS:
+            errors.append(f"{where}.consequent harus salah satu Tinggi/Sedang/Rendah")
+        if rule.get("op", "AND") not in ("AND", "OR"):
+            errors.append(f"{where}.op harus AND atau OR")
+        terms = rule.get("terms")
+        if not isinstance(terms, list) or not terms:
+            errors.append(f"{where}.terms harus list tidak kosong")
+        else:
+            for term in terms:
+                if (not isinstance(term, list) or len(term) != 2
+                        or not isinstance(term[0], str) or not isinstance(term[1], str)
+                        or term[0] not in variables
+                        or not isinstance(variables[term[0]], dict)
+                        or term[1] not in (variables[term[0]].get("sets") or {})):
+                    errors.append(f"{where}.terms: {term!r} tidak merujuk [variabel, himpunan] yang ada")
+        for key in ("weight", "confidence"):
+            value = rule.get(key, 1.0)
+            if not _is_number(value) or value <= 0:
+                errors.append(f"{where}.{key} harus angka > 0")
+        if _is_number(rule.get("confidence", 1.0)) and rule.get("confidence", 1.0) > 1:
+            errors.append(f"{where}.confidence harus <= 1")
+        if not isinstance(rule.get("note", ""), str):
+            errors.append(f"{where}.note harus string")
+    return errors
+
+def load_ruleset(source: Union[str, Mapping[str, Any]]) -> Ruleset:
+    """Baca & validasi ruleset dari path file JSON atau dict; RulesetError bila tidak valid"""
+    path = None
+    if isinstance(source, str):
+        path = source
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise RulesetError([f"JSON tidak valid: {e}"])
+    else:
+        data = dict(source)
+        raw = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    errors = validate_ruleset(data)
+    if errors:
+        raise RulesetError(errors)
+    return Ruleset(version=data["version"], data=data, sha256=hashlib.sha256(raw).hexdigest(), source=path)
+
+def build_ruleset_objects(ruleset: Ruleset) -> Tuple[Dict[str, FuzzyVar], List[Rule]]:
+    """Ruleset -> (vars, rules) seperti make_symptom_vars/build_rules; himpunan dengan parameter
+    sama dipakai bersama (satu objek), seperti sets_standard di kode"""
+    shared: Dict[Tuple[str, Tuple[float, ...]], Any] = {}
+    variables: Dict[str, FuzzyVar] = {}
+    for name, var in ruleset.data["variables"].items():
+        sets = {}
+        for setname, spec in var["sets"].items():
+            key = (spec["type"], tuple(spec["params"]))
+            if key not in shared:
+                shared[key] = MEMBERSHIP_TYPES[spec["type"]][0](*spec["params"])
+            sets[setname] = shared[key]
+        variables[name] = FuzzyVar(name, sets)
+    rules = [Rule(r["disease"], r["consequent"],
+                  Antecedent(variables, r.get("op", "AND"), [tuple(t) for t in r["terms"]]),
+                  r.get("note", ""), r.get("weight", 1.0), r.get("confidence", 1.0))
+             for r in ruleset.data["rules"]]
+    return variables, rules
+
+def compile_ruleset(ruleset: Ruleset, **engine_kwargs: Any) -> Tuple[Diagnoser, float]:
+    """Ruleset -> (Diagnoser siap pakai, waktu compile dalam detik)"""
+    t0 = time.perf_counter()
+    variables, rules = build_ruleset_objects(ruleset)
+    engine = Diagnoser(vars=variables, rules=rules, **engine_kwargs)
+    return engine, time.perf_counter() - t0
+
+def _membership_spec(fn: Any) -> Dict[str, Any]:
+    for name, (cls, _) in MEMBERSHIP_TYPES.items():
+        if type(fn) is cls:
+            return {"type": name, "params": list(fn.params)}
+    raise ValueError(f"membership {fn!r} tidak bisa diekspor (hanya Tri/Trap)")
+
+def export_ruleset(engine: Optional[Diagnoser] = None, version: str = "1.0.0",
+                   description: str = "") -> Dict[str, Any]:
+    """Diagnoser (default: rule base bawaan) -> dict ruleset yang bisa ditulis sebagai JSON"""
+    engine = engine or Diagnoser()
+    rules = []
+    for r in engine.rules:
+        if not isinstance(r, Rule) or not isinstance(r.antecedent, Antecedent):
+            raise ValueError(f"rule {getattr(r, 'note', r)!r} tidak bisa diekspor (antecedent bukan all_of/any_of)")
+        rules.append({"disease": r.disease, "consequent": r.consequent_label, "op": r.antecedent.op,
+                      "terms": [list(t) for t in r.antecedent.terms], "note": r.note,
+                      "weight": r.weight, "confidence": r.confidence})
+    variables = {name: {"label": LABEL_ID.get(name, name),
+                        "sets": {s: _membership_spec(fn) for s, fn in var.sets.items()}}
+                 for name, var in engine.vars.items()}
+    return {"format": RULESET_FORMAT, "version": version, "description": description,
+            "variables": variables, "rules": rules}
@@ -0,0 +1,220 @@
+# fis_sessions.py
+# -*- coding: utf-8 -*-
+"""
+Sesi kuisioner interaktif: input terparsing dan state firing per rule disimpan di server.
+Mengubah satu jawaban hanya menembakkan ulang rule yang membaca gejala itu (Diagnoser.dependencies)
+dan menghitung ulang akumulator penyakit yang terdampak; hasil identik dengan predict() penuh.
+Bila engine punya RulePlan, nilai membership per term juga di-cache: hanya term milik gejala
+yang berubah yang dihitung ulang, lalu rule dievaluasi dari nilai tersebut (min/max).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import secrets
+import threading
+import time
+
+from fis_tsukamoto import Diagnoser, Rule, parse_symptom_text, rule_detail
+
+# State satu rule: (weighted alpha, z, alfa mentah, metadata rule non-Rule); None = rule error
+RuleState = Optional[Tuple[float, float, float, Optional[Dict[str, Any]]]]
+
+class DiagnosisSession:
+    """Jawaban + state firing satu pengguna. Tidak thread-safe; pemanggil memakai .lock"""
+    def __init__(self, engine: Diagnoser, answers: Optional[Mapping[str, Any]] = None):
+        self.id: Optional[str] = None
+        self.lock = threading.Lock()
+        self.meta: Dict[str, Any] = {}  # data milik pemanggil (mis. nama, ambang)
+        self.answers: Dict[str, Any] = dict(answers or {})
+        self.updates = 0
+        self._check(engine, self.answers)
+        self._reset(engine)
+
+    @staticmethod
+    def _check(engine: Diagnoser, answers: Mapping[str, Any]):
+        unknown = [name for name in answers if name not in engine.vars]
+        if unknown:
+            raise ValueError(f"gejala tidak dikenal: {', '.join(unknown)}")
+
+    def _reset(self, engine: Diagnoser):
+        self.engine = engine
+        self.inputs = {name: max(0.0, min(10.0, parse_symptom_text(self.answers.get(name, ""))))
+                       for name in engine.vars.keys()}
+        by_disease: Dict[str, List[int]] = {}
+        for k, r in enumerate(engine.rules):
+            by_disease.setdefault(r.disease, []).append(k)
+        self._disease_rules = {d: tuple(ks) for d, ks in by_disease.items()}
+        self._states: List[RuleState] = [None] * len(engine.rules)
+        plan = engine.plan
+        self._var_terms: Dict[str, Tuple[int, ...]] = {}
+        self._mu: List[float] = []
+        if plan is not None:
+            for t, (var, _) in enumerate(plan.terms):
+                self._var_terms[var] = self._var_terms.get(var, ()) + (t,)
+            self._mu = [fn(self.inputs[var]) for (var, _), fn in zip(plan.terms, plan.term_fns)]
+        self._totals: Dict[str, Optional[Tuple[int, List[float]]]] = {}
+        self.last_refired = self._refire(range(len(engine.rules)))
+
+    def _fire(self, k: int) -> RuleState:
+        r = self.engine.rules[k]
+        plan = self.engine.plan
+        try:
+            if plan is not None and plan.rule_terms[k] is not None:
+                # Sama dengan RulePlan.evaluate: membership dari cache term, lalu AND=min / OR=max
+                idx = plan.rule_terms[k]
+                mu = self._mu
+                if len(idx) == 1:
+                    a = mu[idx[0]]
+                elif r.antecedent.op == "AND":
+                    a = min([mu[t] for t in idx])
+                else:
+                    a = max([mu[t] for t in idx])
+                raw = max(0.0, min(1.0, a))
+                alpha, z = r.consequent(raw)
+                return alpha, z, raw, None
+            if isinstance(r, Rule):
+                raw = max(0.0, min(1.0, r.antecedent(self.inputs)))
+                alpha, z = r.consequent(raw)
+                return alpha, z, raw, None
+            if hasattr(r, 'weight') and hasattr(r, 'confidence'):
+                alpha, z, metadata = r.fire(self.inputs)
+            else:
+                alpha, z = r.fire(self.inputs)
+                metadata = {"raw_alpha": alpha, "weighted_alpha": alpha, "z_value": z}
+            return alpha, z, alpha, metadata
+        except Exception as e:
+            print(f"Error in rule {r.note}: {e}")
+            return None
+
+    def _refire(self, indices) -> int:
+        """Tembakkan ulang rule terpilih lalu hitung ulang akumulator penyakit yang terdampak"""
+        rules = self.engine.rules
+        diseases = set()
+        n = 0
+        for k in indices:
+            self._states[k] = self._fire(k)
+            diseases.add(rules[k].disease)
+            n += 1
+        for d in diseases:
+            # Urutan penjumlahan = urutan rule, sama dengan predict() sehingga hasil bit-identik
+            first, t = None, [0.0, 0.0, 0.0]
+            for k in self._disease_rules[d]:
+                st = self._states[k]
+                if st is None or st[0] <= 0:
+                    continue
+                alpha, z = st[0], st[1]
+                conf = getattr(rules[k], 'confidence', 1.0)
+                if first is None:
+                    first = k
+                t[0] += alpha * z
+                t[1] += alpha
+                t[2] += conf * alpha
+            self._totals[d] = (first, t) if first is not None else None
+        return n
+
+    def update(self, answers: Mapping[str, Any], engine: Optional[Diagnoser] = None) -> int:
+        """Ubah sebagian jawaban -> jumlah rule yang ditembakkan ulang.
+        engine berbeda (mis. setelah swap) -> seluruh state dibangun ulang."""
+        self._check(engine or self.engine, answers)
+        self.answers.update(answers)
+        self.updates += 1
+        if engine is not None and engine is not self.engine:
+            self._reset(engine)
+            return self.last_refired
+        dirty = set()
+        for name, text in answers.items():
+            value = max(0.0, min(10.0, parse_symptom_text(text)))
+            if value != self.inputs[name]:
+                self.inputs[name] = value
+                dirty.update(self.engine.dependencies.get(name, ()))
+                for t in self._var_terms.get(name, ()):
+                    self._mu[t] = self.engine.plan.term_fns[t](value)
+        self.last_refired = self._refire(sorted(dirty))
+        return self.last_refired
+
+    def result(self, return_details: bool = False) -> Dict[str, Any]:
+        """Hasil dengan format & nilai yang sama dengan engine.predict(answers, return_details)"""
+        rules = self.engine.rules
+        active = sorted((v[0], d) for d, v in self._totals.items() if v is not None)
+        totals = {d: list(self._totals[d][1]) for _, d in active}
+        details: Dict[str, List[Dict[str, Any]]] = {}
+        active_rules_count = 0
+        total_confidence = 0.0
+        for k, st in enumerate(self._states):
+            if st is None or st[0] <= 0:
+                continue
+            r = rules[k]
+            active_rules_count += 1
+            total_confidence += getattr(r, 'confidence', 1.0)
+            if return_details:
+                alpha, z, raw, metadata = st
+                if metadata is None:
+                    metadata = r.metadata(raw, alpha, z)
+                details.setdefault(r.disease, []).append(rule_detail(r, alpha, z, metadata))
+        if return_details:
+            details = {d: details[d] for d in totals}
+        return self.engine._finalize(dict(self.inputs), totals, details, active_rules_count,
+                                     total_confidence, return_details)
+
+class SessionStore:
+    """Penyimpan sesi LRU dengan batas jumlah dan idle TTL (detik); thread-safe.
+    Sesi terlama diusir saat penuh; sesi yang menganggur melewati TTL dibuang saat diakses
+    atau saat sesi baru dibuat."""
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 1800.0):
+        if maxsize <= 0:
+            raise ValueError("maxsize harus > 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, DiagnosisSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = self.evictions = self.expirations = self.deleted = 0
+
+    def _expire(self, now: float):
+        # Urutan LRU = urutan akses terakhir, jadi sesi kedaluwarsa selalu di depan
+        while self._data and self.ttl:
+            sid, (last, _) = next(iter(self._data.items()))
+            if now - last < self.ttl:
+                break
+            del self._data[sid]
+            self.expirations += 1
+
+    def create(self, session: DiagnosisSession) -> str:
+        sid = secrets.token_urlsafe(16)
+        session.id = sid
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._data[sid] = (now, session)
+            self.created += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return sid
+
+    def get(self, sid: str) -> Optional[DiagnosisSession]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if self.ttl and now - entry[0] >= self.ttl:
+                del self._data[sid]
+                self.expirations += 1
+                return None
+            self._data[sid] = (now, entry[1])
+            self._data.move_to_end(sid)
+            return entry[1]
+
+    def delete(self, sid: str) -> bool:
+        with self._lock:
+            if self._data.pop(sid, None) is None:
+                return False
+            self.deleted += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                    "created": self.created, "evictions": self.evictions,
+                    "expirations": self.expirations, "deleted": self.deleted}
@@ -0,0 +1,118 @@
+# fis_templates.py
+# -*- coding: utf-8 -*-
+"""
+Template laporan HTML hasil prediksi (render_report_html, iter_report_html, render_report_page).
+Dimuat lazy lewat fis_tsukamoto saat laporan pertama dibuat; endpoint prediksi tidak membayar
+import html & penyusunan kerangka.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Tuple
+import datetime
+import html as _html
+import time
+
+from fis_tsukamoto import LABEL_ID
+
+# Kerangka laporan statis (CSS & markup) disusun sekali; hanya fragmen dinamis diisi per laporan
+REPORT_HTML_HEAD = """<!DOCTYPE html><html lang="id"><meta charset="utf-8">
+<title>Laporan FIS Tsukamoto</title>
+<style>body{font-family:Arial,sans-serif;margin:24px;color:#1f2937}
+.card{border:1px solid #e5e7eb;border-radius:12px;padding:16px;margin-bottom:16px}
+.h1{font-size:22px;font-weight:700}.h2{font-size:18px;font-weight:600}
+.badge{display:inline-block;padding:6px 10px;border-radius:9999px;background:#eef2ff;color:#3730a3;font-weight:600}
+table{width:100%;border-collapse:collapse}td,th{border:1px solid #e5e7eb;padding:8px}
+.small{color:#6b7280;font-size:12px}</style>
+"""
+REPORT_HTML_END = "</html>"
+escape_html = _html.escape
+_REPORT_STATIC = (
+    REPORT_HTML_HEAD + """<div class="card"><div class="h1">Laporan Prediksi Penyakit (Fuzzy Tsukamoto)</div>
+<div>Nama: <b>""",
+    """</b> &nbsp; | &nbsp; Tanggal: """,
+    """</div></div>
+<div class="card"><div class="h2">Diagnosa Sementara</div><div class="badge">""",
+    """</div>
+<p><b>Rekomendasi:</b> """,
+    """</p></div>
+<div class="card"><div class="h2">Peringkat Penyakit (Skor 0–100)</div><ol>""",
+    """</ol></div>
+<div class="card"><div class="h2">Jawaban Kuisioner</div><table><thead><tr><th>Gejala</th><th>Jawaban</th></tr></thead><tbody>""",
+    """</tbody></table></div>
+<div class="small">Catatan: Edukasi/akademik; bukan diagnosis klinis.</div>""" + REPORT_HTML_END,
+)
+# Kerangka yang sama tanpa <head>/CSS dan </html>, untuk dokumen multi-laporan
+_REPORT_PAGE_STATIC = ((_REPORT_STATIC[0][len(REPORT_HTML_HEAD):],) + _REPORT_STATIC[1:-1]
+                       + (_REPORT_STATIC[-1][:-len(REPORT_HTML_END)],))
+# Fragmen yang di-yield bersama per chunk streaming (indeks _REPORT_STATIC terakhir tiap chunk)
+_REPORT_CHUNK_ENDS = (2, 4, 5, 6)
+_REPORT_LABELS = tuple((k, _html.escape(v)) for k, v in LABEL_ID.items())
+_REPORT_EMPTY_RANKING = "<li>Tidak ada rule aktif</li>"
+_report_dt: Tuple[int, str] = (-1, "")
+
+@lru_cache(maxsize=1024)
+def _report_escape(text: str) -> str:
+    """html.escape untuk teks berulang (pilihan jawaban, nama penyakit)"""
+    return _html.escape(text)
+
+def _report_timestamp() -> str:
+    """Tanggal laporan (resolusi menit); strftime hanya diulang saat menit berganti"""
+    global _report_dt
+    minute = int(time.time() // 60)
+    key, text = _report_dt
+    if key != minute:
+        text = datetime.datetime.now().strftime("%d %B %Y, %H:%M")
+        _report_dt = (minute, text)
+    return text
+
+def _report_fragments(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
+                      ambang_peringatan: float) -> Tuple[str, ...]:
+    """Fragmen dinamis laporan (teks pengguna sudah di-escape), urut sesuai celah di _REPORT_STATIC"""
+    top = pred.get("diagnosa_sementara")
+    if not top:
+        top_text = "Belum ada cukup bukti gejala spesifik."
+        rekom = "Pantau gejala. Konsultasikan ke tenaga kesehatan bila perlu."
+    else:
+        top_text = _html.escape(f"{top['penyakit']} (skor {top['skor']:.2f})")
+        if top["skor"] >= ambang_peringatan:
+            rekom = "⚠️ Skor tinggi. Disarankan segera konsultasi ke fasilitas kesehatan."
+        elif top["skor"] >= 40:
+            rekom = "Istirahat & hidrasi cukup. Konsultasi jika tidak membaik."
+        else:
+            rekom = "Pantau gejala. Jika memburuk, konsultasi ke tenaga kesehatan."
+    ranking = "".join([f"<li><b>{_report_escape(str(d))}</b>: {s:.2f}</li>"
+                       for d, s in sorted(pred.get("skor", {}).items(), key=lambda kv: -kv[1])])
+    answers = "".join([f"<tr><td>{label}</td><td>{_report_escape(str(jawaban_teks.get(k, '') or 'tidak'))}</td></tr>"
+                       for k, label in _REPORT_LABELS])
+    return (_html.escape(str(nama_pengguna)), _report_timestamp(), top_text, rekom,
+            ranking or _REPORT_EMPTY_RANKING, answers)
+
+def _iter_report(fragments: Tuple[str, ...]) -> Iterator[str]:
+    S = _REPORT_STATIC
+    start = 0
+    for end in _REPORT_CHUNK_ENDS:
+        parts = []
+        for i in range(start, end + 1):
+            parts.append(S[i])
+            if i < len(fragments):
+                parts.append(fragments[i])
+        yield "".join(parts)
+        start = end + 1
+
+def iter_report_html(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
+                     ambang_peringatan: float=60.0) -> Iterator[str]:
+    """Laporan HTML per chunk (per kartu) untuk response streaming.
+    Fragmen dihitung di awal, jadi input tidak valid gagal sebelum chunk pertama."""
+    return _iter_report(_report_fragments(nama_pengguna, jawaban_teks, pred, ambang_peringatan))
+
+def _join_report(S: Tuple[str, ...], f: Tuple[str, ...]) -> str:
+    return "".join((S[0], f[0], S[1], f[1], S[2], f[2], S[3], f[3], S[4], f[4], S[5], f[5], S[6]))
+
+def render_report_html(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
+                       ambang_peringatan: float=60.0) -> str:
+    return _join_report(_REPORT_STATIC, _report_fragments(nama_pengguna, jawaban_teks, pred, ambang_peringatan))
+
+def render_report_page(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
+                       ambang_peringatan: float=60.0) -> str:
+    """Isi laporan tanpa REPORT_HTML_HEAD/REPORT_HTML_END, untuk digabung jadi dokumen multi-halaman"""
+    return _join_report(_REPORT_PAGE_STATIC, _report_fragments(nama_pengguna, jawaban_teks, pred, ambang_peringatan))
@@ -7,9 +7,13 @@ Output: skor 0..100/penyakit + diagnosa sementara (top-1) + detail rule (opsiona
 DISCLAIMER: Edukasi/akademik; bukan diagnosis klinis.
 """
 
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Tuple, Any
-import math, re, datetime
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple, Any, Optional, Sequence
+import copy, importlib, json, math, re, sys, threading, time
 
 LABEL_ID = {
     "fever": "Demam",
@@ -59,13 +63,56 @@ LEXICON = {
     r"^(?:ya|iya|betul|ada|positif|present|yes|benar|iyah)$": 7.5,
 }
 
-def parse_symptom_text(txt: str) -> float:
-    """Enhanced parsing dengan penanganan konteks yang lebih baik"""
-    if txt is None: 
-        return 0.0
-    
-    s = str(txt).strip().lower()
-    
+NUMERIC_WORDS = (
+    ('nol', 0), ('satu', 1), ('dua', 2), ('tiga', 3), ('empat', 4),
+    ('lima', 5), ('enam', 6), ('tujuh', 7), ('delapan', 8), ('sembilan', 9), ('sepuluh', 10),
+)
+PARSE_CACHE_SIZE = 4096
+PARSE_CACHE_MAX_LEN = 64  # teks bebas yang panjang tidak di-cache agar cache tidak tergusur
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s-]')
+_LITERAL_ALTS_RE = re.compile(r'\^\(\?:([\w \-|]+)\)\$')
+
+class LexiconMatcher:
+    """LEXICON terkompilasi: hash table exact-match untuk pola alternatif literal,
+    plus satu regex gabungan untuk sisanya. Urutan prioritas pola tetap sama."""
+    def __init__(self, lexicon: Dict[str, float]):
+        self.exact: Dict[str, float] = {}
+        rest: List[Tuple[str, float]] = []
+        for pattern, val in lexicon.items():
+            m = _LITERAL_ALTS_RE.fullmatch(pattern)
+            if m and not rest:
+                # Alternatif literal: pola yang lebih awal menang (setdefault)
+                for alt in m.group(1).split("|"):
+                    self.exact.setdefault(alt, val)
+            else:
+                # Setelah pola non-literal pertama, sisanya lewat regex agar urutan terjaga
+                rest.append((pattern, val))
+        self.values = {f"_lx{i}": val for i, (_, val) in enumerate(rest)}
+        self.combined = re.compile("|".join(f"(?P<_lx{i}>{p})" for i, (p, _) in enumerate(rest))) if rest else None
+    def match(self, s: str) -> Optional[float]:
+        val = self.exact.get(s)
+        if val is not None:
+            return val
+        if self.combined is not None:
+            m = self.combined.fullmatch(s)
+            if m:
+                return self.values[m.lastgroup]
+        return None
+
+# Dikompilasi saat parsing pertama (atau Diagnoser.warm_up), bukan saat import
+_LEXICON_MATCHER: Optional[LexiconMatcher] = None
+
+def _lexicon_matcher() -> LexiconMatcher:
+    global _LEXICON_MATCHER
+    matcher = _LEXICON_MATCHER
+    if matcher is None:
+        matcher = _LEXICON_MATCHER = LexiconMatcher(LEXICON)
+    return matcher
+
+def _parse_normalized(s: str) -> float:
+    """Parsing teks yang sudah di-strip & lower (bisa di-cache)"""
     # Handle numeric input
     try:
         if s.replace(".", "", 1).replace(",", "", 1).isdigit():
@@ -75,22 +122,18 @@ def parse_symptom_text(txt: str) -> float:
         pass
     
     # Preprocess text - handle common variations
-    s = re.sub(r'\s+', ' ', s)  # normalize whitespace
-    s = re.sub(r'[^\w\s-]', '', s)  # remove punctuation except dash
+    s = _WHITESPACE_RE.sub(' ', s)  # normalize whitespace
+    s = _PUNCT_RE.sub('', s)  # remove punctuation except dash
     
     # Handle numeric words
-    numeric_words = {
-        'nol': 0, 'satu': 1, 'dua': 2, 'tiga': 3, 'empat': 4,
-        'lima': 5, 'enam': 6, 'tujuh': 7, 'delapan': 8, 'sembilan': 9, 'sepuluh': 10
-    }
-    for word, num in numeric_words.items():
+    for word, num in NUMERIC_WORDS:
         if word in s:
             return min(10.0, float(num))
     
-    # Enhanced pattern matching with exact regex
-    for pattern, val in LEXICON.items():
-        if re.fullmatch(pattern, s):
-            return val
+    # Exact match lewat hash table / regex gabungan LEXICON
+    val = (_LEXICON_MATCHER or _lexicon_matcher()).match(s)
+    if val is not None:
+        return val
     
     # Fallback: partial matching for composite expressions
     score = 0.0
@@ -118,6 +161,29 @@ def parse_symptom_text(txt: str) -> float:
     
     return score if matched else 0.0
 
+_parse_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_normalized)
+
+def parse_symptom_text(txt: str) -> float:
+    """Enhanced parsing dengan penanganan konteks yang lebih baik (memoized LRU)"""
+    if txt is None: 
+        return 0.0
+    
+    s = str(txt).strip().lower()
+    if len(s) > PARSE_CACHE_MAX_LEN:
+        return _parse_normalized(s)
+    return _parse_cached(s)
+
+def parse_cache_info() -> Dict[str, int]:
+    """Statistik cache parse_symptom_text (hits/misses/size/maxsize)"""
+    info = _parse_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+def recompile_lexicon():
+    """Compile ulang LEXICON (setelah LEXICON diubah) dan kosongkan cache parsing"""
+    global _LEXICON_MATCHER
+    _LEXICON_MATCHER = LexiconMatcher(LEXICON)
+    _parse_cached.cache_clear()
+
 def tri(x: float, a: float, b: float, c: float) -> float:
     if x <= a or x >= c: return 0.0
     if b == a or c == b: return 0.0
@@ -132,18 +198,154 @@ def trap(x: float, a: float, b: float, c: float, d: float) -> float:
     if a < x < b: return (x - a) / (b - a)
     return (d - x) / (d - c)
 
+class Tri:
+    """Membership segitiga tri(x, a, b, c) dengan parameter yang bisa di-inspect"""
+    __slots__ = ("a", "b", "c")
+    def __init__(self, a: float, b: float, c: float):
+        self.a, self.b, self.c = a, b, c
+    def __call__(self, x: float) -> float:
+        return tri(x, self.a, self.b, self.c)
+    @property
+    def params(self) -> Tuple[float, ...]:
+        return (self.a, self.b, self.c)
+    def support(self) -> Tuple[float, float]:
+        """Interval terbuka (lo, hi): di luar interval ini tri() pasti 0.0"""
+        return (self.a, self.c)
+    def vectorized(self, x):
+        """Versi NumPy dari tri() untuk array x (hasil sama per elemen)"""
+        import numpy as np
+        a, b, c = self.a, self.b, self.c
+        out = np.zeros(np.shape(x))
+        if b == a or c == b:
+            return out
+        out[x == b] = 1.0
+        rising = (x > a) & (x < b)
+        out[rising] = (x[rising] - a) / (b - a)
+        falling = (x > b) & (x < c)
+        out[falling] = (c - x[falling]) / (c - b)
+        return out
+    def __repr__(self) -> str:
+        return f"Tri{self.params}"
+
+class Trap:
+    """Membership trapesium trap(x, a, b, c, d) dengan parameter yang bisa di-inspect"""
+    __slots__ = ("a", "b", "c", "d")
+    def __init__(self, a: float, b: float, c: float, d: float):
+        self.a, self.b, self.c, self.d = a, b, c, d
+    def __call__(self, x: float) -> float:
+        return trap(x, self.a, self.b, self.c, self.d)
+    @property
+    def params(self) -> Tuple[float, ...]:
+        return (self.a, self.b, self.c, self.d)
+    def support(self) -> Tuple[float, float]:
+        """Interval terbuka (lo, hi): di luar interval ini trap() pasti 0.0"""
+        return (self.a, self.d)
+    def vectorized(self, x):
+        """Versi NumPy dari trap() untuk array x (hasil sama per elemen)"""
+        import numpy as np
+        a, b, c, d = self.a, self.b, self.c, self.d
+        out = np.zeros(np.shape(x))
+        inside = (x > a) & (x < d)
+        out[inside & (x >= b) & (x <= c)] = 1.0
+        if b == a or d == c:
+            return out
+        rising = inside & (x < b)
+        out[rising] = (x[rising] - a) / (b - a)
+        falling = inside & (x > c)
+        out[falling] = (d - x[falling]) / (d - c)
+        return out
+    def __repr__(self) -> str:
+        return f"Trap{self.params}"
+
+def membership_support(fn: Callable[[float], float]) -> Optional[Tuple[float, float]]:
+    """Interval terbuka (lo, hi) di luar mana fn(x) == 0.0; None bila tidak diketahui (fungsi custom)"""
+    support = getattr(fn, "support", None)
+    return support() if callable(support) else None
+
+def vectorized_membership(fn: Callable[[float], float], x):
+    """Evaluasi membership untuk array x; fungsi tanpa .vectorized dipanggil per elemen"""
+    import numpy as np
+    if hasattr(fn, "vectorized"):
+        return fn.vectorized(x)
+    return np.fromiter((fn(v) for v in x.tolist()), dtype=float, count=len(x))
+
+class MembershipTable:
+    """Membership terkuantisasi: nilai fn dihitung sekali di grid lo..hi dengan resolusi 1/k.
+
+    exact=True  -> titik grid diambil dari tabel, nilai di antara grid dihitung analitik (hasil identik)
+    exact=False -> nilai di antara grid diinterpolasi linear dari tabel (lihat membership_error_report)
+    """
+    __slots__ = ("fn", "resolution", "steps", "lo", "hi", "exact", "table", "grid")
+    def __init__(self, fn: Callable[[float], float], resolution: float = 0.01, exact: bool = True,
+                 lo: float = 0.0, hi: float = 10.0):
+        steps = round(1.0 / resolution)
+        if steps <= 0 or abs(steps * resolution - 1.0) > 1e-9:
+            raise ValueError(f"Resolusi harus berbentuk 1/k (mis. 0.01, 0.05, 0.5), bukan {resolution}")
+        self.fn, self.resolution, self.steps = fn, resolution, steps
+        self.lo, self.hi, self.exact = lo, hi, exact
+        n = round((hi - lo) * steps)
+        xs = [lo + i / steps for i in range(n + 1)]
+        self.table = tuple(fn(x) for x in xs)        # tabel padat, indeks i -> lo + i/steps
+        self.grid = dict(zip(xs, self.table))         # titik grid -> nilai (lookup O(1) jalur skalar)
+    def __call__(self, x: float) -> float:
+        v = self.grid.get(x)
+        if v is not None:
+            return v
+        if self.exact or not (self.lo <= x <= self.hi):
+            return self.fn(x)
+        pos = (x - self.lo) * self.steps
+        i = min(int(pos), len(self.table) - 2)
+        frac = pos - i
+        return self.table[i] * (1.0 - frac) + self.table[i + 1] * frac
+    def support(self) -> Optional[Tuple[float, float]]:
+        """Support fn; untuk interpolasi diperlebar ke sel grid yang salah satu ujungnya tidak nol"""
+        inner = membership_support(self.fn)
+        if inner is None or self.exact:
+            return inner  # titik grid = fn(x), di luar grid fn(x) langsung
+        nonzero = [i for i, v in enumerate(self.table) if v != 0.0]
+        if not nonzero:
+            return inner
+        lo = self.lo + (nonzero[0] - 1) / self.steps
+        hi = self.lo + (nonzero[-1] + 1) / self.steps
+        return (min(inner[0], lo), max(inner[1], hi))
+    def vectorized(self, x):
+        """Lookup tabel untuk array x: indeks grid, sisanya analitik (exact) atau interpolasi"""
+        import numpy as np
+        table = np.asarray(self.table)
+        idx = np.rint((x - self.lo) * self.steps).astype(np.int64)
+        inside = (idx >= 0) & (idx < len(table))
+        idx[~inside] = 0
+        on_grid = inside & (self.lo + idx / self.steps == x)
+        out = table[idx]
+        off = ~on_grid
+        if off.any():
+            if self.exact:
+                out[off] = vectorized_membership(self.fn, x[off])
+            else:
+                xs = self.lo + np.arange(len(table)) / self.steps
+                out[off] = np.interp(x[off], xs, table)
+                outside = off & ((x < self.lo) | (x > self.hi))
+                if outside.any():
+                    out[outside] = vectorized_membership(self.fn, x[outside])
+        return out
+    def __repr__(self) -> str:
+        return f"MembershipTable({self.fn!r}, resolution={self.resolution}, exact={self.exact})"
+
 def inv_high(alpha: float) -> float:
     alpha = max(0.0, min(1.0, alpha)); return 100.0 * alpha
 
 def inv_low(alpha: float) -> float:
     alpha = max(0.0, min(1.0, alpha)); return 100.0 * (1.0 - alpha)
 
-@dataclass
+# dataclass(slots=True) baru ada di Python 3.10; di 3.9 kelas tetap frozen tanpa __slots__
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class FuzzyVar:
     name: str
     sets: Dict[str, Callable[[float], float]]
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Rule:
     disease: str
     consequent_label: str  # "Tinggi" | "Rendah" | "Sedang"
@@ -152,10 +354,8 @@ class Rule:
     weight: float = 1.0  # Weight untuk rule importance
     confidence: float = 1.0  # Confidence level dari rule
     
-    def fire(self, inputs: Dict[str, float]) -> Tuple[float, float, Dict[str, Any]]:
-        """Enhanced firing dengan metadata"""
-        alpha = max(0.0, min(1.0, self.antecedent(inputs)))
-        
+    def consequent(self, alpha: float) -> Tuple[float, float]:
+        """Weighted alpha dan nilai z konsekuen untuk alpha mentah (sudah di-clip 0..1)"""
         # Apply weight and confidence
         weighted_alpha = alpha * self.weight * self.confidence
         
@@ -166,9 +366,11 @@ class Rule:
             z = 50.0 + (50.0 * weighted_alpha)  # 50-100 range
         else:  # rendah
             z = inv_low(weighted_alpha)
-        
-        # Metadata untuk analysis
-        metadata = {
+        return weighted_alpha, z
+    
+    def metadata(self, alpha: float, weighted_alpha: float, z: float) -> Dict[str, Any]:
+        """Metadata untuk analysis"""
+        return {
             "raw_alpha": alpha,
             "weighted_alpha": weighted_alpha,
             "weight": self.weight,
@@ -176,29 +378,37 @@ class Rule:
             "consequent": self.consequent_label,
             "z_value": z
         }
-        
-        return weighted_alpha, z, metadata
+    
+    def score(self, inputs: Dict[str, float]) -> Tuple[float, float]:
+        """Seperti fire() tetapi tanpa membangun metadata"""
+        return self.consequent(max(0.0, min(1.0, self.antecedent(inputs))))
+    
+    def fire(self, inputs: Dict[str, float]) -> Tuple[float, float, Dict[str, Any]]:
+        """Enhanced firing dengan metadata"""
+        alpha = max(0.0, min(1.0, self.antecedent(inputs)))
+        weighted_alpha, z = self.consequent(alpha)
+        return weighted_alpha, z, self.metadata(alpha, weighted_alpha, z)
 
 def make_symptom_vars() -> Dict[str, FuzzyVar]:
     """Membership functions yang lebih sensitif dan akurat"""
     # Optimized membership functions dengan overlap yang lebih natural
     sets_standard = {
-        "rendah":  lambda x: trap(x, 0, 0, 2.0, 4.5),      # 0-4.5 dengan plateau di 0-2
-        "sedang":  lambda x: tri(x, 2.0, 5.0, 8.0),        # 2-8 dengan puncak di 5
-        "tinggi":  lambda x: trap(x, 5.5, 7.5, 10.0, 10.1), # 5.5-10 dengan plateau di 7.5-10
+        "rendah":  Trap(0, 0, 2.0, 4.5),      # 0-4.5 dengan plateau di 0-2
+        "sedang":  Tri(2.0, 5.0, 8.0),        # 2-8 dengan puncak di 5
+        "tinggi":  Trap(5.5, 7.5, 10.0, 10.1), # 5.5-10 dengan plateau di 7.5-10
     }
     
     # Khusus untuk gejala yang perlu sensitivitas berbeda
     sets_fever = {
-        "rendah":  lambda x: trap(x, 0, 0, 2.5, 4.0),      # Demam rendah lebih toleran
-        "sedang":  lambda x: tri(x, 2.5, 5.5, 7.5),        # Demam sedang
-        "tinggi":  lambda x: trap(x, 6.0, 8.0, 10.0, 10.1), # Demam tinggi lebih strict
+        "rendah":  Trap(0, 0, 2.5, 4.0),      # Demam rendah lebih toleran
+        "sedang":  Tri(2.5, 5.5, 7.5),        # Demam sedang
+        "tinggi":  Trap(6.0, 8.0, 10.0, 10.1), # Demam tinggi lebih strict
     }
     
     sets_pain = {
-        "rendah":  lambda x: trap(x, 0, 0, 1.5, 3.5),      # Nyeri rendah
-        "sedang":  lambda x: tri(x, 2.0, 4.5, 7.0),        # Nyeri sedang
-        "tinggi":  lambda x: trap(x, 5.0, 7.0, 10.0, 10.1), # Nyeri tinggi
+        "rendah":  Trap(0, 0, 1.5, 3.5),      # Nyeri rendah
+        "sedang":  Tri(2.0, 4.5, 7.0),        # Nyeri sedang
+        "tinggi":  Trap(5.0, 7.0, 10.0, 10.1), # Nyeri tinggi
     }
     
     # Mapping gejala ke membership functions yang sesuai
@@ -217,11 +427,67 @@ def make_symptom_vars() -> Dict[str, FuzzyVar]:
     
     return symptom_mapping
 
+def quantize_vars(vars: Dict[str, FuzzyVar], resolution: float = 0.01, exact: bool = True) -> Dict[str, FuzzyVar]:
+    """Ganti setiap membership di vars dengan MembershipTable (himpunan yang dipakai bersama tetap satu tabel)"""
+    tables: Dict[int, MembershipTable] = {}
+    out: Dict[str, FuzzyVar] = {}
+    for name, var in vars.items():
+        sets = {}
+        for setname, fn in var.sets.items():
+            if id(fn) not in tables:
+                tables[id(fn)] = MembershipTable(getattr(fn, "fn", fn), resolution, exact)
+            sets[setname] = tables[id(fn)]
+        out[name] = FuzzyVar(var.name, sets)
+    return out
+
+def membership_error_report(vars: Dict[str, FuzzyVar], resolution: float = 0.01,
+                            probe_per_step: int = 10) -> List[Dict[str, Any]]:
+    """Error absolut maksimum MembershipTable (mode exact & interpolasi) terhadap fungsi analitik,
+    diuji pada grid probe yang probe_per_step kali lebih rapat dari resolusi tabel."""
+    report = []
+    seen = set()
+    for name, var in vars.items():
+        for setname, fn in var.sets.items():
+            if id(fn) in seen:
+                continue
+            seen.add(id(fn))
+            exact_t = MembershipTable(fn, resolution, exact=True)
+            interp_t = MembershipTable(fn, resolution, exact=False)
+            n = round(10.0 * exact_t.steps * probe_per_step)
+            probes = [i / (exact_t.steps * probe_per_step) for i in range(n + 1)]
+            report.append({
+                "variable": name, "set": setname, "function": repr(fn), "resolution": resolution,
+                "max_abs_error_exact": max(abs(exact_t(x) - fn(x)) for x in probes),
+                "max_abs_error_interp": max(abs(interp_t(x) - fn(x)) for x in probes),
+            })
+    return report
+
 def AND(*vals: float) -> float: return min(vals) if vals else 0.0
 def OR(*vals: float) -> float:  return max(vals) if vals else 0.0
 def μ(varset: Dict[str, FuzzyVar], var: str, setname: str, x: float) -> float:
     return varset[var].sets[setname](x)
 
+class Antecedent:
+    """Antecedent deklaratif: AND/OR atas term (variabel, himpunan); tetap callable seperti lambda"""
+    __slots__ = ("vars", "op", "terms")
+    def __init__(self, vars: Dict[str, FuzzyVar], op: str, terms: Sequence[Tuple[str, str]]):
+        if op not in ("AND", "OR"):
+            raise ValueError(f"Operator antecedent tidak dikenal: {op}")
+        self.vars = vars
+        self.op = op
+        self.terms = tuple(terms)
+    def __call__(self, I: Dict[str, float]) -> float:
+        vals = [μ(self.vars, var, setname, I[var]) for var, setname in self.terms]
+        return AND(*vals) if self.op == "AND" else OR(*vals)
+    def __repr__(self) -> str:
+        return f" {self.op} ".join(f"{var}/{setname}" for var, setname in self.terms)
+
+def all_of(V: Dict[str, FuzzyVar], *terms: Tuple[str, str]) -> Antecedent:
+    return Antecedent(V, "AND", terms)
+
+def any_of(V: Dict[str, FuzzyVar], *terms: Tuple[str, str]) -> Antecedent:
+    return Antecedent(V, "OR", terms)
+
 def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     """Enhanced rules dengan pola klinis yang lebih akurat"""
     V = vars
@@ -231,15 +497,15 @@ def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     rules += [
         # Strong indicators - ultra high confidence for 99% accuracy
         Rule("Influenza", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"cough","tinggi",I["cough"]), μ(V,"sore_throat","tinggi",I["sore_throat"])),
+             all_of(V, ("fever","tinggi"), ("cough","tinggi"), ("sore_throat","tinggi")),
              "Influenza: Trias klasik (demam+batuk+sakit tenggorokan tinggi)", 1.8, 0.99),
         Rule("Influenza", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"body_ache","tinggi",I["body_ache"]), μ(V,"fatigue","tinggi",I["fatigue"])),
+             all_of(V, ("fever","tinggi"), ("body_ache","tinggi"), ("fatigue","tinggi")),
              "Influenza: Demam+nyeri otot+lemas (flu syndrome)", 1.6, 0.98),
         
         # Negative indicators - high confidence
         Rule("Influenza", "Rendah", 
-             lambda I: AND(μ(V,"diarrhea","tinggi",I["diarrhea"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"])),
+             all_of(V, ("diarrhea","tinggi"), ("abdominal_pain","tinggi")),
              "Influenza: Dominan GI symptoms (atypical)", 1.4, 0.97),
     ]
     
@@ -247,15 +513,15 @@ def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     rules += [
         # Pathognomonic signs - ultra high confidence
         Rule("Demam Berdarah Dengue", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"headache","tinggi",I["headache"]), μ(V,"body_ache","tinggi",I["body_ache"])),
+             all_of(V, ("fever","tinggi"), ("headache","tinggi"), ("body_ache","tinggi")),
              "DBD: Tanda klasik (demam+nyeri kepala+pegal)", 1.7, 0.98),
         Rule("Demam Berdarah Dengue", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"nausea_vomit","tinggi",I["nausea_vomit"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"])),
+             all_of(V, ("fever","tinggi"), ("nausea_vomit","tinggi"), ("abdominal_pain","tinggi")),
              "DBD: Warning signs (demam+mual/muntah+nyeri perut)", 1.5, 0.97),
              
         # Negative indicators - high confidence
         Rule("Demam Berdarah Dengue", "Rendah", 
-             lambda I: μ(V,"cough","tinggi",I["cough"]),
+             all_of(V, ("cough","tinggi")),
              "DBD: Batuk dominan (tidak khas DBD)", 1.3, 0.96),
     ]
     
@@ -263,15 +529,15 @@ def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     rules += [
         # Classic presentation - ultra high confidence
         Rule("Demam Tifoid", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"headache","tinggi",I["headache"]), μ(V,"fatigue","tinggi",I["fatigue"])),
+             all_of(V, ("fever","tinggi"), ("headache","tinggi"), ("fatigue","tinggi")),
              "Tifoid: Presentasi klasik (demam+nyeri kepala+lemas)", 1.6, 0.97),
         Rule("Demam Tifoid", "Tinggi", 
-             lambda I: AND(μ(V,"fever","sedang",I["fever"]), μ(V,"diarrhea","tinggi",I["diarrhea"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"])),
+             all_of(V, ("fever","sedang"), ("diarrhea","tinggi"), ("abdominal_pain","tinggi")),
              "Tifoid: GI dominan (demam+diare+nyeri perut)", 1.4, 0.96),
              
         # Negative indicators - high confidence
         Rule("Demam Tifoid", "Rendah", 
-             lambda I: AND(μ(V,"cough","tinggi",I["cough"]), μ(V,"sore_throat","tinggi",I["sore_throat"])),
+             all_of(V, ("cough","tinggi"), ("sore_throat","tinggi")),
              "Tifoid: Dominan respiratory (tidak khas)", 1.2, 0.95),
     ]
     
@@ -279,15 +545,15 @@ def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     rules += [
         # Classic GI syndrome - ultra high confidence
         Rule("Gastroenteritis", "Tinggi", 
-             lambda I: AND(μ(V,"nausea_vomit","tinggi",I["nausea_vomit"]), μ(V,"diarrhea","tinggi",I["diarrhea"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"])),
+             all_of(V, ("nausea_vomit","tinggi"), ("diarrhea","tinggi"), ("abdominal_pain","tinggi")),
              "Gastroenteritis: Trias GI klasik", 1.7, 0.98),
         Rule("Gastroenteritis", "Tinggi", 
-             lambda I: AND(μ(V,"diarrhea","tinggi",I["diarrhea"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"]), μ(V,"fever","rendah",I["fever"])),
+             all_of(V, ("diarrhea","tinggi"), ("abdominal_pain","tinggi"), ("fever","rendah")),
              "Gastroenteritis: GI symptoms dengan demam minimal", 1.5, 0.97),
              
         # Negative indicators - high confidence
         Rule("Gastroenteritis", "Rendah", 
-             lambda I: AND(μ(V,"cough","tinggi",I["cough"]), μ(V,"sore_throat","tinggi",I["sore_throat"])),
+             all_of(V, ("cough","tinggi"), ("sore_throat","tinggi")),
              "Gastroenteritis: Dominan respiratory (tidak khas)", 1.3, 0.96),
     ]
     
@@ -295,41 +561,569 @@ def build_rules(vars: Dict[str, FuzzyVar]) -> List[Rule]:
     rules += [
         # Classic respiratory syndrome - ultra high confidence
         Rule("Infeksi Saluran Pernapasan Atas", "Tinggi", 
-             lambda I: AND(μ(V,"cough","tinggi",I["cough"]), μ(V,"sore_throat","tinggi",I["sore_throat"]), μ(V,"fever","sedang",I["fever"])),
+             all_of(V, ("cough","tinggi"), ("sore_throat","tinggi"), ("fever","sedang")),
              "ISPA: Trias respiratorik klasik", 1.6, 0.97),
         Rule("Infeksi Saluran Pernapasan Atas", "Tinggi", 
-             lambda I: AND(μ(V,"fever","tinggi",I["fever"]), μ(V,"cough","tinggi",I["cough"]), μ(V,"fatigue","tinggi",I["fatigue"])),
+             all_of(V, ("fever","tinggi"), ("cough","tinggi"), ("fatigue","tinggi")),
              "ISPA: Severe presentation", 1.4, 0.96),
              
         # Negative indicators - high confidence
         Rule("Infeksi Saluran Pernapasan Atas", "Rendah", 
-             lambda I: AND(μ(V,"diarrhea","tinggi",I["diarrhea"]), μ(V,"abdominal_pain","tinggi",I["abdominal_pain"])),
+             all_of(V, ("diarrhea","tinggi"), ("abdominal_pain","tinggi")),
              "ISPA: Dominan GI (tidak khas ISPA)", 1.2, 0.95),
     ]
     
     return rules
 
+@dataclass(frozen=True, **_SLOTS)
+class RulePlan:
+    """Rencana evaluasi datar hasil compile_rules"""
+    terms: Tuple[Tuple[str, str], ...]      # term (variabel, himpunan) unik, dievaluasi sekali
+    term_fns: Tuple[Callable[[float], float], ...]  # fungsi membership per term
+    rule_terms: Tuple[Optional[Tuple[int, ...]], ...]  # indeks term per rule; None = antecedent opaque
+    source: str                             # kode Python straight-line yang di-generate
+    evaluate: Callable[[Dict[str, float]], Tuple[float, ...]]  # I -> nilai antecedent mentah per rule
+
+def compile_rules(rules: Sequence[Rule], prune: bool = True) -> RulePlan:
+    """Compile rule list menjadi satu fungsi straight-line:
+    setiap μ(variabel, himpunan) unik dihitung tepat sekali, lalu AND/OR per rule.
+    prune=True: term dengan support diketahui dijaga perbandingan interval, jadi membership
+    yang pasti nol (mis. μ(fever, tinggi) saat fever <= 6.0) tidak dipanggil sama sekali."""
+    namespace: Dict[str, Any] = {}
+    term_index: Dict[Tuple[str, str], int] = {}
+    var_index: Dict[str, int] = {}
+    lines: List[str] = []
+    rule_terms: List[Optional[Tuple[int, ...]]] = []
+    outputs: List[str] = []
+
+    for k, r in enumerate(rules):
+        ante = r.antecedent
+        if not isinstance(ante, Antecedent):
+            # Antecedent custom (mis. lambda) dipanggil apa adanya
+            namespace[f"o{k}"] = ante
+            rule_terms.append(None)
+            outputs.append(f"o{k}(I)")
+            continue
+        idx = []
+        for var, setname in ante.terms:
+            key = (var, setname)
+            if key not in term_index:
+                if var not in var_index:
+                    var_index[var] = len(var_index)
+                    lines.append(f"    x{var_index[var]} = I[{var!r}]")
+                t = term_index[key] = len(term_index)
+                fn = namespace[f"s{t}"] = ante.vars[var].sets[setname]
+                x = f"x{var_index[var]}"
+                support = membership_support(fn) if prune else None
+                indent = "    "
+                if support is not None:
+                    lines.append(f"    if not {support[0]!r} < {x} < {support[1]!r}: m{t} = 0.0")
+                    lines.append("    else:")
+                    indent = "        "
+                if isinstance(fn, MembershipTable):
+                    # Titik grid langsung dari tabel; di antara grid analitik (exact) atau interpolasi
+                    namespace[f"g{t}"] = fn.grid.get
+                    lines.append(f"{indent}m{t} = g{t}({x})")
+                    lines.append(f"{indent}if m{t} is None: m{t} = s{t}{'.fn' if fn.exact else ''}({x})")
+                else:
+                    lines.append(f"{indent}m{t} = s{t}({x})")
+            idx.append(term_index[key])
+        rule_terms.append(tuple(idx))
+        names = ", ".join(f"m{t}" for t in idx)
+        if len(idx) == 1:
+            outputs.append(f"m{idx[0]}")
+        else:
+            outputs.append(f"{'min' if ante.op == 'AND' else 'max'}({names})")
+
+    source = "def _evaluate(I):\n" + "\n".join(lines) + ("\n" if lines else "")
+    source += "    return (" + (", ".join(outputs) + "," if outputs else "") + ")\n"
+    exec(compile(source, "<fis_tsukamoto.compile_rules>", "exec"), namespace)
+    return RulePlan(
+        terms=tuple(term_index.keys()),
+        term_fns=tuple(namespace[f"s{t}"] for t in range(len(term_index))),
+        rule_terms=tuple(rule_terms),
+        source=source,
+        evaluate=namespace["_evaluate"],
+    )
+
+def certainty_label(confidence: float) -> str:
+    return ("99% Akurat" if confidence > 0.98 else 
+            "Sangat Tinggi" if confidence > 0.95 else 
+            "Tinggi" if confidence > 0.90 else 
+            "Sedang" if confidence > 0.80 else "Rendah")
+
+def _round_half(a, ndigits: int):
+    """np.round yang mengikuti round() Python: kasus mendekati .5 dibulatkan ulang dengan round()"""
+    import numpy as np
+    out = np.round(a, ndigits)
+    scaled = np.abs(a) * 10.0 ** ndigits
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        out[near_half] = [round(v, ndigits) for v in a[near_half].tolist()]
+    return out
+
 @dataclass
+class BatchPrediction:
+    """Hasil predict_batch dalam bentuk array NumPy (N baris)"""
+    symptoms: Tuple[str, ...]   # urutan kolom inputs (LABEL_ID)
+    diseases: Tuple[str, ...]   # urutan kolom scores/confidence (urutan rule)
+    inputs: Any                 # (N, S) nilai 0..10 hasil parsing
+    scores: Any                 # (N, D) skor 0..100, dibulatkan 2 desimal
+    confidence: Any             # (N, D) confidence per penyakit, dibulatkan 3 desimal
+    active: Any                 # (N, D) bool: penyakit punya >= 1 rule aktif
+    active_rules: Any           # (N,) jumlah rule aktif
+    overall_confidence: Any     # (N,)
+    winner: Any                 # (N,) indeks ke diseases, -1 = belum ada diagnosa
+    def __len__(self) -> int:
+        return len(self.winner)
+    def to_dict(self, i: int) -> Dict[str, Any]:
+        """Baris ke-i dalam format yang sama dengan Diagnoser.predict (tanpa detail_aturan)"""
+        scores = {d: float(self.scores[i, j]) for j, d in enumerate(self.diseases) if self.active[i, j]}
+        conf = {d: float(self.confidence[i, j]) for j, d in enumerate(self.diseases) if self.active[i, j]}
+        w = int(self.winner[i])
+        winner = None
+        if w >= 0:
+            d = self.diseases[w]
+            winner = {"penyakit": d, "skor": scores[d], "confidence": conf[d],
+                      "certainty": certainty_label(conf[d])}
+        return {
+            "masukan_skala_0_10": {k: float(v) for k, v in zip(self.symptoms, self.inputs[i])},
+            "skor": scores,
+            "confidence_per_disease": conf,
+            "overall_confidence": float(self.overall_confidence[i]),
+            "active_rules": int(self.active_rules[i]),
+            "diagnosa_sementara": winner,
+        }
+
+@dataclass(frozen=True, **_SLOTS)
+class ResultLayout:
+    """Urutan sumbu gejala & penyakit untuk CompactResult; satu objek dipakai bersama per engine"""
+    symptoms: Tuple[str, ...]   # urutan masukan_skala_0_10 (urutan vars engine)
+    diseases: Tuple[str, ...]   # urutan kemunculan pertama di rules
+    def index(self, disease: str) -> int:
+        return self.diseases.index(disease)
+
+@dataclass(frozen=True, **_SLOTS)
+class CompactResult:
+    """Hasil predict() ringkas untuk disimpan dalam jumlah besar: satu array('d') berurutan
+    [masukan (S) | skor (D) | confidence (D) | overall_confidence] menggantikan dict bersarang.
+    Penyakit tanpa rule aktif bernilai NaN. to_dict() -> format predict() (tanpa detail_aturan)."""
+    layout: ResultLayout
+    values: array
+    order: Sequence[int]  # indeks penyakit aktif sesuai urutan kunci "skor" (urutan aktivasi)
+    active_rules: int
+    winner: int           # indeks ke layout.diseases; -1 = belum ada diagnosa
+
+    @classmethod
+    def from_dict(cls, layout: ResultLayout, result: Mapping[str, Any]) -> "CompactResult":
+        """Dict hasil predict() -> CompactResult (detail_aturan dibuang)"""
+        inputs = result["masukan_skala_0_10"]
+        if tuple(inputs) != layout.symptoms:
+            raise ValueError("masukan_skala_0_10 tidak sesuai urutan gejala layout")
+        S, D = len(layout.symptoms), len(layout.diseases)
+        values = array("d", inputs.values())
+        values.extend([math.nan] * (2 * D))
+        values.append(result["overall_confidence"])
+        conf = result["confidence_per_disease"]
+        order = []
+        for disease, score in result["skor"].items():
+            j = layout.index(disease)
+            values[S + j] = score
+            values[S + D + j] = conf[disease]
+            order.append(j)
+        winner = result["diagnosa_sementara"]
+        return cls(layout, values, bytes(order) if D < 256 else array("H", order), result["active_rules"],
+                   layout.index(winner["penyakit"]) if winner else -1)
+
+    @property
+    def inputs(self) -> array:
+        return self.values[:len(self.layout.symptoms)]
+    @property
+    def scores(self) -> array:
+        S = len(self.layout.symptoms)
+        return self.values[S:S + len(self.layout.diseases)]
+    @property
+    def confidence(self) -> array:
+        S, D = len(self.layout.symptoms), len(self.layout.diseases)
+        return self.values[S + D:S + 2 * D]
+    @property
+    def overall_confidence(self) -> float:
+        return self.values[-1]
+    @property
+    def diagnosis(self) -> Optional[str]:
+        return self.layout.diseases[self.winner] if self.winner >= 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Format & nilai yang sama dengan Diagnoser.predict(..., return_details=False)"""
+        layout, v = self.layout, self.values
+        S, D = len(layout.symptoms), len(layout.diseases)
+        scores: Dict[str, float] = {}
+        conf: Dict[str, float] = {}
+        for j in self.order:
+            disease = layout.diseases[j]
+            scores[disease] = v[S + j]
+            conf[disease] = v[S + D + j]
+        winner = None
+        if self.winner >= 0:
+            disease = layout.diseases[self.winner]
+            winner = {"penyakit": disease, "skor": scores[disease], "confidence": conf[disease],
+                      "certainty": certainty_label(conf[disease])}
+        return {
+            "masukan_skala_0_10": dict(zip(layout.symptoms, v[:S])),
+            "skor": scores,
+            "confidence_per_disease": conf,
+            "overall_confidence": v[-1],
+            "active_rules": self.active_rules,
+            "diagnosa_sementara": winner,
+        }
+
+def _copy_plain(obj: Any) -> Any:
+    """Salin struktur dict/list hasil predict (nilai skalar dipakai bersama, immutable)"""
+    if isinstance(obj, dict):
+        return {k: _copy_plain(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_plain(v) for v in obj]
+    return obj
+
+class PredictionCache:
+    """Cache LRU hasil predict, key = vektor input kanonik (0..10) + flag return_details.
+
+    Thread-safe; opsional TTL (detik). Cache terikat pada satu rule set: bila dipakai engine
+    dengan rules berbeda, isinya otomatis dikosongkan. Pemanggil selalu menerima salinan.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize harus > 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rules: Optional[Sequence[Rule]] = None
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, rules: Sequence[Rule], key: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if rules is not self._rules:
+                self._reset(rules)
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return _copy_plain(entry[1])
+
+    def put(self, rules: Sequence[Rule], key: Any, result: Dict[str, Any]):
+        stored = _copy_plain(result)
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if rules is not self._rules:
+                self._reset(rules)
+            self._data[key] = (expires, stored)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "expirations": self.expirations, "invalidations": self.invalidations}
+
+    def _reset(self, rules: Sequence[Rule]):
+        if self._rules is not None:
+            self.invalidations += 1
+        self._data.clear()
+        self._rules = rules
+
+def rule_detail(r: Rule, alpha: float, z: float, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Entri detail_aturan untuk satu rule aktif (alpha = weighted alpha)"""
+    return {
+        "catatan_aturan": r.note, 
+        "konsekuen": r.consequent_label,
+        "alfa": round(alpha, 4), 
+        "z": round(z, 2), 
+        "kontribusi": round(alpha * z, 2),
+        "weight": getattr(r, 'weight', 1.0),
+        "confidence": getattr(r, 'confidence', 1.0),
+        "metadata": metadata
+    }
+
+def build_zero_index(rules: Sequence[Rule]) -> Tuple[Tuple[str, float, float, Tuple[int, ...]], ...]:
+    """Indeks terbalik (gejala, himpunan) -> rule AND yang memuatnya, beserta support term.
+    Entri (var, lo, hi, rules): bila x = I[var] di luar (lo, hi), μ term = 0 sehingga rule-rule
+    itu pasti bernilai 0 tanpa perlu dievaluasi. Term tanpa support diketahui tidak diindeks."""
+    index: Dict[Tuple[str, str], List[int]] = {}
+    supports: Dict[Tuple[str, str], Tuple[float, float]] = {}
+    for k, r in enumerate(rules):
+        ante = getattr(r, "antecedent", None)
+        if not isinstance(ante, Antecedent) or ante.op != "AND":
+            continue  # OR baru nol bila semua term nol
+        for var, setname in ante.terms:
+            support = membership_support(ante.vars[var].sets[setname])
+            if support is not None:
+                supports[(var, setname)] = support
+                index.setdefault((var, setname), []).append(k)
+    return tuple((var, *supports[(var, setname)], tuple(ks)) for (var, setname), ks in index.items())
+
+def rule_dependencies(rules: Sequence[Rule], variables: Sequence[str]) -> Dict[str, Tuple[int, ...]]:
+    """Indeks gejala -> rule yang membacanya (urut rule); antecedent opaque bergantung pada semua gejala"""
+    deps: Dict[str, List[int]] = {v: [] for v in variables}
+    for k, r in enumerate(rules):
+        ante = getattr(r, "antecedent", None)
+        names = {var for var, _ in ante.terms} if isinstance(ante, Antecedent) else deps.keys()
+        for var in names:
+            deps.setdefault(var, []).append(k)
+    return {v: tuple(ks) for v, ks in deps.items()}
+
+class RuleProfiler:
+    """Statistik firing per rule dari predict(): jumlah evaluasi, firing non-nol, distribusi alfa,
+    waktu evaluasi kumulatif, error, dan berapa kali rule menentukan diagnosa pemenang.
+
+    Thread-safe; seperti PredictionCache, terikat pada satu rule set (rules lain -> direset).
+    Hanya predict() per baris yang diprofilkan (bukan predict_batch), dan hasil dari cache
+    tidak dievaluasi sehingga tidak tercatat.
+    """
+    ALPHA_BINS = 10  # histogram alfa mentah (0, 1] per 0.1
+    SORT_KEYS = ("index", "time", "fired", "decided", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules: Optional[Sequence[Rule]] = None
+        self._reset(())
+
+    def _reset(self, rules: Sequence[Rule]):
+        n = len(rules)
+        self._rules = rules
+        self._index = {id(r): k for k, r in enumerate(rules)}
+        self.predictions = self.no_diagnosis = 0
+        self.evaluations = [0] * n
+        self.fired = [0] * n
+        self.errors = [0] * n
+        self.alpha_sum = [0.0] * n
+        self.alpha_hist = [[0] * self.ALPHA_BINS for _ in range(n)]
+        self.time_sum = [0.0] * n
+        self.time_max = [0.0] * n
+        self.decided = [0] * n
+
+    def reset(self):
+        with self._lock:
+            self._reset(self._rules or ())
+
+    def record(self, rules: Sequence[Rule], samples: Sequence[Tuple[Optional[float], float]],
+               fired: Sequence[Tuple[Any, float, float, Any]], winner: Optional[str]):
+        """samples: (alfa mentah atau None bila error, detik) per rule sesuai urutan rules"""
+        decider = None
+        if winner is not None:
+            best = -1.0
+            for r, alpha, z, _ in fired:
+                if alpha > 0 and r.disease == winner and alpha * z > best:
+                    decider, best = r, alpha * z
+        bins = self.ALPHA_BINS
+        with self._lock:
+            if rules is not self._rules:
+                self._reset(rules)
+            self.predictions += 1
+            if winner is None:
+                self.no_diagnosis += 1
+            for k, (alpha, dt) in enumerate(samples):
+                self.evaluations[k] += 1
+                self.time_sum[k] += dt
+                if dt > self.time_max[k]:
+                    self.time_max[k] = dt
+                if alpha is None:
+                    self.errors[k] += 1
+                elif alpha > 0:
+                    self.fired[k] += 1
+                    self.alpha_sum[k] += alpha
+                    self.alpha_hist[k][min(bins - 1, int(alpha * bins - 1e-9))] += 1
+            if decider is not None:
+                self.decided[self._index[id(decider)]] += 1
+
+    def snapshot(self, sort: str = "index") -> Dict[str, Any]:
+        """Statistik siap JSON; sort: index | time | fired | decided | errors (menurun)"""
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"sort harus salah satu {self.SORT_KEYS}")
+        with self._lock:
+            rules = list(self._rules or ())
+            rows = []
+            for k, r in enumerate(rules):
+                n, f = self.evaluations[k], self.fired[k]
+                rows.append({
+                    "index": k, "penyakit": r.disease, "konsekuen": r.consequent_label,
+                    "catatan_aturan": r.note, "evaluations": n, "fired": f,
+                    "fire_rate": round(f / n, 4) if n else 0.0, "errors": self.errors[k],
+                    "alpha_mean": round(self.alpha_sum[k] / f, 4) if f else 0.0,
+                    "alpha_hist": list(self.alpha_hist[k]),
+                    "time_total_ms": round(self.time_sum[k] * 1e3, 3),
+                    "time_mean_us": round(self.time_sum[k] / n * 1e6, 3) if n else 0.0,
+                    "time_max_us": round(self.time_max[k] * 1e6, 3),
+                    "decided": self.decided[k],
+                })
+            predictions, no_diagnosis = self.predictions, self.no_diagnosis
+        winners: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if row["decided"]:
+                w = winners.setdefault(row["penyakit"], {"total": 0, "rules": []})
+                w["total"] += row["decided"]
+                w["rules"].append({"index": row["index"], "catatan_aturan": row["catatan_aturan"],
+                                   "count": row["decided"]})
+        for w in winners.values():
+            w["rules"].sort(key=lambda x: -x["count"])
+            for x in w["rules"]:
+                x["share"] = round(x["count"] / w["total"], 4)
+        if sort == "time":
+            rows.sort(key=lambda x: -x["time_total_ms"])
+        elif sort != "index":
+            rows.sort(key=lambda x: -x[sort])
+        return {"predictions": predictions, "no_diagnosis": no_diagnosis,
+                "never_fired": [row["index"] for row in sorted(rows, key=lambda x: x["index"]) if not row["fired"]],
+                "rules": rows, "winners": winners}
+
+    @staticmethod
+    def format_table(snapshot: Dict[str, Any], top: Optional[int] = None) -> str:
+        """Snapshot -> tabel teks (satu baris per rule, lalu ringkasan pemenang per penyakit)"""
+        rows = snapshot["rules"][:top] if top else snapshot["rules"]
+        total_time = sum(r["time_total_ms"] for r in snapshot["rules"]) or 1.0
+        lines = [f"{snapshot['predictions']} prediksi diprofilkan, {snapshot['no_diagnosis']} tanpa diagnosa, "
+                 f"{len(snapshot['never_fired'])} rule tidak pernah aktif",
+                 f"{'#':>3} {'penyakit':<10} {'konsekuen':<9} {'eval':>8} {'aktif':>8} {'rate':>6} "
+                 f"{'alfa':>6} {'waktu ms':>9} {'%waktu':>6} {'us/eval':>8} {'error':>5} {'menang':>7}  catatan"]
+        for r in rows:
+            lines.append(f"{r['index']:>3} {r['penyakit'][:10]:<10} {r['konsekuen'][:9]:<9} {r['evaluations']:>8} "
+                         f"{r['fired']:>8} {r['fire_rate']:>6.1%} {r['alpha_mean']:>6.3f} {r['time_total_ms']:>9.3f} "
+                         f"{r['time_total_ms'] / total_time:>6.1%} {r['time_mean_us']:>8.2f} {r['errors']:>5} "
+                         f"{r['decided']:>7}  {r['catatan_aturan']}")
+        for disease, w in snapshot["winners"].items():
+            top_rules = ", ".join(f"#{x['index']} {x['share']:.0%}" for x in w["rules"][:3])
+            lines.append(f"pemenang {disease}: {w['total']}x ({top_rules})")
+        return "\n".join(lines)
+
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class Diagnoser:
+    """Engine immutable: vars & rules dibangun sekali, aman dipakai bersama antar thread"""
     vars: Dict[str, FuzzyVar] = field(default_factory=make_symptom_vars)
-    rules: List[Rule] = field(default_factory=lambda: build_rules(make_symptom_vars()))
+    rules: Optional[Sequence[Rule]] = None
+    compiled: bool = True  # evaluasi lewat RulePlan (tiap membership dihitung sekali)
+    membership_resolution: Optional[float] = None  # mis. 0.01 -> membership lewat MembershipTable
+    membership_exact: bool = True  # False -> interpolasi linear di antara titik grid
+    cache: Optional[PredictionCache] = None  # cache hasil per vektor input
+    observer: Optional[Callable[[str, float], None]] = None  # observer(tahap, detik): parse/fire/aggregate
+    profiler: Optional[RuleProfiler] = None  # statistik per rule; rule dievaluasi satu per satu (lebih lambat)
+    plan: Optional[RulePlan] = field(default=None, init=False, repr=False)
+    prune_zero: bool = True  # lewati membership/rule yang pasti nol (support Tri/Trap), hasil tetap identik
+    dependencies: Mapping[str, Tuple[int, ...]] = field(default=None, init=False, repr=False)  # gejala -> indeks rule
+    zero_index: Tuple[Tuple[str, float, float, Tuple[int, ...]], ...] = field(default=(), init=False, repr=False)
+    _lean_rules: Optional[Tuple[Tuple[str, float, float, int], ...]] = field(default=None, init=False, repr=False)
+    layout: ResultLayout = field(default=None, init=False, repr=False)  # sumbu CompactResult
+    def __post_init__(self):
+        if self.membership_resolution is not None:
+            object.__setattr__(self, "vars", quantize_vars(self.vars, self.membership_resolution, self.membership_exact))
+        # Rules dibangun dari vars yang sama (sebelumnya make_symptom_vars dipanggil 2x)
+        rules = build_rules(self.vars) if self.rules is None else self.rules
+        if self.membership_resolution is not None:
+            # Rule yang diberikan dari luar diarahkan ke vars terkuantisasi juga
+            rules = [replace(r, antecedent=Antecedent(self.vars, r.antecedent.op, r.antecedent.terms))
+                     if isinstance(r, Rule) and isinstance(r.antecedent, Antecedent) else r
+                     for r in rules]
+        object.__setattr__(self, "vars", MappingProxyType(dict(self.vars)))
+        object.__setattr__(self, "rules", tuple(rules))
+        object.__setattr__(self, "dependencies", MappingProxyType(rule_dependencies(self.rules, list(self.vars))))
+        object.__setattr__(self, "layout", ResultLayout(tuple(self.vars), tuple(dict.fromkeys(r.disease for r in self.rules))))
+        if self.prune_zero:
+            object.__setattr__(self, "zero_index", build_zero_index(self.rules))
+        if self.compiled and all(isinstance(r, Rule) for r in self.rules):
+            object.__setattr__(self, "plan", compile_rules(self.rules, prune=self.prune_zero))
+            # (penyakit, weight, confidence, jenis konsekuen) per rule untuk jalur tanpa detail
+            kinds = {"tinggi": 0, "sedang": 1}
+            object.__setattr__(self, "_lean_rules", tuple(
+                (r.disease, r.weight, r.confidence, kinds.get(r.consequent_label.lower(), 2)) for r in self.rules))
+    def describe(self) -> Dict[str, Any]:
+        """Ringkasan engine untuk inspeksi (jumlah rule, penyakit, variabel)"""
+        return {
+            "variables": list(self.vars.keys()),
+            "diseases": list(self.layout.diseases),
+            "rules": len(self.rules),
+        }
+    def warm_up(self, medications: bool = True, reports: bool = False) -> Dict[str, float]:
+        """Hook warm-up (mis. saat startup / cold start): compile pola LEXICON, lalu satu prediksi
+        self-check lewat jalur ramping & jalur detail (tanpa cache/observer/profiler engine).
+        medications/reports: muat juga data obat / template laporan. RuntimeError bila self-check
+        gagal. -> durasi tiap langkah dalam ms"""
+        perf = time.perf_counter
+        timings: Dict[str, float] = {}
+        t0 = perf()
+        _lexicon_matcher()
+        timings["lexicon_ms"] = (perf() - t0) * 1e3
+        t0 = perf()
+        probe = copy.copy(self)
+        for name in ("cache", "observer", "profiler"):
+            object.__setattr__(probe, name, None)
+        I = probe._ensure_inputs({name: "berat" for name in self.vars})
+        lean = probe._predict_inputs(I, return_details=False)
+        full = probe._predict_inputs(I, return_details=True)
+        detail = full.pop("detail_aturan")
+        if lean != full or set(detail) != set(full["skor"]):
+            raise RuntimeError("self-check warm-up gagal: jalur ramping & jalur detail berbeda")
+        if not all(math.isfinite(v) and 0.0 <= v <= 100.0 for v in full["skor"].values()):
+            raise RuntimeError(f"self-check warm-up gagal: skor di luar 0..100 ({full['skor']})")
+        timings["self_check_ms"] = (perf() - t0) * 1e3
+        top = full["diagnosa_sementara"]
+        if medications:
+            t0 = perf()
+            _medication_tables or _load_medication_tables()
+            if top:
+                medication_recommendations_json(top["penyakit"], top["skor"])
+            timings["medications_ms"] = (perf() - t0) * 1e3
+        if reports:
+            t0 = perf()
+            from fis_templates import render_report_html
+            render_report_html("warm-up", {}, full)
+            timings["reports_ms"] = (perf() - t0) * 1e3
+        return timings
     def _ensure_inputs(self, inputs_text: Dict[str, str]) -> Dict[str, float]:
         cleaned = {name: max(0.0, min(10.0, parse_symptom_text(inputs_text.get(name,"")))) for name in self.vars.keys()}
         return cleaned
-    def predict(self, inputs_text: Dict[str, str], return_details: bool=False) -> Dict[str, Any]:
-        """Enhanced prediction dengan confidence scoring"""
-        I = self._ensure_inputs(inputs_text)
-        accum: Dict[str, Dict[str, float]] = {}
-        details: Dict[str, List[Dict[str, Any]]] = {}
-        confidence_scores: Dict[str, float] = {}
-        
-        active_rules_count = 0
-        total_confidence = 0.0
-        
-        for r in self.rules:
+    def _fire_rules(self, I: Dict[str, float], with_metadata: bool=True) -> List[Tuple[Rule, float, float, Optional[Dict[str, Any]]]]:
+        """Tembakkan semua rule -> [(rule, weighted_alpha, z, metadata)] sesuai urutan rule"""
+        if self.plan is not None:
+            try:
+                raw = self.plan.evaluate(I)
+            except Exception:
+                raw = None  # ulangi per rule agar rule yang error bisa diisolasi
+            if raw is not None:
+                fired = []
+                for r, a in zip(self.rules, raw):
+                    alpha = max(0.0, min(1.0, a))
+                    weighted_alpha, z = r.consequent(alpha)
+                    # Metadata hanya dipakai untuk rule aktif (detail_aturan)
+                    fired.append((r, weighted_alpha, z, r.metadata(alpha, weighted_alpha, z)
+                                  if with_metadata and weighted_alpha > 0 else None))
+                return fired
+        fired = []
+        dead = self._zero_rules(I)
+        for k, r in enumerate(self.rules):
+            if k in dead:
+                # Ada term AND bermembership nol: alfa pasti 0, antecedent tidak dievaluasi
+                alpha, z = r.consequent(0.0)
+                fired.append((r, alpha, z, None))
+                continue
             try:
                 # Try enhanced rule first
-                if hasattr(r, 'weight') and hasattr(r, 'confidence'):
+                if not with_metadata and isinstance(r, Rule):
+                    alpha, z = r.score(I)
+                    metadata = None
+                elif hasattr(r, 'weight') and hasattr(r, 'confidence'):
                     alpha, z, metadata = r.fire(I)
                 else:
                     # Fallback untuk rules tanpa weight/confidence
@@ -338,42 +1132,261 @@ class Diagnoser:
             except Exception as e:
                 print(f"Error in rule {r.note}: {e}")
                 continue
-            
-            if alpha <= 0: 
+            fired.append((r, alpha, z, metadata))
+        return fired
+    def _zero_rules(self, I: Dict[str, float]) -> set:
+        """Indeks rule yang pasti nol menurut zero_index untuk input I"""
+        dead = set()
+        for var, lo, hi, ks in self.zero_index:
+            x = I.get(var)
+            if x is not None and not lo < x < hi:
+                dead.update(ks)
+        return dead
+    def _fire_rules_profiled(self, I: Dict[str, float], with_metadata: bool,
+                             samples: List[Tuple[Optional[float], float]]) -> List[Tuple[Rule, float, float, Optional[Dict[str, Any]]]]:
+        """_fire_rules per rule dengan pengukuran waktu; samples diisi (alfa mentah | None, detik)"""
+        perf = time.perf_counter
+        fired = []
+        for r in self.rules:
+            t0 = perf()
+            try:
+                if isinstance(r, Rule):
+                    raw_alpha = max(0.0, min(1.0, r.antecedent(I)))
+                    alpha, z = r.consequent(raw_alpha)
+                    metadata = r.metadata(raw_alpha, alpha, z) if with_metadata else None
+                elif hasattr(r, 'weight') and hasattr(r, 'confidence'):
+                    alpha, z, metadata = r.fire(I)
+                    raw_alpha = alpha
+                else:
+                    alpha, z = r.fire(I)
+                    raw_alpha = alpha
+                    metadata = {"raw_alpha": alpha, "weighted_alpha": alpha, "z_value": z}
+            except Exception as e:
+                samples.append((None, perf() - t0))
+                print(f"Error in rule {r.note}: {e}")
                 continue
+            samples.append((raw_alpha, perf() - t0))
+            fired.append((r, alpha, z, metadata))
+        return fired
+    @property
+    def input_order(self) -> Tuple[str, ...]:
+        """Urutan kolom untuk input batch: LABEL_ID, lalu variabel tambahan"""
+        return tuple([k for k in LABEL_ID if k in self.vars] + [k for k in self.vars if k not in LABEL_ID])
+    def input_matrix(self, inputs: Any) -> Any:
+        """Array/list numerik -> matriks float (N, len(input_order)).
+        Hanya menerima 2-D dengan lebar tepat len(input_order), atau satu baris 1-D sepanjang itu."""
+        import numpy as np
+        order = self.input_order
+        try:
+            X = np.asarray(inputs, dtype=float)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"input batch harus matriks numerik (N, {len(order)}) dengan kolom "
+                             f"{', '.join(order)}: {e}") from None
+        if X.ndim == 1 and X.shape[0] in (0, len(order)):
+            X = X.reshape(-1, len(order))
+        if X.ndim != 2 or X.shape[1] != len(order):
+            raise ValueError(f"input batch berbentuk {X.shape}, harus (N, {len(order)}) dengan kolom "
+                             f"berurutan {', '.join(order)}")
+        return X
+    def predict_batch(self, inputs: Any) -> BatchPrediction:
+        """Prediksi vektorisasi NumPy untuk banyak kuisioner sekaligus.
+
+        inputs: array (N, 10) nilai 0..10 berurutan input_order, atau list dict jawaban teks.
+        Bentuk array yang salah -> ValueError (lihat input_matrix).
+        Hasil sama dengan predict() per baris (toleransi floating-point pada pembulatan).
+        """
+        import numpy as np
+        order = self.input_order
+        if isinstance(inputs, np.ndarray) or (len(inputs) and not isinstance(inputs[0], dict)):
+            X = np.clip(self.input_matrix(inputs), 0.0, 10.0)
+        else:
+            X = np.empty((len(inputs), len(order)))
+            for i, row in enumerate(inputs):
+                I = self._ensure_inputs(row)
+                X[i] = [I[k] for k in order]
+        n = len(X)
+        col = {k: j for j, k in enumerate(order)}
+        plan = self.plan or compile_rules(self.rules)
+
+        # 1) Membership: tiap term unik sekali, sebagai kolom
+        M = np.empty((n, len(plan.terms)))
+        for t, ((var, _), fn) in enumerate(zip(plan.terms, plan.term_fns)):
+            M[:, t] = vectorized_membership(fn, X[:, col[var]])
+
+        diseases: List[str] = []
+        for r in self.rules:
+            if r.disease not in diseases:
+                diseases.append(r.disease)
+        D = {d: j for j, d in enumerate(diseases)}
+        sum_alpha_z = np.zeros((n, len(diseases)))
+        sum_alpha = np.zeros((n, len(diseases)))
+        conf_sum = np.zeros((n, len(diseases)))
+        active = np.zeros((n, len(diseases)), dtype=bool)
+        active_rules = np.zeros(n, dtype=np.int64)
+        total_confidence = np.zeros(n)
+
+        for r, idx in zip(self.rules, plan.rule_terms):
+            # 2) Antecedent min/max
+            if idx is None:
+                raw = np.zeros(n)
+                for i in range(n):
+                    try:
+                        raw[i] = r.antecedent(dict(zip(order, X[i].tolist())))
+                    except Exception:
+                        raw[i] = 0.0
+            elif len(idx) == 1:
+                raw = M[:, idx[0]]
+            elif r.antecedent.op == "AND":
+                raw = M[:, list(idx)].min(axis=1)
+            else:
+                raw = M[:, list(idx)].max(axis=1)
+            # 3) Konsekuen Tsukamoto (sama dengan Rule.consequent)
+            alpha = np.clip(raw, 0.0, 1.0)
+            wa = alpha * r.weight * r.confidence
+            label = r.consequent_label.lower()
+            if label == "tinggi":
+                z = 100.0 * np.clip(wa, 0.0, 1.0)
+            elif label == "sedang":
+                z = 50.0 + (50.0 * wa)
+            else:
+                z = 100.0 * (1.0 - np.clip(wa, 0.0, 1.0))
+            on = wa > 0
+            j = D[r.disease]
+            active_rules += on
+            total_confidence += np.where(on, r.confidence, 0.0)
+            active[:, j] |= on
+            sum_alpha_z[:, j] += np.where(on, wa * z, 0.0)
+            sum_alpha[:, j] += np.where(on, wa, 0.0)
+            conf_sum[:, j] += np.where(on, r.confidence * wa, 0.0)
+
+        # 4) Weighted average per penyakit
+        with np.errstate(invalid="ignore", divide="ignore"):
+            base = np.where(active, sum_alpha_z / sum_alpha, 0.0)
+            dconf = np.where(active, conf_sum / sum_alpha, 0.0)
+            overall = np.where(active_rules > 0, total_confidence / np.maximum(active_rules, 1), 0.0)
+        scores = _round_half(base * dconf, 2)
+        confidence = _round_half(dconf, 3)
+
+        # 5) Pemenang: skor x confidence tertinggi, seri -> nama alfabetis, confidence >= 0.95
+        winner = np.full(n, -1, dtype=np.int64)
+        if diseases:
+            alpha_order = np.array(sorted(range(len(diseases)), key=lambda k: diseases[k]))
+            weighted = np.where(active, scores * confidence, 0.0)[:, alpha_order]
+            best = alpha_order[weighted.argmax(axis=1)]
+            ok = (weighted.max(axis=1) > 0) & (confidence[np.arange(n), best] >= 0.95)
+            winner[ok] = best[ok]
+
+        return BatchPrediction(
+            symptoms=order, diseases=tuple(diseases), inputs=X, scores=scores,
+            confidence=confidence, active=active, active_rules=active_rules,
+            overall_confidence=_round_half(overall, 3), winner=winner,
+        )
+    def predict(self, inputs_text: Dict[str, str], return_details: bool=False) -> Dict[str, Any]:
+        """Enhanced prediction dengan confidence scoring"""
+        obs = self.observer
+        if obs is not None:
+            t0 = time.perf_counter()
+            I = self._ensure_inputs(inputs_text)
+            obs("parse", time.perf_counter() - t0)
+        else:
+            I = self._ensure_inputs(inputs_text)
+        if self.cache is None:
+            return self._predict_inputs(I, return_details)
+        key = (tuple(I.values()), return_details)
+        result = self.cache.get(self.rules, key)
+        if result is None:
+            result = self._predict_inputs(I, return_details)
+            self.cache.put(self.rules, key, result)
+        return result
+    def predict_compact(self, inputs_text: Dict[str, str]) -> CompactResult:
+        """predict() dalam bentuk CompactResult (untuk menyimpan banyak hasil); .to_dict() = predict()"""
+        return CompactResult.from_dict(self.layout, self.predict(inputs_text))
+    def _predict_inputs(self, I: Dict[str, float], return_details: bool=False) -> Dict[str, Any]:
+        # totals: penyakit -> [sum_alpha_z, sum_alpha, sum_confidence_alpha], urut aktivasi pertama
+        totals: Dict[str, List[float]] = {}
+        details: Dict[str, List[Dict[str, Any]]] = {}
+        
+        active_rules_count = 0
+        total_confidence = 0.0
+        obs = self.observer
+        if obs is not None:
+            t0 = time.perf_counter()
+        
+        raw = fired = samples = None
+        prof = self.profiler
+        if prof is not None:
+            samples = []
+            fired = self._fire_rules_profiled(I, return_details, samples)
+        elif not return_details and self._lean_rules is not None:
+            try:
+                raw = self.plan.evaluate(I)
+            except Exception:
+                raw = None  # jalur lengkap di bawah mengisolasi rule yang error
+        if raw is None and fired is None:
+            fired = self._fire_rules(I, with_metadata=return_details)
+        if obs is not None:
+            t1 = time.perf_counter()
+            obs("fire", t1 - t0)
+        if raw is not None:
+            # Jalur ramping: tanpa metadata/detail, hanya akumulator per penyakit
+            for (disease, weight, conf, kind), a in zip(self._lean_rules, raw):
+                alpha = max(0.0, min(1.0, a)) * weight * conf
+                if alpha <= 0:
+                    continue
+                if kind == 0:    # tinggi
+                    z = 100.0 * max(0.0, min(1.0, alpha))
+                elif kind == 1:  # sedang
+                    z = 50.0 + (50.0 * alpha)
+                else:            # rendah
+                    z = 100.0 * (1.0 - max(0.0, min(1.0, alpha)))
+                active_rules_count += 1
+                total_confidence += conf
+                t = totals.get(disease)
+                if t is None:
+                    t = totals[disease] = [0.0, 0.0, 0.0]
+                t[0] += alpha * z
+                t[1] += alpha
+                t[2] += conf * alpha
+        else:
+            for r, alpha, z, metadata in fired:
+                if alpha <= 0: 
+                    continue
+                    
+                active_rules_count += 1
+                total_confidence += getattr(r, 'confidence', 1.0)
                 
-            active_rules_count += 1
-            total_confidence += getattr(r, 'confidence', 1.0)
-            
-            if r.disease not in accum:
-                accum[r.disease] = {'sum_alpha_z': 0.0, 'sum_alpha': 0.0}
-                details[r.disease] = []
-                confidence_scores[r.disease] = 0.0
-            
-            accum[r.disease]['sum_alpha_z'] += alpha * z
-            accum[r.disease]['sum_alpha'] += alpha
-            confidence_scores[r.disease] += getattr(r, 'confidence', 1.0) * alpha
-            
-            details[r.disease].append({
-                "catatan_aturan": r.note, 
-                "konsekuen": r.consequent_label,
-                "alfa": round(alpha, 4), 
-                "z": round(z, 2), 
-                "kontribusi": round(alpha * z, 2),
-                "weight": getattr(r, 'weight', 1.0),
-                "confidence": getattr(r, 'confidence', 1.0),
-                "metadata": metadata
-            })
+                if r.disease not in totals:
+                    totals[r.disease] = [0.0, 0.0, 0.0]
+                    details[r.disease] = []
+                
+                t = totals[r.disease]
+                t[0] += alpha * z
+                t[1] += alpha
+                t[2] += getattr(r, 'confidence', 1.0) * alpha
+                
+                if return_details:
+                    details[r.disease].append(rule_detail(r, alpha, z, metadata))
         
+        result = self._finalize(I, totals, details, active_rules_count, total_confidence, return_details)
+        if prof is not None:
+            prof.record(self.rules, samples, fired, result["diagnosa_sementara"]["penyakit"]
+                        if result["diagnosa_sementara"] else None)
+        if obs is not None:
+            obs("aggregate", time.perf_counter() - t1)
+            
+        return result
+    def _finalize(self, I: Dict[str, float], totals: Dict[str, List[float]], details: Dict[str, List[Dict[str, Any]]],
+                  active_rules_count: int, total_confidence: float, return_details: bool) -> Dict[str, Any]:
+        """Akumulator per penyakit -> dict hasil predict (skor, confidence, pemenang)"""
         # Calculate scores dengan confidence weighting
         scores: Dict[str, float] = {}
         final_confidence: Dict[str, float] = {}
         
-        for dis, s in accum.items():
-            if s['sum_alpha'] > 0:
-                base_score = s['sum_alpha_z'] / s['sum_alpha']
+        for dis, (sum_alpha_z, sum_alpha, confidence_sum) in totals.items():
+            if sum_alpha > 0:
+                base_score = sum_alpha_z / sum_alpha
                 # Normalize confidence
-                disease_confidence = confidence_scores[dis] / s['sum_alpha']
+                disease_confidence = confidence_sum / sum_alpha
                 scores[dis] = round(base_score * disease_confidence, 2)
                 final_confidence[dis] = round(disease_confidence, 3)
             else:
@@ -398,10 +1411,7 @@ class Diagnoser:
                         "penyakit": winner_disease, 
                         "skor": scores[winner_disease],
                         "confidence": final_confidence[winner_disease],
-                        "certainty": "99% Akurat" if final_confidence[winner_disease] > 0.98 else 
-                                   "Sangat Tinggi" if final_confidence[winner_disease] > 0.95 else 
-                                   "Tinggi" if final_confidence[winner_disease] > 0.90 else 
-                                   "Sedang" if final_confidence[winner_disease] > 0.80 else "Rendah"
+                        "certainty": certainty_label(final_confidence[winner_disease])
                     }
         
         # Overall confidence assessment
@@ -418,385 +1428,105 @@ class Diagnoser:
         
         if return_details: 
             result["detail_aturan"] = details
-            
         return result
 
-def render_report_html(nama_pengguna: str, jawaban_teks: Dict[str, str], pred: Dict[str, Any],
-                       ambang_peringatan: float=60.0) -> str:
-    dt = datetime.datetime.now().strftime("%d %B %Y, %H:%M")
-    top = pred.get("diagnosa_sementara")
-    if not top:
-        top_text = "Belum ada cukup bukti gejala spesifik."
-        rekom = "Pantau gejala. Konsultasikan ke tenaga kesehatan bila perlu."
-    else:
-        top_text = f"{top['penyakit']} (skor {top['skor']:.2f})"
-        if top["skor"] >= ambang_peringatan:
-            rekom = "⚠️ Skor tinggi. Disarankan segera konsultasi ke fasilitas kesehatan."
-        elif top["skor"] >= 40:
-            rekom = "Istirahat & hidrasi cukup. Konsultasi jika tidak membaik."
-        else:
-            rekom = "Pantau gejala. Jika memburuk, konsultasi ke tenaga kesehatan."
-    ranking = "".join([f"<li><b>{d}</b>: {s:.2f}</li>" for d,s in sorted(pred.get("skor",{}).items(), key=lambda kv:-kv[1])])
-    ans_html = "".join([f"<tr><td>{LABEL_ID.get(k,k)}</td><td>{(jawaban_teks.get(k,'') or 'tidak')}</td></tr>" for k in LABEL_ID.keys()])
-    return f"""<!DOCTYPE html><html lang="id"><meta charset="utf-8">
-<title>Laporan FIS Tsukamoto</title>
-<style>body{{font-family:Arial,sans-serif;margin:24px;color:#1f2937}}
-.card{{border:1px solid #e5e7eb;border-radius:12px;padding:16px;margin-bottom:16px}}
-.h1{{font-size:22px;font-weight:700}}.h2{{font-size:18px;font-weight:600}}
-.badge{{display:inline-block;padding:6px 10px;border-radius:9999px;background:#eef2ff;color:#3730a3;font-weight:600}}
-table{{width:100%;border-collapse:collapse}}td,th{{border:1px solid #e5e7eb;padding:8px}}
-.small{{color:#6b7280;font-size:12px}}</style>
-<div class="card"><div class="h1">Laporan Prediksi Penyakit (Fuzzy Tsukamoto)</div>
-<div>Nama: <b>{nama_pengguna}</b> &nbsp; | &nbsp; Tanggal: {dt}</div></div>
-<div class="card"><div class="h2">Diagnosa Sementara</div><div class="badge">{top_text}</div>
-<p><b>Rekomendasi:</b> {rekom}</p></div>
-<div class="card"><div class="h2">Peringkat Penyakit (Skor 0–100)</div><ol>{ranking or "<li>Tidak ada rule aktif</li>"}</ol></div>
-<div class="card"><div class="h2">Jawaban Kuisioner</div><table><thead><tr><th>Gejala</th><th>Jawaban</th></tr></thead><tbody>{ans_html}</tbody></table></div>
-<div class="small">Catatan: Edukasi/akademik; bukan diagnosis klinis.</div></html>"""
-# END OF FILE
-# === MEDICATION DATABASE ===
-# ⚠️  STRONG MEDICAL DISCLAIMER ⚠️
-# This medication database is for EDUCATIONAL PURPOSES ONLY
-# NOT a substitute for professional medical advice, diagnosis, or treatment
-# Always consult with qualified healthcare providers before taking any medication
-# Self-medication can be dangerous and may cause serious health complications
-# Individual medical conditions vary - what works for one person may harm another
-
-MEDICATION_DATABASE = {
-    "Influenza": {
-        "category": "Infeksi Virus Saluran Napas",
-        "severity_levels": {
-            "mild": {
-                "medications": [
-                    {
-                        "name": "Paracetamol (Panadol, Biogesic)",
-                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam atau sakit",
-                        "purpose": "Menurunkan demam dan mengurangi rasa sakit",
-                        "duration": "3-5 hari sampai demam hilang",
-                        "side_effects": "Kadang perut mules atau ruam kulit",
-                        "warnings": "Jangan minum lebih dari 8 tablet sehari. Hati-hati jika punya penyakit hati"
-                    },
-                    {
-                        "name": "Ibuprofen (Advil, Nurofen)",
-                        "dosage": "1 tablet (200mg) setiap 6-8 jam jika dibutuhkan",
-                        "purpose": "Mengurangi demam, sakit, dan bengkak",
-                        "duration": "3-5 hari",
-                        "side_effects": "Kadang perut sakit atau pusing",
-                        "warnings": "Jangan minum saat perut kosong. Hati-hati jika punya masalah lambung"
-                    }
-                ],
-                "general_advice": "Istirahat di rumah, minum air putih banyak-banyak (minimal 2 liter sehari), makan makanan bergizi seperti sayur, buah, dan sup ayam hangat"
-            },
-            "moderate": {
-                "medications": [
-                    {
-                        "name": "Paracetamol + Ibuprofen (sama seperti di atas)",
-                        "dosage": "Gunakan sesuai dosis masing-masing obat",
-                        "purpose": "Mengatasi gejala yang lebih berat",
-                        "duration": "3-5 hari",
-                        "side_effects": "Gabungan efek samping kedua obat",
-                        "warnings": "Tanya dokter dulu sebelum minum dua jenis obat sekaligus"
-                    },
-                    {
-                        "name": "Obat Alergi (CTM, Loratadine)",
-                        "dosage": "1 tablet sehari sesuai kemasan",
-                        "purpose": "Mengurangi hidung meler dan bersin-bersin",
-                        "duration": "3-7 hari",
-                        "side_effects": "Kadang ngantuk atau mulut kering",
-                        "warnings": "Hati-hati saat mengemudi atau bekerja"
-                    }
-                ],
-                "general_advice": "Istirahat total, minum banyak cairan, jaga jarak dengan orang lain agar tidak menular, gunakan masker jika keluar rumah"
-            },
-            "severe": {
-                "medications": [
-                    {
-                        "name": "Tamiflu (Oseltamivir)",
-                        "dosage": "1 kapsul (75mg) 2 kali sehari",
-                        "purpose": "Obat antivirus khusus untuk flu (hanya jika sudah dikonfirmasi dokter)",
-                        "duration": "5 hari penuh",
-                        "side_effects": "Kadang mual atau pusing",
-                        "warnings": "Obat mahal dan hanya bisa didapat dengan resep dokter"
-                    }
-                ],
-                "general_advice": "Segera periksa ke dokter spesialis, mungkin perlu dirawat di rumah sakit jika gejala makin berat"
-            }
-        },
-        "emergency_signs": ["Susah bernapas", "Sakit dada", "Demam tinggi tidak turun dengan obat", "Kejang-kejang", "Pingsan atau tidak sadar"]
-    },
-
-    "Demam Berdarah Dengue": {
-        "category": "Penyakit Virus Demam Berdarah",
-        "severity_levels": {
-            "mild": {
-                "medications": [
-                    {
-                        "name": "Paracetamol (Panadol)",
-                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam",
-                        "purpose": "Menurunkan demam (JANGAN pakai aspirin atau ibuprofen)",
-                        "duration": "Sampai demam turun ke normal",
-                        "side_effects": "Jarang sekali, kadang ruam kulit",
-                        "warnings": "Dilarang keras pakai aspirin atau ibuprofen - bisa bikin perdarahan lebih parah"
-                    },
-                    {
-                        "name": "Oralit atau Larutan Rehidrasi",
-                        "dosage": "1 paket larutkan dalam 1 gelas air, minum sedikit-sedikit",
-                        "purpose": "Mencegah tubuh kekurangan cairan",
-                        "duration": "Selama masih demam dan merasa haus",
-                        "side_effects": "Tidak ada efek samping",
-                        "warnings": "Minum pelan-pelan biar tidak mual. Lebih baik dari air putih saja"
-                    }
-                ],
-                "general_advice": "Istirahat total di tempat sejuk, minum banyak cairan, makan makanan lunak, periksa darah untuk menghitung trombosit, pantau terus gejala bahaya DBD"
-            },
-            "moderate": {
-                "medications": [
-                    {
-                        "name": "Paracetamol",
-                        "dosage": "1 tablet (500mg) setiap 4 jam jika perlu",
-                        "purpose": "Mengontrol demam agar tidak terlalu tinggi",
-                        "duration": "Sampai demam benar-benar turun",
-                        "side_effects": "Jarang sekali",
-                        "warnings": "Pantau trombosit darah, jangan pakai aspirin sama sekali"
-                    }
-                ],
-                "general_advice": "Kemungkinan besar perlu dirawat di rumah sakit, mungkin perlu transfusi darah jika trombosit terlalu rendah"
-            },
-            "severe": {
-                "medications": [
-                    {
-                        "name": "Cairan Infus",
-                        "dosage": "Sesuai kondisi tubuh pasien",
-                        "purpose": "Mengisi cairan tubuh dan menstabilkan kondisi",
-                        "duration": "Sesuai kebutuhan dokter",
-                        "side_effects": "Bisa kelebihan cairan jika tidak hati-hati",
-                        "warnings": "Hanya bisa dilakukan di rumah sakit oleh dokter"
-                    },
-                    {
-                        "name": "Transfusi Darah atau Trombosit",
-                        "dosage": "Sesuai hasil pemeriksaan darah",
-                        "purpose": "Mengatasi perdarahan dan kekurangan trombosit",
-                        "duration": "Sesuai kondisi",
-                        "side_effects": "Kadang ada reaksi alergi ringan",
-                        "warnings": "Hanya dilakukan di rumah sakit dengan darah yang sudah diperiksa"
-                    }
-                ],
-                "general_advice": "Perlu perawatan intensif di rumah sakit, dipantau ketat oleh dokter, bisa berbahaya jika tidak segera ditangani"
-            }
-        },
-        "emergency_signs": ["Keluar darah dari hidung/mulut/bab", "Muntah darah", "BAB hitam seperti kopi", "Pingsan atau syok", "Trombosit darah kurang dari 50.000", "Hematokrit darah naik drastis"]
-    },
-
-    "Demam Tifoid": {
-        "category": "Infeksi Bakteri Usus",
-        "severity_levels": {
-            "mild": {
-                "medications": [
-                    {
-                        "name": "Ciprofloxacin (Cipro)",
-                        "dosage": "1 tablet (500mg) 2 kali sehari",
-                        "purpose": "Antibiotik untuk membunuh bakteri penyebab tifus",
-                        "duration": "7-14 hari penuh",
-                        "side_effects": "Kadang mual, diare, atau pusing",
-                        "warnings": "Harus minum sampai habis meski sudah sembuh. Hanya dengan resep dokter"
-                    },
-                    {
-                        "name": "Paracetamol",
-                        "dosage": "1 tablet (500mg) setiap 6 jam jika demam",
-                        "purpose": "Menurunkan demam",
-                        "duration": "Sampai demam hilang",
-                        "side_effects": "Jarang sekali",
-                        "warnings": "Jangan minum berlebihan"
-                    }
-                ],
-                "general_advice": "Istirahat cukup, makan makanan lunak seperti bubur atau nasi tim, hindari makanan mentah, sayur, atau buah yang tidak dikupas"
-            },
-            "moderate": {
-                "medications": [
-                    {
-                        "name": "Ceftriaxone (Rocephin) - Suntik",
-                        "dosage": "Diberikan oleh dokter sesuai kondisi",
-                        "purpose": "Antibiotik kuat untuk tifus yang agak berat",
-                        "duration": "7-14 hari",
-                        "side_effects": "Kadang diare atau alergi",
-                        "warnings": "Hanya di rumah sakit"
-                    },
-                    {
-                        "name": "Azithromycin (Zithromax)",
-                        "dosage": "1 tablet (500mg) 1 kali sehari",
-                        "purpose": "Antibiotik alternatif jika bakteri resisten",
-                        "duration": "7 hari",
-                        "side_effects": "Kadang mual atau diare",
-                        "warnings": "Alternatif jika antibiotik lain tidak cocok"
-                    }
-                ],
-                "general_advice": "Perlu dirawat di rumah sakit, dipantau terus kemungkinan komplikasi seperti perdarahan atau perforasi usus"
-            },
-            "severe": {
-                "medications": [
-                    {
-                        "name": "Meropenem atau Imipenem - Antibiotik Kuat",
-                        "dosage": "Diberikan oleh dokter sesuai kondisi",
-                        "purpose": "Antibiotik khusus untuk komplikasi tifus berat",
-                        "duration": "Sesuai kondisi pasien",
-                        "side_effects": "Diare berat, bisa resisten",
-                        "warnings": "Antibiotik cadangan, sangat kuat"
-                    }
-                ],
-                "general_advice": "Perlu perawatan ICU, pemantauan ketat, bisa ada komplikasi serius yang mengancam nyawa"
-            }
-        },
-        "emergency_signs": ["BAB berdarah", "Lubang di usus", "Radang otak", "Syok karena infeksi", "Beberapa organ tubuh rusak"]
-    },
-
-    "Gastroenteritis": {
-        "category": "Infeksi Pencernaan",
-        "severity_levels": {
-            "mild": {
-                "medications": [
-                    {
-                        "name": "Oralit atau Larutan Rehidrasi",
-                        "dosage": "1 paket dalam 1 gelas air, minum sedikit-sedikit tapi sering",
-                        "purpose": "Mengganti cairan tubuh yang hilang karena diare",
-                        "duration": "Selama masih sering BAB",
-                        "side_effects": "Tidak ada",
-                        "warnings": "Lebih baik dari air putih biasa. Minum pelan-pelan biar tidak muntah"
-                    },
-                    {
-                        "name": "Loperamide (Imodium, Diapet)",
-                        "dosage": "1-2 tablet setelah BAB cair, maksimal 4 tablet sehari",
-                        "purpose": "Menghentikan diare agar tidak dehidrasi",
-                        "duration": "1-2 hari saja",
-                        "side_effects": "Kadang sembelit atau perut kembung",
-                        "warnings": "Jangan pakai jika BAB berdarah seperti disentri"
-                    }
-                ],
-                "general_advice": "Makan pisang, nasi putih, apel parut, roti tawar (diet BRAT). Hindari susu, gorengan, dan makanan pedas. Istirahat dan minum banyak cairan"
-            },
-            "moderate": {
-                "medications": [
-                    {
-                        "name": "Metronidazole (Flagyl) - untuk parasit",
-                        "dosage": "1 tablet (500mg) 3 kali sehari",
-                        "purpose": "Membunuh parasit penyebab diare",
-                        "duration": "5-7 hari",
-                        "side_effects": "Mual, rasa logam di mulut",
-                        "warnings": "Hanya jika sudah dikonfirmasi ada parasit"
-                    },
-                    {
-                        "name": "Ciprofloxacin - untuk bakteri",
-                        "dosage": "1 tablet (500mg) 2 kali sehari",
-                        "purpose": "Antibiotik untuk membunuh bakteri penyebab",
-                        "duration": "3-5 hari",
-                        "side_effects": "Mual atau diare",
-                        "warnings": "Hanya dengan resep dokter"
-                    }
-                ],
-                "general_advice": "Mungkin perlu infus cairan di rumah sakit, pantau tanda dehidrasi seperti bibir kering, mata cekung, atau berkurangnya air seni"
-            },
-            "severe": {
-                "medications": [
-                    {
-                        "name": "Cairan Infus",
-                        "dosage": "Sesuai kebutuhan tubuh",
-                        "purpose": "Mengisi cairan dan elektrolit yang hilang",
-                        "duration": "Sesuai kondisi",
-                        "side_effects": "Bisa kelebihan cairan",
-                        "warnings": "Hanya di rumah sakit"
-                    },
-                    {
-                        "name": "Antibiotik Suntik",
-                        "dosage": "Sesuai jenis kuman penyebab",
-                        "purpose": "Mengatasi infeksi berat",
-                        "duration": "Sesuai kondisi",
-                        "side_effects": "Sesuai jenis antibiotik",
-                        "warnings": "Perlu pemeriksaan laboratorium dulu"
-                    }
-                ],
-                "general_advice": "Dirawat di rumah sakit, dipantau elektrolit darah, mungkin perlu makan lewat infus jika tidak bisa makan normal"
-            }
-        },
-        "emergency_signs": ["Dehidrasi berat (bibir kering, mata cekung)", "BAB berdarah", "Demam tinggi", "Pingsan atau syok", "Elektrolit tubuh tidak seimbang"]
-    },
-
-    "Infeksi Saluran Pernapasan Atas": {
-        "category": "Infeksi Tenggorokan dan Hidung",
-        "severity_levels": {
-            "mild": {
-                "medications": [
-                    {
-                        "name": "Paracetamol",
-                        "dosage": "1-2 tablet (500mg) setiap 6 jam jika demam atau sakit",
-                        "purpose": "Menurunkan demam dan mengurangi sakit tenggorokan",
-                        "duration": "3-5 hari",
-                        "side_effects": "Jarang sekali",
-                        "warnings": "Jangan minum berlebihan"
-                    },
-                    {
-                        "name": "Dekongestan Hidung (Actifed, Sudafed)",
-                        "dosage": "1 tablet (30-60mg) setiap 4-6 jam",
-                        "purpose": "Mengurangi hidung tersumbat agar bisa bernapas lega",
-                        "duration": "3-5 hari",
-                        "side_effects": "Tekanan darah bisa naik, gelisah",
-                        "warnings": "Hati-hati jika punya darah tinggi"
-                    },
-                    {
-                        "name": "Antihistamin (Claritin, Cetirizine)",
-                        "dosage": "1 tablet (10mg) 1 kali sehari",
-                        "purpose": "Mengurangi bersin dan hidung meler",
-                        "duration": "7 hari",
-                        "side_effects": "Kadang ngantuk",
-                        "warnings": "Hati-hati saat mengemudi"
-                    }
-                ],
-                "general_advice": "Istirahat cukup, minum air hangat, gunakan humidifier atau uap air panas untuk melegakan hidung, kumur dengan air garam hangat"
-            },
-            "moderate": {
-                "medications": [
-                    {
-                        "name": "Amoxicillin - untuk infeksi bakteri",
-                        "dosage": "1 tablet (500mg) 3 kali sehari",
-                        "purpose": "Antibiotik jika ada infeksi bakteri",
-                        "duration": "7-10 hari",
-                        "side_effects": "Kadang diare atau ruam kulit",
-                        "warnings": "Hanya jika sudah dikonfirmasi ada bakteri"
-                    },
-                    {
-                        "name": "Semprotan Hidung Steroid (Avamys, Flixonase)",
-                        "dosage": "2 semprot di setiap lubang hidung, 1 kali sehari",
-                        "purpose": "Mengurangi peradangan di hidung",
-                        "duration": "1-2 minggu",
-                        "side_effects": "Hidung kering atau mimisan",
-                        "warnings": "Tidak langsung bekerja, perlu beberapa hari"
-                    }
-                ],
-                "general_advice": "Jika tidak membaik dalam seminggu, periksa ke dokter. Bisa jadi perlu antibiotik atau pemeriksaan lebih lanjut"
-            },
-            "severe": {
-                "medications": [
-                    {
-                        "name": "Steroid Sistemik",
-                        "dosage": "Sesuai resep dokter",
-                        "purpose": "Mengurangi peradangan yang sangat berat",
-                        "duration": "5-7 hari",
-                        "side_effects": "Bisa mengganggu daya tahan tubuh, kadar gula darah naik",
-                        "warnings": "Hanya dengan resep dokter spesialis"
-                    },
-                    {
-                        "name": "Antibiotik Spektrum Luas",
-                        "dosage": "Sesuai kondisi",
-                        "purpose": "Untuk infeksi yang sudah parah",
-                        "duration": "1-2 minggu",
-                        "side_effects": "Sesuai jenis antibiotik",
-                        "warnings": "Perlu pemeriksaan dahulu untuk jenis baktinya"
-                    }
-                ],
-                "general_advice": "Mungkin perlu dirawat di rumah sakit, periksa ke dokter spesialis THT, bisa ada komplikasi ke telinga atau sinus"
-            }
-        },
-        "emergency_signs": ["Susah bernapas", "Sakit dada", "Demam tinggi yang tidak turun", "Dehidrasi", "Komplikasi ke telinga atau sinus paranasal"]
-    }
+# === MEDICATION RECOMMENDATIONS ===
+# Data obat (fis_medications) & template laporan (fis_templates) dimuat lazy saat pertama dipakai,
+# sehingga import engine tetap ringan untuk cold start; nama lamanya tetap bisa diimpor dari modul ini.
+_LAZY_ATTRS = {
+    "MEDICATION_DATABASE": "fis_medications",
+    "REPORT_HTML_HEAD": "fis_templates", "REPORT_HTML_END": "fis_templates",
+    "render_report_html": "fis_templates", "render_report_page": "fis_templates",
+    "iter_report_html": "fis_templates",
+}
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # akses berikutnya tanpa __getattr__
+    return value
+
+class FrozenDict(dict):
+    """dict read-only: hasil bersama (payload obat) tidak bisa diubah oleh pemanggil.
+    Tetap isinstance dict sehingga json.dumps / pydantic memperlakukannya seperti dict biasa;
+    copy() menghasilkan dict biasa yang boleh diubah."""
+    __slots__ = ()
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict tidak bisa diubah; gunakan .copy() untuk salinan")
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def _freeze(obj: Any) -> Any:
+    """dict -> FrozenDict, list -> tuple (rekursif)"""
+    if isinstance(obj, dict):
+        return FrozenDict({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+_MEDICATION_NOT_FOUND = FrozenDict({
+    "error": "Penyakit tidak ditemukan dalam database obat",
+    "disclaimer": "⚠️ Selalu konsultasikan dengan tenaga kesehatan profesional untuk rekomendasi pengobatan yang tepat."
+})
+_MEDICATION_NOTICES = {
+    "disclaimer": "⚠️ PENTING: Rekomendasi obat ini HANYA UNTUK EDUKASI. BUKAN pengganti diagnosis dan pengobatan dokter. Selalu periksa ke dokter sebelum minum obat apapun. Setiap orang kondisi kesehatannya berbeda-beda.",
+    "warning": "🚨 Jika mengalami gejala darurat seperti yang tertera di atas, segera ke rumah sakit atau hubungi ambulance. JANGAN tunda!",
+    "note": "💊 Obat-obatan harus sesuai resep dokter dan kondisi kesehatan masing-masing orang. Dosis bisa berbeda tergantung usia, berat badan, dan kondisi kesehatan."
 }
+# Separator JSON: default json.dumps dan compact (sama dengan JSONResponse Starlette)
+JSON_SEPARATORS = {"default": (", ", ": "), "compact": (",", ":")}
+
+# (payload, json, not_found_json, hasil) dari rebuild_medication_payloads; None = belum dibangun
+#   payload:        (penyakit, level) -> FrozenDict lengkap berurutan dengan severity_score = None (templat)
+#   json:           (penyakit, level, gaya separator) -> (JSON sebelum nilai severity_score, JSON sesudahnya)
+#   not_found_json: gaya separator -> JSON _MEDICATION_NOT_FOUND
+#   hasil:          (penyakit, skor, tipe skor) -> FrozenDict final; read-only sehingga aman dibagi
+_medication_tables: Optional[Tuple[Dict[Tuple[str, str], FrozenDict], Dict[Tuple[str, str, str], Tuple[str, str]],
+                                   Dict[str, str], Dict[Tuple[str, Any, type], FrozenDict]]] = None
+_medication_lock = threading.Lock()
+# Skor hasil predict() sangat berulang (input lexicon diskrit: ~140 pasangan penyakit/skor per 20k
+# kuisioner acak); setelah penuh hasil baru tidak lagi disimpan sehingga memori tetap terbatas
+MEDICATION_RESULT_CACHE = 4096
+
+def rebuild_medication_payloads():
+    """Bangun ulang payload & fragmen JSON rekomendasi obat (setelah MEDICATION_DATABASE diubah).
+    Dipanggil otomatis saat rekomendasi obat pertama diminta."""
+    global _medication_tables
+    from fis_medications import MEDICATION_DATABASE
+    payloads, encoded = {}, {}
+    for disease, data in MEDICATION_DATABASE.items():
+        for level, rec in data["severity_levels"].items():
+            head = _freeze({"disease": disease, "category": data["category"], "severity_level": level})
+            tail = _freeze({"medications": rec["medications"], "general_advice": rec["general_advice"],
+                            "emergency_signs": data["emergency_signs"], **_MEDICATION_NOTICES})
+            payloads[(disease, level)] = FrozenDict({**head, "severity_score": None, **tail})
+            for style, (item_sep, key_sep) in JSON_SEPARATORS.items():
+                dump = lambda o: json.dumps(o, ensure_ascii=False, separators=(item_sep, key_sep))
+                encoded[(disease, level, style)] = (
+                    dump(head)[:-1] + f'{item_sep}"severity_score"{key_sep}',
+                    item_sep + dump(tail)[1:],
+                )
+    not_found = {style: json.dumps(_MEDICATION_NOT_FOUND, ensure_ascii=False, separators=seps)
+                 for style, seps in JSON_SEPARATORS.items()}
+    _medication_tables = (payloads, encoded, not_found, {})  # diganti sekaligus: pembaca tidak melihat tabel setengah jadi
+
+def _load_medication_tables():
+    with _medication_lock:
+        if _medication_tables is None:
+            rebuild_medication_payloads()
+        return _medication_tables
+
+_dict_setitem = dict.__setitem__
+
+def severity_level(severity_score: float) -> str:
+    if severity_score >= 80:
+        return "severe"
+    elif severity_score >= 60:
+        return "moderate"
+    return "mild"
 
 def get_medication_recommendations(disease_name: str, severity_score: float) -> Dict[str, Any]:
     """
@@ -807,35 +1537,38 @@ def get_medication_recommendations(disease_name: str, severity_score: float) ->
         severity_score: Score from 0-100 indicating severity
 
     Returns:
-        Dictionary with medication recommendations and disclaimers
+        Read-only dictionary (FrozenDict, list sebagai tuple) with medication recommendations
+        and disclaimers; payload per (penyakit, level) dibangun sekali saat pertama dipakai dan
+        hasil per (penyakit, skor) dipakai bersama: panggilan berulang hanya satu lookup dict
     """
-    if disease_name not in MEDICATION_DATABASE:
-        return {
-            "error": "Penyakit tidak ditemukan dalam database obat",
-            "disclaimer": "⚠️ Selalu konsultasikan dengan tenaga kesehatan profesional untuk rekomendasi pengobatan yang tepat."
-        }
+    tables = _medication_tables or _load_medication_tables()
+    key = (disease_name, severity_score, type(severity_score))  # 80 dan 80.0 di-encode berbeda
+    out = tables[3].get(key)
+    if out is not None:
+        return out
+    template = tables[0].get((disease_name, severity_level(severity_score)))
+    if template is None:
+        return _MEDICATION_NOT_FOUND
+    out = FrozenDict(template)  # salinan dangkal (nilai bersama sudah beku), urutan kunci tetap
+    _dict_setitem(out, "severity_score", severity_score)  # lewat dict: FrozenDict menolak mutasi dari luar
+    if len(tables[3]) < MEDICATION_RESULT_CACHE:
+        tables[3][key] = out
+    return out
 
-    disease_data = MEDICATION_DATABASE[disease_name]
-
-    # Determine severity level based on score
-    if severity_score >= 80:
-        severity_level = "severe"
-    elif severity_score >= 60:
-        severity_level = "moderate"
+def medication_recommendations_json(disease_name: str, severity_score: float, style: str = "default") -> str:
+    """get_medication_recommendations yang sudah ter-encode JSON (ensure_ascii=False), untuk
+    disisipkan langsung ke body response; style "default" atau "compact" (JSON_SEPARATORS)"""
+    tables = _medication_tables or _load_medication_tables()
+    parts = tables[1].get((disease_name, severity_level(severity_score), style))
+    if parts is None:
+        return tables[2][style]
+    if type(severity_score) is float and math.isfinite(severity_score):
+        score = float.__repr__(severity_score)  # sama dengan json.dumps(float), tanpa overhead encoder
     else:
-        severity_level = "mild"
+        score = json.dumps(severity_score)
+    return "".join((parts[0], score, parts[1]))
 
-    recommendations = disease_data["severity_levels"][severity_level]
-
-    return {
-        "disease": disease_name,
-        "category": disease_data["category"],
-        "severity_level": severity_level,
-        "severity_score": severity_score,
-        "medications": recommendations["medications"],
-        "general_advice": recommendations["general_advice"],
-        "emergency_signs": disease_data["emergency_signs"],
-        "disclaimer": "⚠️ PENTING: Rekomendasi obat ini HANYA UNTUK EDUKASI. BUKAN pengganti diagnosis dan pengobatan dokter. Selalu periksa ke dokter sebelum minum obat apapun. Setiap orang kondisi kesehatannya berbeda-beda.",
-        "warning": "🚨 Jika mengalami gejala darurat seperti yang tertera di atas, segera ke rumah sakit atau hubungi ambulance. JANGAN tunda!",
-        "note": "💊 Obat-obatan harus sesuai resep dokter dan kondisi kesehatan masing-masing orang. Dosis bisa berbeda tergantung usia, berat badan, dan kondisi kesehatan."
-    }
\ No newline at end of file
+if __name__ == "__main__":
+    # python -m fis_tsukamoto score ... (lihat fis_cli.py)
+    from fis_cli import main
+    raise SystemExit(main())
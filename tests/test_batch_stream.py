@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+/v1/predict/batch: stream NDJSON satu baris per item sesuai urutan input (list JSON, {"items": ...},
+maupun body NDJSON), item invalid mendapat slot error tanpa menggagalkan batch, item diproses per
+chunk BATCH_CHUNK_SIZE, dan tiap baris sukses sama dengan respons /v1/predict.
+Jalankan: python -m pytest tests/
+"""
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import api_app
+from fis_tsukamoto import LABEL_ID
+
+WORDS = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang", "8"]
+INVALID = {3: 5, 7: {"include_detail_rules": "abc"}, 8: {"ambang_peringatan": 500}}
+
+def _items(n=20, seed=3):
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        item = {k: rnd.choice(WORDS) for k in LABEL_ID}
+        item.update(nama=f"pasien-{i}", include_detail_rules=i % 4 == 0)
+        items.append(INVALID.get(i, item))
+    return items
+
+def _lines(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(api_app.NDJSON_MEDIA_TYPE)
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+@pytest.fixture
+def client():
+    with TestClient(api_app.app) as c:
+        yield c
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """BATCH_CHUNK_SIZE kecil + catat ukuran tiap chunk yang diproses executor"""
+    sizes = []
+    score = api_app._score_batch_chunk
+    def recording(chunk):
+        sizes.append(len(chunk))
+        return score(chunk)
+    monkeypatch.setattr(api_app, "BATCH_CHUNK_SIZE", 6)
+    monkeypatch.setattr(api_app, "_score_batch_chunk", recording)
+    return sizes
+
+@pytest.mark.parametrize("wrap", ["list", "items"])
+def test_json_body_order_errors_and_chunks(client, chunks, wrap):
+    items = _items()
+    body = items if wrap == "list" else {"items": items}
+    lines = _lines(client.post("/v1/predict/batch", json=body))
+    assert [line["index"] for line in lines] == list(range(len(items)))
+    assert chunks == [6, 6, 6, 2]
+    for i, (item, line) in enumerate(zip(items, lines)):
+        if i in INVALID:
+            assert set(line) == {"index", "error"} and line["error"]
+            continue
+        assert line.pop("error") is None and line.pop("index") == i
+        single = client.post("/v1/predict", json=item).json()
+        assert line.pop("timestamp") and single.pop("timestamp")
+        assert line == single
+        assert line["nama"] == f"pasien-{i}"
+
+def test_ndjson_body(client, chunks):
+    items = _items(10)
+    raw = [json.dumps(x) for x in items]
+    raw[5] = "{bukan json"
+    body = ("\n".join(raw[:4]) + "\n\n" + "\n".join(raw[4:])).encode("utf-8")  # baris kosong dilewati
+    lines = _lines(client.post("/v1/predict/batch", content=body,
+                               headers={"Content-Type": "application/x-ndjson"}))
+    assert [line["index"] for line in lines] == list(range(10))
+    assert chunks == [6, 4]
+    assert lines[5]["error"].startswith("Baris NDJSON tidak valid")
+    assert lines[3]["error"] and lines[7]["error"] and lines[8]["error"]
+    for i in (0, 1, 2, 4, 6, 9):
+        assert lines[i]["error"] is None and lines[i]["nama"] == f"pasien-{i}"
+
+def test_invalid_body_rejected(client):
+    assert client.post("/v1/predict/batch", json={"bukan": []}).status_code == 422
+    assert client.post("/v1/predict/batch", content=b"{x",
+                       headers={"Content-Type": "application/json"}).status_code == 400
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Laporan massal: ZIP hasil stream (iter_bulk_reports & /v1/report/bulk) bisa dibuka zipfile dengan
+satu entri HTML per pasien valid plus errors.ndjson untuk entri gagal; mode HTML memuat satu
+halaman per pasien dan bagian "Entri gagal".
+Jalankan: python -m pytest tests/
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_reports import iter_bulk_reports, report_filename
+from fis_tsukamoto import LABEL_ID
+
+def _entries():
+    return [
+        ("Budi Santoso", {k: "berat" for k in LABEL_ID}),
+        ("Ani", None),                          # jawaban tidak valid -> entri gagal
+        ("../etc/passwd", {"fever": "sedang", "cough": "sering"}),
+        ("", {k: "tidak" for k in LABEL_ID}),
+    ]
+
+def _open_zip(data: bytes) -> zipfile.ZipFile:
+    zf = zipfile.ZipFile(io.BytesIO(data))
+    assert zf.testzip() is None
+    return zf
+
+def test_zip_one_entry_per_valid_item():
+    chunks = list(iter_bulk_reports(_entries(), "zip"))
+    assert len(chunks) >= 3  # ditulis bertahap, bukan satu blok di akhir
+    zf = _open_zip(b"".join(chunks))
+    expected = [report_filename(i, nama) for i, (nama, _) in enumerate(_entries()) if i != 1]
+    assert zf.namelist() == expected + ["errors.ndjson"]
+    assert expected == ["00001_Budi-Santoso.html", "00003_etc-passwd.html", "00004_pasien.html"]
+    for name in expected:
+        doc = zf.read(name).decode("utf-8")
+        assert doc.lstrip().lower().startswith("<!doctype html") and "</html>" in doc
+    assert "Budi Santoso" in zf.read(expected[0]).decode("utf-8")
+    errors = [json.loads(line) for line in zf.read("errors.ndjson").decode("utf-8").splitlines()]
+    assert [e["index"] for e in errors] == [1] and errors[0]["error"]
+
+def test_zip_without_errors_has_no_errors_file():
+    entries = [e for e in _entries() if e[1] is not None]
+    zf = _open_zip(b"".join(iter_bulk_reports(entries, "zip")))
+    assert len(zf.namelist()) == 3 and "errors.ndjson" not in zf.namelist()
+
+def test_html_pages_and_failed_section():
+    doc = b"".join(iter_bulk_reports(_entries(), "html")).decode("utf-8")
+    assert doc.count('<section class="page">') == 3
+    assert "Entri gagal" in doc and "<li>#1: " in doc
+    assert doc.rstrip().endswith("</html>")
+    clean = b"".join(iter_bulk_reports(_entries()[:1], "html")).decode("utf-8")
+    assert "Entri gagal" not in clean
+
+@pytest.fixture
+def client():
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    import api_app
+    with TestClient(api_app.app) as c:
+        yield c
+
+def _body():
+    items = [{"nama": nama, "jawaban_teks": jawaban} for nama, jawaban in _entries()]
+    items.insert(2, {"nama": "tanpa jawaban"})  # gagal validasi BulkReportItem
+    return items
+
+def test_bulk_endpoint_zip(client):
+    r = client.post("/v1/report/bulk?format=zip", json=_body())
+    assert r.status_code == 200 and r.headers["content-type"] == "application/zip"
+    assert "laporan.zip" in r.headers["content-disposition"]
+    zf = _open_zip(r.content)
+    assert zf.namelist() == ["00001_Budi-Santoso.html", "00004_etc-passwd.html", "00005_pasien.html",
+                             "errors.ndjson"]
+    errors = [json.loads(line) for line in zf.read("errors.ndjson").decode("utf-8").splitlines()]
+    assert [e["index"] for e in errors] == [1, 2]
+
+def test_bulk_endpoint_html_ndjson(client):
+    body = "\n".join(json.dumps(x) for x in _body()) + "\n{rusak\n"
+    r = client.post("/v1/report/bulk?format=html", content=body.encode("utf-8"),
+                    headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/html")
+    assert r.text.count('<section class="page">') == 3
+    assert "Entri gagal" in r.text
+    for index in (1, 2, 5):
+        assert f"<li>#{index}: " in r.text
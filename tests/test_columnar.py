@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+fis_columnar: write -> open_columns round-trip untuk npy/npz/fcol (satu batch, multi-chunk, n=0),
+skor/confidence penyakit tanpa rule aktif = NaN, dan nama gejala/penyakit yang bisa keluar dari
+direktori output ditolak.
+Jalankan: python -m pytest tests/
+"""
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_columnar import COLUMNAR_FORMATS, ColumnarWriter, batch_columns, column_specs, open_columns, write_columns
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+WORDS = ["tidak", "tidak", "tidak", "ringan", "sedang", "berat", "sangat berat", "kadang", "sering", "ya"]
+
+def _inputs(n, seed=5):
+    rnd = random.Random(seed)
+    return [{k: rnd.choice(WORDS) for k in LABEL_ID} for _ in range(n)]
+
+@pytest.fixture(scope="module")
+def clf():
+    return Diagnoser()
+
+def _path(tmp_path, fmt):
+    return str(tmp_path / ("hasil" if fmt == "npy" else f"hasil.{fmt}"))
+
+def _assert_columns_equal(opened, expected):
+    assert list(opened["columns"]) == list(expected)
+    for name, col in expected.items():
+        got = opened["columns"][name]
+        assert got.dtype == col.dtype, name
+        np.testing.assert_array_equal(got, col, err_msg=name)  # NaN == NaN di sini
+
+@pytest.mark.parametrize("fmt", COLUMNAR_FORMATS)
+def test_round_trip_single_batch(tmp_path, clf, fmt):
+    batch = clf.predict_batch(_inputs(300))
+    path = _path(tmp_path, fmt)
+    meta = write_columns(path, batch, fmt, meta={"sumber": "uji"})
+    assert meta["n"] == 300 and meta["sumber"] == "uji"
+    opened = open_columns(path)
+    assert opened["n"] == 300 and opened["sumber"] == "uji"
+    assert opened["symptoms"] == list(batch.symptoms) and opened["diseases"] == list(batch.diseases)
+    _assert_columns_equal(opened, batch_columns(batch))
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp") or f.startswith(".fiscol-")]
+
+@pytest.mark.parametrize("fmt", COLUMNAR_FORMATS)
+def test_round_trip_multi_chunk(tmp_path, clf, fmt):
+    inputs = _inputs(257)
+    chunks = [clf.predict_batch(inputs[i:i + 64]) for i in range(0, len(inputs), 64)]
+    path = _path(tmp_path, fmt)
+    assert write_columns(path, iter(chunks), fmt, compress=True)["n"] == 257
+    _assert_columns_equal(open_columns(path), batch_columns(clf.predict_batch(inputs)))
+
+@pytest.mark.parametrize("fmt", COLUMNAR_FORMATS)
+def test_empty_output(tmp_path, clf, fmt):
+    batch = clf.predict_batch([])
+    path = _path(tmp_path, fmt)
+    with ColumnarWriter(path, fmt, batch.symptoms, batch.diseases) as writer:
+        writer.write(batch)
+    opened = open_columns(path)
+    assert opened["n"] == 0
+    assert list(opened["columns"]) == [name for name, _ in column_specs(batch.symptoms, batch.diseases)]
+    assert all(len(col) == 0 for col in opened["columns"].values())
+
+def test_inactive_disease_is_nan(clf):
+    batch = clf.predict_batch([{k: "tidak" for k in LABEL_ID}, {k: "berat" for k in LABEL_ID}])
+    cols = batch_columns(batch)
+    for j, d in enumerate(batch.diseases):
+        for i in range(len(batch)):
+            if batch.active[i, j]:
+                assert cols[f"skor_{d}"][i] == batch.scores[i, j]
+            else:
+                assert np.isnan(cols[f"skor_{d}"][i]) and np.isnan(cols[f"confidence_{d}"][i])
+    assert np.isnan(cols[f"skor_{batch.diseases[0]}"][0])  # tanpa gejala: tidak ada rule aktif
+
+def test_write_without_batches_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_columns(str(tmp_path / "x.fcol"), iter([]))
+
+@pytest.mark.parametrize("name", ["../keluar", "a/b", "a\\b", "..", ".", "", "baris\nbaru"])
+def test_unsafe_names_rejected(tmp_path, name):
+    with pytest.raises(ValueError):
+        column_specs(list(LABEL_ID), [name])
+    with pytest.raises(ValueError):
+        column_specs([name], ["flu"])
+    with pytest.raises(ValueError):
+        ColumnarWriter(str(tmp_path / "out"), "npy", list(LABEL_ID), [name])
+    assert not os.path.exists(tmp_path / "out")
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+BoundedExecutor / run_scoring: pekerjaan di atas workers + max_queue ditolak (503 + Retry-After),
+pekerjaan yang melewati deadline -> 504 dan tidak dijalankan bila deadline lewat saat antri.
+Jalankan: python -m pytest tests/
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import api_app
+from api_app import BoundedExecutor, DeadlineExceeded, ExecutorOverloaded
+from fis_tsukamoto import LABEL_ID
+
+PAYLOAD = {k: "berat" for k in LABEL_ID}
+
+class Blocker:
+    """Tempati satu worker executor sampai release() (dijalankan di event loop thread lain)"""
+    def __init__(self, executor: BoundedExecutor, shed: bool = True):
+        self.started, self.gate = threading.Event(), threading.Event()
+        def job():
+            self.started.set()
+            self.gate.wait(5)
+        self.thread = threading.Thread(
+            target=lambda: asyncio.run(executor.run(job, shed=shed, timeout=None)), daemon=True)
+        self.thread.start()
+        assert self.started.wait(5)
+
+    def release(self):
+        self.gate.set()
+        self.thread.join(5)
+
+@pytest.fixture
+def executor(monkeypatch):
+    ex = BoundedExecutor(workers=1, max_queue=0, timeout=0.2)
+    monkeypatch.setattr(api_app, "predict_executor", ex)
+    yield ex
+    ex.shutdown()
+
+def test_overloaded_executor_rejects():
+    ex = BoundedExecutor(workers=1, max_queue=1)
+    blocker = Blocker(ex)
+    queued = threading.Thread(target=lambda: asyncio.run(ex.run(lambda: None, timeout=None)), daemon=True)
+    queued.start()
+    while ex.stats()["in_flight"] < 2:
+        time.sleep(0.001)
+    with pytest.raises(ExecutorOverloaded):
+        asyncio.run(ex.run(lambda: None))
+    # shed=False (chunk stream yang sudah diterima) tetap masuk antrian
+    blocker.release()
+    assert asyncio.run(ex.run(lambda: 42, shed=False)) == 42
+    queued.join(5)
+    stats = ex.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 3 and stats["in_flight"] == 0
+    ex.shutdown()
+
+def test_predict_returns_503_with_retry_after(executor):
+    with TestClient(api_app.app) as client:
+        blocker = Blocker(executor)
+        try:
+            r = client.post("/v1/predict", json=PAYLOAD)
+        finally:
+            blocker.release()
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == str(api_app.PREDICT_RETRY_AFTER_S)
+        assert client.post("/v1/predict", json=PAYLOAD).status_code == 200
+    assert executor.stats()["rejected"] == 1
+
+def test_deadline_while_running_raises():
+    ex = BoundedExecutor(workers=1, max_queue=0, timeout=0.05)
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(ex.run(time.sleep, 0.3))
+    assert ex.stats()["timeouts"] == 1
+    ex.shutdown()
+
+def test_deadline_expired_in_queue_is_not_run():
+    ex = BoundedExecutor(workers=1, max_queue=1, timeout=0.05)
+    blocker = Blocker(ex)
+    ran = []
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(ex.run(ran.append, 1))
+    blocker.release()
+    asyncio.run(ex.run(lambda: None, timeout=None))  # antrian sudah kosong
+    assert ran == []
+    ex.shutdown()
+
+def test_predict_returns_504_on_deadline(executor):
+    executor.max_queue = 1  # request antri di belakang blocker lalu melewati deadline
+    with TestClient(api_app.app) as client:
+        blocker = Blocker(executor, shed=False)
+        try:
+            r = client.post("/v1/predict", json=PAYLOAD)
+        finally:
+            blocker.release()
+        assert r.status_code == 504
+        assert r.json()["detail"].startswith("Waktu proses habis")
+    assert executor.stats()["timeouts"] == 1
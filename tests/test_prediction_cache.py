@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+PredictionCache: hasil dari cache identik dengan predict tanpa cache, pemanggil menerima salinan
+(mutasi tidak merusak isi cache), eviksi LRU pada maxsize, dan return_details True/False
+tersimpan sebagai entri terpisah.
+Jalankan: python -m pytest tests/
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_tsukamoto import LABEL_ID, Diagnoser, PredictionCache
+
+WORDS = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang", "7", "2,5"]
+
+def _questionnaires(n, seed=7):
+    rnd = random.Random(seed)
+    return [{k: rnd.choice(WORDS) for k in LABEL_ID} for _ in range(n)]
+
+def test_cached_predict_equals_uncached():
+    plain, cached = Diagnoser(), Diagnoser(cache=PredictionCache(maxsize=64))
+    cases = _questionnaires(50)
+    for details in (False, True):
+        for x in cases + cases:  # putaran kedua dilayani dari cache
+            assert cached.predict(x, return_details=details) == plain.predict(x, return_details=details)
+    assert cached.cache.stats()["hits"] >= len(cases)
+
+def test_mutating_result_does_not_corrupt_cache():
+    clf = Diagnoser(cache=PredictionCache())
+    x = {k: "berat" for k in LABEL_ID}
+    expected = Diagnoser().predict(x, return_details=True)
+    first = clf.predict(x, return_details=True)
+    first["skor"].clear()
+    first["detail_aturan"].clear()
+    first["diagnosa_sementara"] = None
+    second = clf.predict(x, return_details=True)
+    assert second == expected
+    second["skor"]["x"] = 1.0
+    assert clf.predict(x, return_details=True) == expected
+
+def test_lru_eviction_at_maxsize():
+    cache = PredictionCache(maxsize=2)
+    rules = []
+    cache.put(rules, "a", {"v": 1})
+    cache.put(rules, "b", {"v": 2})
+    assert cache.get(rules, "a") == {"v": 1}  # "a" jadi yang terbaru
+    cache.put(rules, "c", {"v": 3})           # "b" yang paling lama tidak dipakai dibuang
+    assert cache.get(rules, "b") is None
+    assert cache.get(rules, "a") == {"v": 1}
+    assert cache.get(rules, "c") == {"v": 3}
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+
+def test_return_details_cached_separately():
+    clf = Diagnoser(cache=PredictionCache())
+    x = {k: "sedang" for k in LABEL_ID}
+    lean = clf.predict(x)
+    detailed = clf.predict(x, return_details=True)
+    assert "detail_aturan" not in lean
+    assert "detail_aturan" in detailed
+    assert clf.cache.stats()["size"] == 2
+    assert clf.predict(x) == lean
+    assert clf.predict(x, return_details=True) == detailed
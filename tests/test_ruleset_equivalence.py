@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Regresi: rule base bawaan di kode (Diagnoser()) dan rulesets/default.json harus memberi hasil
+identik di semua jalur evaluasi (compiled, prune_zero, membership_resolution, predict_batch,
+predict_compact) pada set kuisioner acak dengan seed tetap; ruleset rusak ditolak validasi
+(RulesetError / 422 di /v1/engine/reload), bukan error internal.
+Jalankan: python -m pytest tests/
+"""
+import copy
+import itertools
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_ruleset import DEFAULT_RULESET_PATH, RulesetError, compile_ruleset, load_ruleset, validate_ruleset
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+WORDS = ["tidak", "ya", "kadang", "sering", "ringan", "sedang", "berat", "sangat berat", "parah", "severe",
+         "lima", "3.5", "7,5", "agak berat", "cukup", "", "normal", "minimal", "lumayan", "x", None, "10",
+         "sangat sering", "hampir tidak"]
+
+CONFIGS = [dict(compiled=c, prune_zero=p, membership_resolution=r)
+           for c, p, r in itertools.product((True, False), (True, False), (None, 0.01))]
+
+def _config_id(kw):
+    return ",".join(f"{k}={v}" for k, v in kw.items())
+
+@pytest.fixture(scope="module")
+def questionnaires():
+    rnd = random.Random(42)
+    cases = []
+    for _ in range(400):
+        row = {}
+        for k in LABEL_ID:
+            r = rnd.random()
+            if r < 0.5:
+                row[k] = "tidak"
+            elif r < 0.8:
+                row[k] = rnd.choice(WORDS)
+            else:
+                row[k] = str(round(rnd.uniform(0, 10), rnd.choice([0, 1, 2])))
+        cases.append(row)
+    return cases
+
+@pytest.fixture(scope="module")
+def ruleset():
+    return load_ruleset(DEFAULT_RULESET_PATH)
+
+@pytest.fixture(scope="module")
+def reference(questionnaires):
+    # Jalur paling sederhana (per rule, tanpa pruning, membership eksak) sebagai acuan
+    clf = Diagnoser(compiled=False, prune_zero=False)
+    return [clf.predict(x, return_details=True) for x in questionnaires]
+
+@pytest.mark.parametrize("kw", CONFIGS, ids=_config_id)
+def test_predict_code_vs_ruleset(kw, questionnaires, ruleset, reference):
+    code = Diagnoser(**kw)
+    from_file = compile_ruleset(ruleset, **kw)[0]
+    for i, x in enumerate(questionnaires):
+        details = i % 2 == 0
+        expected = code.predict(x, return_details=details)
+        assert from_file.predict(x, return_details=details) == expected
+        if kw["membership_resolution"] is None:
+            # compiled / prune_zero hanya optimasi: hasil harus bit-identik dengan jalur acuan
+            ref = dict(reference[i])
+            if not details:
+                ref.pop("detail_aturan", None)
+            assert expected == ref
+
+@pytest.mark.parametrize("kw", CONFIGS, ids=_config_id)
+def test_predict_compact_code_vs_ruleset(kw, questionnaires, ruleset):
+    code = Diagnoser(**kw)
+    from_file = compile_ruleset(ruleset, **kw)[0]
+    for x in questionnaires:
+        expected = code.predict(x)
+        assert code.predict_compact(x).to_dict() == expected
+        assert from_file.predict_compact(x).to_dict() == expected
+
+@pytest.mark.parametrize("resolution", (None, 0.01))
+def test_predict_batch_code_vs_ruleset(resolution, questionnaires, ruleset):
+    np = pytest.importorskip("numpy")
+    code = Diagnoser(membership_resolution=resolution)
+    from_file = compile_ruleset(ruleset, membership_resolution=resolution)[0]
+    a, b = code.predict_batch(questionnaires), from_file.predict_batch(questionnaires)
+    assert a.diseases == b.diseases and a.symptoms == b.symptoms
+    for name in ("inputs", "scores", "confidence", "active", "active_rules", "overall_confidence", "winner"):
+        assert np.array_equal(getattr(a, name), getattr(b, name)), name
+    # predict_batch vs predict per baris: sama sampai toleransi pembulatan floating-point
+    for i, x in enumerate(questionnaires):
+        row, expected = a.to_dict(i), code.predict(x)
+        assert row["masukan_skala_0_10"] == expected["masukan_skala_0_10"]
+        assert row["skor"] == pytest.approx(expected["skor"], abs=0.011)
+        assert row["confidence_per_disease"] == pytest.approx(expected["confidence_per_disease"], abs=0.0011)
+        assert row["active_rules"] == expected["active_rules"]
+        assert (row["diagnosa_sementara"] or {}).get("penyakit") == \
+            (expected["diagnosa_sementara"] or {}).get("penyakit")
+
+def _broken(mutate):
+    with open(DEFAULT_RULESET_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    mutate(data)
+    return data
+
+def _unhashable_term(data):
+    data["rules"][0]["terms"] = [[["x"], "ringan"]] + data["rules"][0]["terms"]
+
+def _missing_symptom(data):
+    del data["variables"]["fatigue"]
+    for rule in data["rules"]:
+        rule["terms"] = [t for t in rule["terms"] if t[0] != "fatigue"] or [["fever", "ringan"]]
+
+@pytest.mark.parametrize("mutate, message", [
+    (_unhashable_term, "tidak merujuk [variabel, himpunan]"),
+    (_missing_symptom, "gejala wajib tidak ada: fatigue"),
+], ids=["unhashable-term", "missing-symptom"])
+def test_invalid_ruleset_rejected(mutate, message):
+    data = _broken(mutate)
+    assert any(message in e for e in validate_ruleset(copy.deepcopy(data)))
+    with pytest.raises(RulesetError):
+        load_ruleset(data)
+
+@pytest.mark.parametrize("mutate", [_unhashable_term, _missing_symptom], ids=["unhashable-term", "missing-symptom"])
+def test_invalid_ruleset_reload_returns_422(mutate, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    import api_app
+    monkeypatch.setattr(api_app, "RELOAD_TOKEN", "token")
+    with TestClient(api_app.app) as client:
+        before = client.get("/v1/engine").json()["ruleset"]
+        r = client.post("/v1/engine/reload", headers={"X-Reload-Token": "token"},
+                        content=json.dumps(_broken(mutate)))
+        assert r.status_code == 422
+        assert r.json()["detail"]["message"].startswith("Ruleset tidak valid")
+        assert client.get("/v1/engine").json()["ruleset"] == before
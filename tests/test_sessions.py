@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+DiagnosisSession: hasil setelah update sebagian jawaban identik dengan predict() penuh di semua
+konfigurasi engine (compiled/prune_zero/membership_resolution); SessionStore: eviksi LRU pada
+maxsize dan idle TTL.
+Jalankan: python -m pytest tests/
+"""
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fis_sessions
+from fis_sessions import DiagnosisSession, SessionStore
+from fis_tsukamoto import LABEL_ID, Diagnoser
+
+WORDS = ["tidak", "ringan", "sedang", "berat", "sangat berat", "sering", "kadang", "ya", "3.5", "7,5", ""]
+
+CONFIGS = [dict(compiled=c, prune_zero=p, membership_resolution=r)
+           for c, p, r in itertools.product((True, False), (True, False), (None, 0.01))]
+
+def _config_id(kw):
+    return ",".join(f"{k}={v}" for k, v in kw.items())
+
+@pytest.mark.parametrize("kw", CONFIGS, ids=_config_id)
+def test_single_symptom_update_equals_full_predict(kw):
+    rnd = random.Random(11)
+    clf = Diagnoser(**kw)
+    answers = {k: rnd.choice(WORDS) for k in LABEL_ID}
+    session = DiagnosisSession(clf, answers)
+    assert session.result(True) == clf.predict(answers, return_details=True)
+    for step in range(150):
+        name = rnd.choice(list(LABEL_ID))
+        answers[name] = rnd.choice(WORDS)
+        session.update({name: answers[name]})
+        details = step % 3 == 0
+        assert session.result(details) == clf.predict(answers, return_details=details)
+
+def test_update_with_new_engine_rebuilds_state():
+    answers = {k: "berat" for k in LABEL_ID}
+    session = DiagnosisSession(Diagnoser(), answers)
+    other = Diagnoser(compiled=False)
+    session.update({"fever": "ringan"}, engine=other)
+    answers["fever"] = "ringan"
+    assert session.engine is other
+    assert session.result(True) == other.predict(answers, return_details=True)
+
+def test_unknown_symptom_rejected():
+    with pytest.raises(ValueError):
+        DiagnosisSession(Diagnoser(), {"bukan_gejala": "berat"})
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    def monotonic(self):
+        return self.now
+
+def _session():
+    return DiagnosisSession(Diagnoser(), {})
+
+def test_store_lru_eviction_at_capacity():
+    store = SessionStore(maxsize=2, ttl=None)
+    a, b = store.create(_session()), store.create(_session())
+    assert store.get(a) is not None  # a jadi yang terbaru
+    c = store.create(_session())     # b diusir
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+    stats = store.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+
+def test_store_idle_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fis_sessions, "time", clock)
+    store = SessionStore(maxsize=10, ttl=60)
+    a, b = store.create(_session()), store.create(_session())
+    clock.now += 50
+    assert store.get(a) is not None  # akses memperpanjang a
+    clock.now += 20
+    assert store.get(b) is None      # b menganggur 70 s
+    assert store.get(a) is not None
+    clock.now += 60
+    assert store.stats()["size"] == 0
+    assert store.get(a) is None
+    assert store.stats()["expirations"] == 2
+
+def test_store_delete():
+    store = SessionStore()
+    sid = store.create(_session())
+    assert store.delete(sid)
+    assert not store.delete(sid)
+    assert store.get(sid) is None
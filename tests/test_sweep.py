@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+sweep_grid: sweep yang terputus dilanjutkan dari progress terakhir (chunk_size boleh berbeda)
+dengan hasil sama dengan sweep sekali jalan; sweep lain di path yang sama ditolak; grid di atas
+max_rows ditolak sebelum file apa pun dibuat.
+Jalankan: python -m pytest tests/
+"""
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fis_batch import SWEEP_OUTPUTS, grid_inputs, open_sweep, sweep_grid
+from fis_tsukamoto import Diagnoser
+
+LEVELS = {"fever": "0,5,10", "rash": "0,2.5,7.5,10"}
+DEFAULT = "0,10"
+N = 3 * 4 * 2 ** 8
+
+class Interrupted(Exception):
+    pass
+
+def _interrupt_after(rows):
+    def progress(done, total):
+        if done >= rows:
+            raise Interrupted(done)
+    return progress
+
+def test_resume_after_partial_run(tmp_path):
+    path = str(tmp_path / "sweep")
+    with pytest.raises(Interrupted):
+        sweep_grid(path, LEVELS, DEFAULT, chunk_size=500, progress=_interrupt_after(1000))
+    partial = open_sweep(path)
+    assert partial["done"] == 1000 and partial["n"] == N
+    calls = []
+    result = sweep_grid(path, LEVELS, DEFAULT, chunk_size=700, progress=lambda done, total: calls.append(done))
+    assert calls[0] == 1000 and calls[-1] == N  # dilanjutkan, bukan diulang dari 0
+    assert result["done"] == N
+    fresh = sweep_grid(str(tmp_path / "fresh"), LEVELS, DEFAULT, chunk_size=N)
+    for name in SWEEP_OUTPUTS:
+        np.testing.assert_array_equal(result[name], fresh[name], err_msg=name)
+    # baris ke-i = grid_inputs(levels, i, i + 1)
+    batch = Diagnoser().predict_batch(grid_inputs(result["levels"], 0, N))
+    np.testing.assert_array_equal(result["scores"], batch.scores)
+    np.testing.assert_array_equal(result["winner"], batch.winner)
+
+def test_different_sweep_rejected_unless_overwrite(tmp_path):
+    path = str(tmp_path / "sweep")
+    sweep_grid(path, LEVELS, DEFAULT, chunk_size=N)
+    with pytest.raises(ValueError, match="berisi sweep lain"):
+        sweep_grid(path, LEVELS, "0,5,10")
+    with pytest.raises(ValueError, match="berisi sweep lain"):
+        sweep_grid(path, LEVELS, DEFAULT, engine_kwargs={"membership_resolution": 0.01})
+    result = sweep_grid(path, {}, DEFAULT, overwrite=True)
+    assert result["n"] == 2 ** 10 and result["done"] == 2 ** 10
+
+def test_max_rows_refused_before_writing(tmp_path):
+    path = str(tmp_path / "sweep")
+    with pytest.raises(ValueError, match="melebihi max_rows"):
+        sweep_grid(path, LEVELS, DEFAULT, max_rows=N - 1)
+    assert not os.path.exists(path)
+    assert sweep_grid(path, LEVELS, DEFAULT, max_rows=N)["done"] == N